@@ -7,7 +7,7 @@ from itertools import combinations, product
 import math
 from btva.models import VotingScheme, VotingSituation
 from btva.strategies import StrategicBallot
-from btva.voting import tally_votes, tally_votes_strategic
+from btva.voting import tally_votes, tally_votes_delta
 from btva.happiness import HappinessMetric, happiness_for_outcome
 
 @dataclass(frozen=True)
@@ -95,19 +95,24 @@ def enumerate_coalition_options_size_k(
 
     options: list[CoalitionOption] = []
 
+    # the outcome only depends on which ballot types deviate to which ballots,
+    # so coalitions of identical voters share their tallies
+    member_options: dict[int, list[_BallotOption]] = {}
+    outcome_cache: dict[tuple, str] = {}
+
     for coalition_indices in combinations(range(situation.n_voters), coalition_size):
         coalition_indices = tuple(coalition_indices)
 
         # Generate ballot options for each coalition member
-        ballot_options_by_voter: list[list[_BallotOption]] = [
-            _generate_voter_ballot_options(
-                scheme,
-                situation,
-                voter_idx,
-                max_ballots_per_voter=max_ballots_per_voter,
-            )
-            for voter_idx in coalition_indices
-        ]
+        for voter_idx in coalition_indices:
+            if voter_idx not in member_options:
+                member_options[voter_idx] = _generate_voter_ballot_options(
+                    scheme,
+                    situation,
+                    voter_idx,
+                    max_ballots_per_voter=max_ballots_per_voter,
+                )
+        ballot_options_by_voter: list[list[_BallotOption]] = [member_options[v] for v in coalition_indices]
 
         #skip coalitions where any member has no tactical options
         if any(len(opts) == 0 for opts in ballot_options_by_voter):
@@ -124,14 +129,22 @@ def enumerate_coalition_options_size_k(
                 else:
                     overrides[voter_idx] = opt.ballot
 
-            strategic_outcome = tally_votes_strategic(
-                scheme,
-                situation,
-                overrides=overrides,
-                bullet_choice_by_voter=bullet_choices,
-            )
-
-            strategic_happiness = happiness_for_outcome(situation, strategic_outcome.winner, metric=happiness_metric)
+            key = tuple(sorted(
+                (situation.voters_preferences[v], opt.bullet_choice or "", opt.ballot.preferences)
+                for v, opt in zip(coalition_indices, ballot_combo)
+            ))
+            strategic_winner = outcome_cache.get(key)
+            if strategic_winner is None:
+                strategic_winner = tally_votes_delta(
+                    scheme,
+                    situation,
+                    baseline_outcome.scores,
+                    overrides=overrides,
+                    bullet_choice_by_voter=bullet_choices,
+                ).winner
+                outcome_cache[key] = strategic_winner
+
+            strategic_happiness = happiness_for_outcome(situation, strategic_winner, metric=happiness_metric)
             coalition_baseline = sum(baseline_happiness.per_voter[i] for i in coalition_indices)
             coalition_strategic = sum(strategic_happiness.per_voter[i] for i in coalition_indices)
 
@@ -145,7 +158,7 @@ def enumerate_coalition_options_size_k(
                     voter_indices=coalition_indices,
                     tactical_ballots=all_ballots,
                     baseline_outcome=baseline_outcome.winner,
-                    strategic_outcome=strategic_outcome.winner,
+                    strategic_outcome=strategic_winner,
                     coalition_baseline_happiness=coalition_baseline,
                     coalition_strategic_happiness=coalition_strategic,
                 ))
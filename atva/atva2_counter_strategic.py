@@ -5,7 +5,7 @@ import itertools
 from dataclasses import dataclass
 from btva.models import VotingScheme, VotingSituation
 from btva.strategies import StrategicBallot
-from btva.voting import tally_votes, tally_votes_strategic
+from btva.voting import tally_votes, tally_votes_delta
 from btva.happiness import HappinessMetric, happiness_for_outcome
 
 @dataclass(frozen=True)
@@ -55,11 +55,12 @@ def _ballot_to_option(ballot: StrategicBallot) -> _BallotOption:
 def _tally_with_deviations(
     scheme: VotingScheme,
     situation: VotingSituation,
+    baseline_scores: dict[str, int],
     deviations: dict[int, _BallotOption],
 ):
     overrides = {v: opt.ballot for v, opt in deviations.items() if opt.bullet_choice is None}
     bullets = {v: opt.bullet_choice for v, opt in deviations.items() if opt.bullet_choice is not None}
-    return tally_votes_strategic(scheme, situation, overrides=overrides, bullet_choice_by_voter=bullets)
+    return tally_votes_delta(scheme, situation, baseline_scores, overrides=overrides, bullet_choice_by_voter=bullets)
 
 #voter's strategic response to another voter's manipulation
 @dataclass(frozen=True)
@@ -135,19 +136,25 @@ def find_counter_responses(
     manip_opt = _ballot_to_option(manipulator_ballot)
     manip_deviation: dict[int, _BallotOption] = {manipulator: manip_opt}
 
-    after_manip_outcome = _tally_with_deviations(scheme, situation, manip_deviation)
+    after_manip_outcome = _tally_with_deviations(scheme, situation, baseline_outcome.scores, manip_deviation)
     after_manip_happiness = happiness_for_outcome(situation, after_manip_outcome.winner, metric=happiness_metric)
 
     responses: list[StrategicResponse] = []
+    # responders with the same sincere ballot face the same tallies
+    response_cache: dict[tuple, str] = {}
 
     for responder in range(situation.n_voters):
         if responder == manipulator:
             continue
 
         for resp_opt in _generate_voter_ballot_options(scheme, situation, responder, max_ballots_per_voter=max_ballots_per_voter):
-            test_deviations = {**manip_deviation, responder: resp_opt}
-            after_response_outcome = _tally_with_deviations(scheme, situation, test_deviations)
-            after_response_happiness = happiness_for_outcome(situation, after_response_outcome.winner, metric=happiness_metric)
+            key = (situation.voters_preferences[responder], resp_opt.bullet_choice or "", resp_opt.ballot.preferences)
+            after_response_winner = response_cache.get(key)
+            if after_response_winner is None:
+                test_deviations = {**manip_deviation, responder: resp_opt}
+                after_response_winner = _tally_with_deviations(scheme, situation, baseline_outcome.scores, test_deviations).winner
+                response_cache[key] = after_response_winner
+            after_response_happiness = happiness_for_outcome(situation, after_response_winner, metric=happiness_metric)
 
             if (after_response_happiness.per_voter[responder]> after_manip_happiness.per_voter[responder]):
                 responses.append(StrategicResponse(
@@ -156,7 +163,7 @@ def find_counter_responses(
                     response_ballot=resp_opt.ballot,
                     baseline_outcome=baseline_outcome.winner,
                     after_manipulation_outcome=after_manip_outcome.winner,
-                    after_response_outcome=after_response_outcome.winner,
+                    after_response_outcome=after_response_winner,
                     baseline_happiness=baseline_happiness.per_voter[responder],
                     after_manipulation_happiness=after_manip_happiness.per_voter[responder],
                     after_response_happiness=after_response_happiness.per_voter[responder],
@@ -188,7 +195,7 @@ def simulate_iterative_strategic_voting(
 
             current_deviations: dict[int, _BallotOption] = {initial_voter: init_opt}
 
-            current_outcome = _tally_with_deviations(scheme, situation, current_deviations)
+            current_outcome = _tally_with_deviations(scheme, situation, baseline_outcome.scores, current_deviations)
             current_happiness = happiness_for_outcome(situation, current_outcome.winner, metric=happiness_metric)
             outcome_seq.append(current_outcome.winner)
             happiness_seq.append(tuple(current_happiness.per_voter))
@@ -205,7 +212,7 @@ def simulate_iterative_strategic_voting(
 
                     for opt in _generate_voter_ballot_options(scheme, situation, voter, max_ballots_per_voter=max_ballots_per_voter):
                         test_deviations = {**current_deviations, voter: opt}
-                        test_outcome = _tally_with_deviations(scheme, situation, test_deviations)
+                        test_outcome = _tally_with_deviations(scheme, situation, baseline_outcome.scores, test_deviations)
                         test_happiness = happiness_for_outcome(situation, test_outcome.winner, metric=happiness_metric)
 
                         gain = (test_happiness.per_voter[voter]- current_happiness.per_voter[voter])
@@ -215,7 +222,7 @@ def simulate_iterative_strategic_voting(
 
                     if best_opt is not None:
                         current_deviations[voter] = best_opt
-                        current_outcome = _tally_with_deviations(scheme, situation, current_deviations)
+                        current_outcome = _tally_with_deviations(scheme, situation, baseline_outcome.scores, current_deviations)
                         current_happiness = happiness_for_outcome(situation, current_outcome.winner, metric=happiness_metric)
 
                         voter_seq.append(voter)
@@ -6,7 +6,7 @@ import random
 from dataclasses import dataclass
 from btva.models import VotingScheme, VotingSituation
 from btva.strategies import StrategicBallot
-from btva.voting import tally_votes, tally_votes_strategic
+from btva.voting import tally_votes, tally_votes_delta
 from btva.happiness import HappinessMetric, happiness_for_outcome
 
 @dataclass(frozen=True)
@@ -46,12 +46,13 @@ def _generate_voter_ballot_options(
 def _tally_strategic_ballot(
     scheme: VotingScheme,
     situation: VotingSituation,
+    baseline_scores: dict[str, int],
     voter_index: int,
     tactical_ballot: StrategicBallot,
 ):
     if tactical_ballot.kind == "bullet":
-        return tally_votes_strategic(scheme,situation,bullet_choice_by_voter={voter_index: tactical_ballot.preferences[0]})
-    return tally_votes_strategic(scheme,situation,overrides={voter_index: tactical_ballot})
+        return tally_votes_delta(scheme,situation,baseline_scores,bullet_choice_by_voter={voter_index: tactical_ballot.preferences[0]})
+    return tally_votes_delta(scheme,situation,baseline_scores,overrides={voter_index: tactical_ballot})
 
 #voter's beliefs about others' preferences
 @dataclass(frozen=True)
@@ -70,6 +71,10 @@ class BeliefModel:
         if abs(sum(self.scenario_probabilities) - 1.0) > 1e-6:
             raise ValueError("Probabilities must sum to 1.0")
 
+# expected values are float sums over the scenario probabilities; a zero gain can come out as +-1e-16, and whether
+# it does depends on the happiness metric. Real gains are at least 1/((m-1) * n_scenarios).
+_GAIN_TOLERANCE = 1e-9
+
 # strategic opttion evaluated under uncertainty.
 @dataclass(frozen=True)
 class StrategicOptionUnderUncertainty:
@@ -164,7 +169,7 @@ def evaluate_option_under_uncertainty(
         baseline_happy = happiness_for_outcome(scenario, baseline_outcome.winner, metric=happiness_metric)
         baseline_happiness_values.append(baseline_happy.per_voter[voter_index])
 
-        strategic_outcome = _tally_strategic_ballot(scheme, scenario, voter_index, tactical_ballot)
+        strategic_outcome = _tally_strategic_ballot(scheme, scenario, baseline_outcome.scores, voter_index, tactical_ballot)
         strategic_happy = happiness_for_outcome(scenario, strategic_outcome.winner, metric=happiness_metric)
 
         outcomes.append(strategic_outcome.winner)
@@ -179,7 +184,8 @@ def evaluate_option_under_uncertainty(
         for h, p in zip(happiness_values, probs)
     )
 
-    true_outcome_obj = _tally_strategic_ballot(scheme, belief_model.true_situation, voter_index, tactical_ballot)
+    true_baseline = tally_votes(scheme, belief_model.true_situation)
+    true_outcome_obj = _tally_strategic_ballot(scheme, belief_model.true_situation, true_baseline.scores, voter_index, tactical_ballot)
     true_happy = happiness_for_outcome(belief_model.true_situation, true_outcome_obj.winner, metric=happiness_metric)
 
     return StrategicOptionUnderUncertainty(
@@ -240,7 +246,7 @@ def run_atva3(
                 happiness_metric=happiness_metric,
             )
 
-            if option.expected_gain > 0:
+            if option.expected_gain > _GAIN_TOLERANCE:
                 voter_options.append(option)
 
         options_under_uncertainty[voter_idx] = voter_options
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from itertools import combinations, product
 from btva.models import VotingScheme, VotingSituation
 from btva.strategies import StrategicBallot
-from btva.voting import tally_votes, tally_votes_strategic
+from btva.voting import tally_votes, tally_votes_delta
 from btva.happiness import HappinessMetric, happiness_for_outcome
 
 @dataclass(frozen=True)
@@ -47,17 +47,19 @@ def _generate_voter_ballot_options(
 def _tally_with_deviations(
     scheme: VotingScheme,
     situation: VotingSituation,
+    baseline_scores: dict[str, int],
     deviations: dict[int, _BallotOption],
 ):
 
     overrides = {v: opt.ballot for v, opt in deviations.items() if opt.bullet_choice is None}
     bullets = {v: opt.bullet_choice for v, opt in deviations.items() if opt.bullet_choice is not None}
-    return tally_votes_strategic(scheme, situation, overrides=overrides, bullet_choice_by_voter=bullets)
+    return tally_votes_delta(scheme, situation, baseline_scores, overrides=overrides, bullet_choice_by_voter=bullets)
 
 #tallly a Nash equilibrium strategy profile.
 def _tally_profile(
     scheme: VotingScheme,
     situation: VotingSituation,
+    baseline_scores: dict[str, int],
     strategies: dict[int, StrategicBallot | None],
 ):
 
@@ -70,7 +72,7 @@ def _tally_profile(
             bullets[v] = s.preferences[0]
         else:
             overrides[v] = s
-    return tally_votes_strategic(scheme, situation, overrides=overrides, bullet_choice_by_voter=bullets)
+    return tally_votes_delta(scheme, situation, baseline_scores, overrides=overrides, bullet_choice_by_voter=bullets)
 
 #Scenario where multiple voters vote tactically simultaneously.
 @dataclass(frozen=True)
@@ -154,17 +156,21 @@ def enumerate_multi_voter_scenarios(
 
     scenarios: list[MultiVoterTacticalScenario] = []
 
+    # outcomes only depend on which ballot types deviate to which ballots, so identical voters share tallies
+    member_options: dict[int, list[_BallotOption]] = {}
+    outcome_cache: dict[tuple, str] = {}
+
     for k in range(2, min(max_tactical_voters + 1, situation.n_voters + 1)):
         for voter_set in combinations(range(situation.n_voters), k):
             voter_set = tuple(voter_set)
 
-            ballot_options_by_voter: list[list[_BallotOption]] = [
-                _generate_voter_ballot_options(
-                    scheme, situation, voter_idx,
-                    max_ballots_per_voter=max_ballots_per_voter,
-                )
-                for voter_idx in voter_set
-            ]
+            for voter_idx in voter_set:
+                if voter_idx not in member_options:
+                    member_options[voter_idx] = _generate_voter_ballot_options(
+                        scheme, situation, voter_idx,
+                        max_ballots_per_voter=max_ballots_per_voter,
+                    )
+            ballot_options_by_voter: list[list[_BallotOption]] = [member_options[v] for v in voter_set]
 
             if any(len(opts) == 0 for opts in ballot_options_by_voter):
                 continue
@@ -175,8 +181,15 @@ def enumerate_multi_voter_scenarios(
                     for i in range(len(voter_set))
                 }
 
-                tactical_outcome = _tally_with_deviations(scheme, situation, deviations)
-                tactical_happiness = happiness_for_outcome(situation, tactical_outcome.winner, metric=happiness_metric)
+                key = tuple(sorted(
+                    (situation.voters_preferences[v], opt.bullet_choice or "", opt.ballot.preferences)
+                    for v, opt in deviations.items()
+                ))
+                tactical_winner = outcome_cache.get(key)
+                if tactical_winner is None:
+                    tactical_winner = _tally_with_deviations(scheme, situation, baseline_outcome.scores, deviations).winner
+                    outcome_cache[key] = tactical_winner
+                tactical_happiness = happiness_for_outcome(situation, tactical_winner, metric=happiness_metric)
 
                 individual_gains = {
                     v: tactical_happiness.per_voter[v] - baseline_happiness.per_voter[v]
@@ -189,7 +202,7 @@ def enumerate_multi_voter_scenarios(
                     tactical_voters=voter_set,
                     tactical_ballots=tactical_ballots,
                     baseline_outcome=baseline_outcome.winner,
-                    tactical_outcome=tactical_outcome.winner,
+                    tactical_outcome=tactical_winner,
                     baseline_total_happiness=baseline_happiness.total,
                     tactical_total_happiness=tactical_happiness.total,
                     per_voter_baseline_happiness=tuple(baseline_happiness.per_voter),
@@ -209,6 +222,7 @@ def find_nash_equilibria(
 ) -> list[NashEquilibrium]:
 
     situation.validate()
+    baseline_scores = tally_votes(scheme, situation).scores
 
     ballot_options: dict[int, list[StrategicBallot | None]] = {}
     for voter_idx in range(situation.n_voters):
@@ -232,7 +246,7 @@ def find_nash_equilibria(
     for profile in candidate_profiles:
         strategies: dict[int, StrategicBallot | None] = {v: profile[v] for v in range(situation.n_voters)}
 
-        outcome = _tally_profile(scheme, situation, strategies)
+        outcome = _tally_profile(scheme, situation, baseline_scores, strategies)
         happiness = happiness_for_outcome(situation, outcome.winner, metric=happiness_metric)
 
         is_equilibrium = True
@@ -248,7 +262,7 @@ def find_nash_equilibria(
                 test_strategies = dict(strategies)
                 test_strategies[voter_idx] = alt_ballot
 
-                test_outcome = _tally_profile(scheme, situation, test_strategies)
+                test_outcome = _tally_profile(scheme, situation, baseline_scores, test_strategies)
                 test_happiness = happiness_for_outcome(situation, test_outcome.winner, metric=happiness_metric)
 
                 if test_happiness.per_voter[voter_idx] > current_happiness:
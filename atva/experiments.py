@@ -4,13 +4,13 @@ import argparse
 import csv
 import time
 from datetime import date
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 from typing import Iterable
 
-from btva.models import VotingScheme
-from btva.happiness import HappinessMetric
-from btva.parsing import load_input_file
+from btva.models import VotingScheme, VotingSituation
+from btva.happiness import HappinessMetric, happiness_for_outcome, happiness_scale
+from btva.corpus import CorpusScenario, is_corpus_file, load_corpus, load_scenario
 
 from .atva1_collusion import run_atva1
 from .atva2_counter_strategic import run_atva2
@@ -27,6 +27,7 @@ class AtvaExperimentRow:
     m: int
     n: int
     scheme: str
+    happiness_metric: str
     baseline_outcome: str
     baseline_total_happiness: float
     baseline_mean_happiness: float
@@ -66,7 +67,11 @@ def _iter_scenario_files(
     *,
     include_globs: list[str] | None = None,
     exclude_prefixes: tuple[str, ...] = (),
-) -> list[Path]:
+) -> list[Path] | list[CorpusScenario]:
+    # a packed corpus file (python -m btva.corpus) stands in for the directory
+    if is_corpus_file(scenarios_dir):
+        return load_corpus(scenarios_dir).scenarios(include_globs=include_globs, exclude_prefixes=exclude_prefixes)
+
     if not include_globs:
         include_globs = ["*.abif"]
 
@@ -95,9 +100,26 @@ def _iter_scenario_files(
     return files
 
 
+# columns that are sums, differences or averages of voter happiness, next to the baseline happiness
+_HAPPINESS_COLUMNS = ("avg_coalition_gain", "avg_expected_gain", "avg_regret", "avg_happiness_change")
+
+# row of another happiness metric from a variant run under row.happiness_metric. Every metric is a positive
+# rescaling of borda happiness (happiness_scale), so the variants pick the same ballots and winners under each;
+# the baseline happiness is re-read from the recorded winner and the gain columns are rescaled
+def _row_for_metric(situation: VotingSituation, row: AtvaExperimentRow, metric: HappinessMetric) -> AtvaExperimentRow:
+    t0 = time.perf_counter()
+    m = situation.m_alternatives
+    scale = happiness_scale(metric, m) / happiness_scale(HappinessMetric(row.happiness_metric), m)
+    changes = {column: getattr(row, column) * scale for column in _HAPPINESS_COLUMNS}
+    if row.baseline_outcome:
+        total = happiness_for_outcome(situation, row.baseline_outcome, metric=metric).total
+        changes.update(baseline_total_happiness=total, baseline_mean_happiness=total / max(1, situation.n_voters))
+    return replace(row, happiness_metric=metric.value, time_seconds=time.perf_counter() - t0, **changes)
+
+
 def run_atva_experiments(
     *,
-    scenario_files: Iterable[Path],
+    scenario_files: Iterable[Path | CorpusScenario],
     schemes: Iterable[VotingScheme],
     variants: list[str] | None = None,
     max_coalition_size: int = 3,
@@ -108,7 +130,9 @@ def run_atva_experiments(
     max_ballots_per_voter: int = 3,
     find_equilibria: bool = False,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    happiness_metrics: Iterable[HappinessMetric] | None = None,
     seed: int = 42,
+    cache_dir: Path | None = None,
 ) -> list[AtvaExperimentRow]:
     if variants is None:
         variants = ["atva1", "atva2", "atva3", "atva4"]
@@ -117,12 +141,15 @@ def run_atva_experiments(
     
     scenario_files = list(scenario_files)
     schemes = list(schemes)
+    # the variants run under the first metric; rows for the others are derived from the same run
+    metrics = [HappinessMetric(h) for h in happiness_metrics] if happiness_metrics else [happiness_metric]
+    happiness_metric = metrics[0]
     total_jobs = len(scenario_files) * len(schemes) * len(variants)
     jobs_done = 0
     
     for s_idx, scenario_file in enumerate(scenario_files, start=1):
         try:
-            parsed = load_input_file(scenario_file)
+            parsed = load_scenario(scenario_file, cache_dir=cache_dir)
         except Exception as e:
             print(f"warning: skipping {scenario_file.name}: {type(e).__name__}: {e}")
             continue
@@ -150,6 +177,7 @@ def run_atva_experiments(
                     "m": situation.m_alternatives,
                     "n": situation.n_voters,
                     "scheme": scheme.value,
+                    "happiness_metric": happiness_metric.value,
                     "baseline_outcome": "",
                     "baseline_total_happiness": 0.0,
                     "baseline_mean_happiness": 0.0,
@@ -247,7 +275,11 @@ def run_atva_experiments(
                 row_data["time_seconds"] = float(t1 - t0)
                 row_data["note"] = "; ".join(note_parts)
                 
-                rows.append(AtvaExperimentRow(**row_data))
+                row = AtvaExperimentRow(**row_data)
+                rows.append(row)
+                # further metrics rescale the happiness of this run instead of repeating the variant
+                for metric in metrics[1:]:
+                    rows.append(_row_for_metric(situation, row, metric))
                 jobs_done += 1
     
     return rows
@@ -278,7 +310,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--scenarios-dir",
         type=str,
         default="voting_scenarios",
-        help="Directory containing .abif scenario files (default: voting_scenarios).",
+        help="Directory of .abif scenario files, or a corpus file built by btva.corpus (default: voting_scenarios).",
     )
     p.add_argument(
         "--include",
@@ -365,9 +397,16 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--happiness-metric",
         type=str,
+        action="append",
         choices=[m.value for m in HappinessMetric],
-        default=HappinessMetric.BORDA.value,
-        help="Happiness metric (default: borda).",
+        default=None,
+        help="Happiness metric (repeatable: one row set per metric; default: borda).",
+    )
+    p.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for cached parsed scenarios, keyed by file content (default: no cache).",
     )
     p.add_argument(
         "--out",
@@ -407,8 +446,9 @@ def main(argv: list[str] | None = None) -> int:
         max_tactical_voters=args.max_tactical_voters,
         max_ballots_per_voter=args.max_ballots_per_voter,
         find_equilibria=args.find_equilibria,
-        happiness_metric=HappinessMetric(args.happiness_metric),
+        happiness_metrics=[HappinessMetric(h) for h in args.happiness_metric or [HappinessMetric.BORDA.value]],
         seed=args.seed,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
     )
     
     out_path = Path(
@@ -314,6 +314,12 @@ def main(argv: list[str] | None = None) -> int:
         default=Path("experiments/atva_plots"),
         help="Directory to write PNG plots into",
     )
+    parser.add_argument(
+        "--happiness-metric",
+        type=str,
+        default=None,
+        help="Metric to plot when the CSV holds rows for several (default: the first one in the file)",
+    )
     args = parser.parse_args(argv)
 
     csv_path = args.csv if args.csv else _default_results_csv()
@@ -325,6 +331,9 @@ def main(argv: list[str] | None = None) -> int:
     
     print(f"Reading results from: {csv_path}")
     df = _read_results(csv_path)
+    if "happiness_metric" in df.columns and len(df):
+        metric = args.happiness_metric or str(df["happiness_metric"].iloc[0])
+        df = df[df["happiness_metric"] == metric]
     
     print(f"Found {len(df)} rows with {df['variant'].nunique()} variants, "
           f"{df['scheme'].nunique()} schemes, {df['scenario'].nunique()} scenarios")
@@ -3,6 +3,7 @@
 This package provides a minimal, runnable scaffold for the AMS Strategic Voting lab.
 """
 
-from .models import VotingScheme, VotingSituation
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .rank_matrix import RankMatrix
 
-__all__ = ["VotingScheme", "VotingSituation"]
+__all__ = ["RankMatrix", "VotingScheme", "VotingSituation", "WeightedProfile"]
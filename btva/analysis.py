@@ -1,90 +1,303 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from collections import defaultdict
-from typing import Literal
+import math
+import time
+from dataclasses import dataclass, replace
+from collections import Counter, defaultdict
+from typing import Callable, Iterable, Literal, Sequence
 
-from .enumeration import enumerate_all_permutations_options
-from .enumeration_bullet import enumerate_bullet_options
+from .anytime import Bounds, Coverage, budgeted_permutation_winners, risk_bounds
+from .enumeration import (
+    _options_for_winners,
+    enumerate_all_permutations_options,
+    permutation_outcome_histograms,
+    permutation_winners,
+)
+from .enumeration_bullet import bullet_outcome_histograms, bullet_winners, enumerate_bullet_options
+from .enumeration_fused import fused_outcome_histograms, scoring_rules, tally_votes_rules
 
 from .happiness import HappinessResult, HappinessMetric, happiness_for_outcome
 from .models import VotingScheme, VotingSituation
+from .option_table import STRATEGY_KINDS, StrategicOptionTable
+from .oracle import enumerate_oracle_options, manipulation_oracle_for_voter, oracle_outcome_histograms
+from .parallel import parallel_outcome_histograms, parallel_permutation_winners
+from .rank_matrix import np
+from .sampling import SampledRisk, SamplingBudget, estimate_risk, sample_compromise_burying
 from .strategic_options import StrategicOption
 from .voting import VotingOutcome, tally_votes
 
+# per-voter summary of the strategic ballots: outcome_counts[kind][winner] = number of ballots of that kind electing winner.
+# gains are looked up per winner, so counts, gain sums and winner changes follow without any StrategicOption
+@dataclass(frozen=True)
+class VoterAggregate:
+    voter_index: int
+    baseline_outcome: str
+    outcome_counts: dict[str, dict[str, int]]
+    gain_by_outcome: dict[str, float]
+    delta_H_by_outcome: dict[str, float]
+
+    @property
+    def n_options(self) -> int:
+        return sum(sum(counts.values()) for counts in self.outcome_counts.values())
+
+    # ballots with H~_i > H_i per strategy kind
+    @property
+    def tactical_counts(self) -> dict[str, int]:
+        out = {}
+        for kind, counts in self.outcome_counts.items():
+            n = sum(c for w, c in counts.items() if self.gain_by_outcome[w] > 0)
+            if n:
+                out[kind] = n
+        return out
+
+    @property
+    def n_tactical(self) -> int:
+        return sum(self.tactical_counts.values())
+
+    # sum of H~_i - H_i over tactical ballots per strategy kind
+    @property
+    def tactical_gains(self) -> dict[str, float]:
+        return {
+            kind: sum(c * self.gain_by_outcome[w] for w, c in self.outcome_counts[kind].items() if self.gain_by_outcome[w] > 0)
+            for kind in self.tactical_counts
+        }
+
+    @property
+    def tactical_delta_H(self) -> float:
+        return sum(
+            c * self.delta_H_by_outcome[w]
+            for counts in self.outcome_counts.values()
+            for w, c in counts.items()
+            if self.gain_by_outcome[w] > 0
+        )
+
+
 @dataclass(frozen=True)
 class BtvaResult:
     outcome: VotingOutcome
     happiness: HappinessResult
     strategic_options: dict[int, list[StrategicOption]] | None = None
+    aggregates: dict[int, VoterAggregate] | None = None
+    option_table: StrategicOptionTable | None = None
+    # estimated compromising/burying risk when the enumeration was skipped and a sampling budget was given
+    sampled: SampledRisk | None = None
+    # what a time-budgeted run covered, with bounds on the risk numbers
+    coverage: Coverage | None = None
 
 #initialize risk methods
 RiskMethod = Literal["avg_gain_all_options", "fraction_change_winner"]
 
+# risk methods fed one option at a time by RiskAccumulator.
+# add() gets the voter, strategy kind, multiplicity, H~_i - H_i and whether the winner changed;
+# done(voter, kind) lets the accumulator skip the remaining options of that voter and kind.
+# the optional add_bulk(kind, multiplicity, gain, changed_voters) takes all options of one kind at once
+# (summed multiplicity, multiplicity-weighted gain sum, voters with a winner-changing option); see add_table
+class AvgGainRisk:
+    def __init__(self) -> None:
+        self.total_gain = 0
+        self.gain_by_kind: dict[str, float] = defaultdict(int)
+        self.count_by_kind: dict[str, int] = defaultdict(int)
+
+    def done(self, voter_index: int, kind: str) -> bool:
+        return False
+
+    def add(self, voter_index: int, kind: str, multiplicity: int, gain: float, changed: bool) -> None:
+        self.total_gain += gain * multiplicity
+        self.gain_by_kind[kind] += gain * multiplicity
+        self.count_by_kind[kind] += multiplicity
+
+    def add_bulk(self, kind: str, multiplicity: int, gain: float, changed_voters: Iterable[int]) -> None:
+        self.total_gain += gain
+        self.gain_by_kind[kind] += gain
+        self.count_by_kind[kind] += multiplicity
+
+    def result(self, n_options: int, n_voters: int) -> tuple[float, dict[str, float]]:
+        by_kind = {kind: self.gain_by_kind[kind] / self.count_by_kind[kind] for kind in self.count_by_kind}
+        return self.total_gain / n_options, by_kind
+
+
+# a voter counts once it has one winner-changing option, so its later options of that kind are not looked at
+class FractionChangeWinnerRisk:
+    def __init__(self) -> None:
+        self.voters: set[int] = set()
+        self.voters_by_kind: dict[str, set[int]] = defaultdict(set)
+
+    def done(self, voter_index: int, kind: str) -> bool:
+        return voter_index in self.voters_by_kind[kind]
+
+    def add(self, voter_index: int, kind: str, multiplicity: int, gain: float, changed: bool) -> None:
+        if changed:
+            self.voters.add(voter_index)
+            self.voters_by_kind[kind].add(voter_index)
+
+    def add_bulk(self, kind: str, multiplicity: int, gain: float, changed_voters: Iterable[int]) -> None:
+        self.voters.update(changed_voters)
+        self.voters_by_kind[kind].update(changed_voters)
+
+    def result(self, n_options: int, n_voters: int) -> tuple[float, dict[str, float]]:
+        by_kind = {kind: len(voters) / max(1, n_voters) for kind, voters in self.voters_by_kind.items() if voters}
+        return len(self.voters) / max(1, n_voters), by_kind
+
+
+# risk method name -> factory of a fresh accumulator state
+RISK_METHODS: dict[str, Callable[[], object]] = {
+    "avg_gain_all_options": AvgGainRisk,
+    "fraction_change_winner": FractionChangeWinnerRisk,
+}
+
+
+def register_risk_method(name: str, factory: Callable[[], object]) -> None:
+    RISK_METHODS[name] = factory
+
+
+# Single pass over a stream of strategic options that yields every requested risk method, the per-kind breakdowns,
+# the option count and the gain / delta-H sums together.
+# options count with their multiplicity. Every entry point counts whatever it is fed; with tactical_only=True
+# every entry point drops options with H~_i <= H_i instead (run_experiments and the CLI count tactical options only)
+class RiskAccumulator:
+    def __init__(
+        self,
+        n_voters: int,
+        methods: Iterable[str] = tuple(RISK_METHODS),
+        *,
+        tactical_only: bool = False,
+    ) -> None:
+        unknown = [method for method in methods if method not in RISK_METHODS]
+        if unknown:
+            raise ValueError(f"Unknown risk method: {unknown[0]}")
+        self.n_voters = n_voters
+        self.tactical_only = tactical_only
+        self.methods = {method: RISK_METHODS[method]() for method in methods}
+        self.n_options = 0
+        self.total_gain = 0
+        self.total_delta_H = 0
+
+    def done(self, voter_index: int, kind: str) -> bool:
+        return all(state.done(voter_index, kind) for state in self.methods.values())
+
+    def add(self, voter_index: int, kind: str, multiplicity: int, gain: float, delta_H: float, changed: bool) -> None:
+        if self.tactical_only and gain <= 0:
+            return
+        self.n_options += multiplicity
+        self.total_gain += gain * multiplicity
+        self.total_delta_H += delta_H * multiplicity
+        for state in self.methods.values():
+            if not state.done(voter_index, kind):
+                state.add(voter_index, kind, multiplicity, gain, changed)
+
+    def add_option(self, opt: StrategicOption) -> None:
+        self.add(
+            opt.voter_index, opt.strategy_kind, opt.multiplicity,
+            opt.H_tilde_i - opt.H_i, opt.H_tilde - opt.H, opt.strategic_outcome != opt.baseline_outcome,
+        )
+
+    def add_options(self, options: Iterable[StrategicOption]) -> RiskAccumulator:
+        for opt in options:
+            self.add_option(opt)
+        return self
+
+    # lazy per-voter streams by strategy kind; a stream is abandoned once every method is done with that voter and kind,
+    # in which case its remaining options are neither built nor counted in n_options
+    def add_sources(self, sources: dict[str, Callable[[int], Iterable[StrategicOption]]]) -> RiskAccumulator:
+        for i in range(self.n_voters):
+            for kind, source in sources.items():
+                for opt in source(i):
+                    self.add_option(opt)
+                    if self.done(i, kind):
+                        break
+        return self
+
+    # ballots of VoterAggregates, one add per (voter, kind, winner)
+    def add_aggregates(self, aggregates: dict[int, VoterAggregate]) -> RiskAccumulator:
+        for i, agg in aggregates.items():
+            for kind, counts in agg.outcome_counts.items():
+                for w, c in counts.items():
+                    self.add(i, kind, c, agg.gain_by_outcome[w], agg.delta_H_by_outcome[w], w != agg.baseline_outcome)
+        return self
+
+    # rows of a StrategicOptionTable, reduced per strategy kind with array operations;
+    # only methods without an add_bulk hook (see register_risk_method) are fed row by row
+    def add_table(self, table: StrategicOptionTable) -> RiskAccumulator:
+        gain = table.H_tilde_i - table.H_i
+        mask = gain > 0 if self.tactical_only else np.ones(gain.shape, dtype=bool)
+        voter, kind, multiplicity = table.voter[mask], table.kind[mask], table.multiplicity[mask]
+        gain, delta_H = gain[mask], (table.H_tilde - table.H)[mask]
+        changed = table.winner[mask] != table.alternatives.index(table.baseline_outcome)
+
+        bulk = [state for state in self.methods.values() if hasattr(state, "add_bulk")]
+        for code in np.unique(kind).tolist():
+            rows = kind == code
+            n = int(multiplicity[rows].sum())
+            kind_gain = float((gain[rows] * multiplicity[rows]).sum())
+            self.n_options += n
+            self.total_gain += kind_gain
+            self.total_delta_H += float((delta_H[rows] * multiplicity[rows]).sum())
+            changed_voters = np.unique(voter[rows & changed]).tolist()
+            for state in bulk:
+                state.add_bulk(STRATEGY_KINDS[code], n, kind_gain, changed_voters)
+
+        per_row = [state for state in self.methods.values() if not hasattr(state, "add_bulk")]
+        if per_row:
+            for i, code, mult, g, c in zip(
+                voter.tolist(), kind.tolist(), multiplicity.tolist(), gain.tolist(), changed.tolist(),
+            ):
+                for state in per_row:
+                    if not state.done(i, STRATEGY_KINDS[code]):
+                        state.add(i, STRATEGY_KINDS[code], mult, g, c)
+        return self
+
+    @property
+    def avg_gain(self) -> float:
+        return self.total_gain / self.n_options if self.n_options else 0.0
+
+    @property
+    def avg_delta_H(self) -> float:
+        return self.total_delta_H / self.n_options if self.n_options else 0.0
+
+    # same dict as compute_risk(..., method=method)
+    def risk(self, method: str) -> dict[str, object]:
+        if method not in self.methods:
+            raise ValueError(f"Unknown risk method: {method}")
+        if self.n_options == 0:
+            return {"method": method, "overall": 0.0, "by_strategy_kind": {}, "n_options": 0}
+        overall, by_kind = self.methods[method].result(self.n_options, self.n_voters)
+        return {"method": method, "overall": float(overall), "by_strategy_kind": by_kind, "n_options": self.n_options}
+
 #Compute an overall 'risk of strategic voting' value from S_i
+# options count with their multiplicity, so collapsed equivalence classes give the same numbers as full enumeration;
+# a StrategicOptionTable is reduced column-wise (RiskAccumulator.add_table) instead of walking the options
 def compute_risk(
-    strategic_options: dict[int, list[StrategicOption]],
+    strategic_options: dict[int, list[StrategicOption]] | StrategicOptionTable,
     *,
     method: RiskMethod,
 ) -> dict[str, object]:
 
-    n_options = sum(len(opts) for opts in strategic_options.values())
-    if n_options == 0:
-        return {
-            "method": method,
-            "overall": 0.0,
-            "by_strategy_kind": {},
-            "n_options": 0,
-        }
+    if isinstance(strategic_options, StrategicOptionTable):
+        return RiskAccumulator(strategic_options.n_voters, (method,)).add_table(strategic_options).risk(method)
 
-    if method == "avg_gain_all_options":
-        gains_by_kind: dict[str, list[int]] = defaultdict(list)
-        total_gain = 0
-        for voter_idx, opts in strategic_options.items():
-            for opt in opts:
-                gain = opt.H_tilde_i - opt.H_i
-                total_gain += gain
-                gains_by_kind[opt.strategy_kind].append(gain)
-
-        overall = total_gain / n_options
-        by_kind = {
-            kind: (sum(gains) / len(gains)) if gains else 0.0
-            for kind, gains in gains_by_kind.items()
-        }
-        return {
-            "method": method,
-            "overall": float(overall),
-            "by_strategy_kind": dict(by_kind),
-            "n_options": n_options,
-        }
+    accumulator = RiskAccumulator(len(strategic_options), (method,))
+    for opts in strategic_options.values():
+        accumulator.add_options(opts)
+    return accumulator.risk(method)
 
-    if method == "fraction_change_winner":
-        n_voters = len(strategic_options)
-        voters_can_change = 0
-        voters_can_change_by_kind: dict[str, set[int]] = defaultdict(set)
-
-        for voter_idx, opts in strategic_options.items():
-            changed_any = False
-            for opt in opts:
-                if opt.strategic_outcome != opt.baseline_outcome:
-                    changed_any = True
-                    voters_can_change_by_kind[opt.strategy_kind].add(voter_idx)
-            if changed_any:
-                voters_can_change += 1
-
-        overall = voters_can_change / max(1, n_voters)
-        by_kind = {
-            kind: (len(voters) / max(1, n_voters))
-            for kind, voters in voters_can_change_by_kind.items()
-        }
-        return {
-            "method": method,
-            "overall": float(overall),
-            "by_strategy_kind": dict(by_kind),
-            "n_options": n_options,
-        }
 
-    raise ValueError(f"Unknown risk method: {method}")
+# fraction_change_winner without enumerating permutations: bullet options plus the manipulation oracle.
+# same result as compute_risk(..., method="fraction_change_winner") over tactical options of the full enumeration
+def oracle_fraction_change_winner(
+    scheme: VotingScheme,
+    situation: VotingSituation,
+    *,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+) -> dict[str, object]:
+
+    strategic_options: dict[int, list[StrategicOption]] = {i: [] for i in range(situation.n_voters)}
+    for source in (
+        enumerate_bullet_options(scheme, situation, happiness_metric=happiness_metric),
+        enumerate_oracle_options(scheme, situation, happiness_metric=happiness_metric),
+    ):
+        for i, opts in source.items():
+            strategic_options[i].extend(opt for opt in opts if opt.H_tilde_i > opt.H_i)
+    return compute_risk(strategic_options, method="fraction_change_winner")
 
 
 def run_btva(
@@ -98,28 +311,356 @@ def run_btva(
     happiness = happiness_for_outcome(situation, voting_outcome.winner, metric=happiness_metric)
     return BtvaResult(outcome=voting_outcome, happiness=happiness)
 
+def _aggregate_histograms(
+    situation: VotingSituation,
+    base: BtvaResult,
+    histograms: dict[str, dict[int, Counter[str]]],
+    happiness_metric: HappinessMetric,
+) -> dict[int, VoterAggregate]:
+
+    winners = {w for by_voter in histograms.values() for counts in by_voter.values() for w in counts}
+    happy = {w: happiness_for_outcome(situation, w, metric=happiness_metric) for w in winners}
+    aggregates: dict[int, VoterAggregate] = {}
+    for i in range(situation.n_voters):
+        outcome_counts = {kind: dict(by_voter[i]) for kind, by_voter in histograms.items() if by_voter[i]}
+        seen = {w for counts in outcome_counts.values() for w in counts}
+        aggregates[i] = VoterAggregate(
+            voter_index=i,
+            baseline_outcome=base.outcome.winner,
+            outcome_counts=outcome_counts,
+            gain_by_outcome={w: happy[w].per_voter[i] - base.happiness.per_voter[i] for w in seen},
+            delta_H_by_outcome={w: happy[w].total - base.happiness.total for w in seen},
+        )
+    return aggregates
+
+# aggregate-mode view of an option-list result: per voter and strategy kind, options per winner weighted by multiplicity
+def aggregate_options(
+    situation: VotingSituation,
+    result: BtvaResult,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+) -> BtvaResult:
+
+    assert result.strategic_options is not None
+    histograms: dict[str, dict[int, Counter[str]]] = {}
+    for i, opts in result.strategic_options.items():
+        for opt in opts:
+            by_voter = histograms.get(opt.strategy_kind)
+            if by_voter is None:
+                by_voter = histograms[opt.strategy_kind] = {j: Counter() for j in range(situation.n_voters)}
+            by_voter[i][opt.strategic_outcome] += opt.multiplicity
+    aggregates = _aggregate_histograms(situation, result, histograms, happiness_metric)
+    return replace(result, aggregates=aggregates)
+
+# bounds and coverage of an anytime result; pending voters may cast 1 ballot per reachable winner up to all m! - 1,
+# each with a gain between the smallest and the largest gain among those winners
+def _coverage(
+    situation: VotingSituation,
+    base: BtvaResult,
+    aggregates: dict[int, VoterAggregate],
+    pending: dict[int, frozenset[str]],
+    happiness_metric: HappinessMetric,
+    elapsed_seconds: float,
+) -> Coverage:
+
+    population = math.factorial(situation.m_alternatives) - 1
+    known_count = sum(agg.n_tactical for agg in aggregates.values())
+    known_gain = sum(sum(agg.tactical_gains.values()) for agg in aggregates.values())
+    happy = {w: happiness_for_outcome(situation, w, metric=happiness_metric) for w in situation.alternatives}
+    unknown = []
+    for i, targets in pending.items():
+        gains = [happy[w].per_voter[i] - base.happiness.per_voter[i] for w in targets]
+        unknown.append((len(targets), population, min(gains), max(gains)))
+    count, avg_gain = risk_bounds(known_count, known_gain, unknown)
+
+    # every pending voter has a reachable preferred winner, so winner changes are known exactly
+    changers = sum(1 for i, agg in aggregates.items() if agg.n_tactical or i in pending)
+    fraction = changers / max(1, situation.n_voters)
+    bullets = sum(sum(agg.outcome_counts.get("bullet", {}).values()) for agg in aggregates.values())
+    return Coverage(
+        complete=not pending,
+        elapsed_seconds=elapsed_seconds,
+        n_voters=situation.n_voters,
+        voters_evaluated=situation.n_voters - len(pending),
+        ballots_total=bullets + situation.n_voters * population,
+        ballots_evaluated=bullets + (situation.n_voters - len(pending)) * population,
+        pending=pending,
+        tactical_options_total=count,
+        avg_gain_all_options=avg_gain,
+        fraction_change_winner=Bounds(fraction, fraction),
+    )
+
+# run_btva_with_strategies(..., time_budget=seconds): bullet options and the oracle first, then the tactical
+# compromising/burying ballots of whole voter types until the budget runs out (max_m does not apply).
+# returns options and aggregates for what was evaluated plus the coverage with risk bounds
+def _run_anytime(
+    scheme: VotingScheme,
+    situation: VotingSituation,
+    base: BtvaResult,
+    *,
+    time_budget: float,
+    collapse_equivalent: bool,
+    happiness_metric: HappinessMetric,
+) -> BtvaResult:
+
+    t0 = time.perf_counter()
+    strategic_options = enumerate_bullet_options(scheme, situation, happiness_metric=happiness_metric)
+    found = budgeted_permutation_winners(
+        scheme, situation, base.outcome, deadline=t0 + time_budget, collapse_equivalent=collapse_equivalent,
+    )
+    for i, rows in found.rows.items():
+        strategic_options[i].extend(_options_for_winners(situation, i, base.outcome, iter(rows), happiness_metric))
+
+    result = aggregate_options(situation, replace(base, strategic_options=strategic_options), happiness_metric)
+    coverage = _coverage(situation, base, result.aggregates, found.pending, happiness_metric, time.perf_counter() - t0)
+    return replace(result, coverage=coverage)
+
+# whether run_btva_with_strategies skips compromising/burying enumeration for this m.
+# with collapse_equivalent only borda still needs all m! orders, the other schemes have at most C(m,2) classes
+def permutation_enumeration_skipped(scheme: VotingScheme, m: int, max_m: int, *, collapse_equivalent: bool = False) -> bool:
+    if collapse_equivalent and scheme != VotingScheme.BORDA:
+        return False
+    return m > max_m
+
+# default cap on m for compromising/burying enumeration
+DEFAULT_MAX_M = 8
+
+# run_btva_with_strategies modes that cannot be combined raise instead of one silently winning:
+# aggregate and table are alternative result forms, and a time-budgeted run supports only collapse_equivalent
+# and happiness_metric
+def check_strategy_modes(
+    *,
+    include_no_change: bool = False,
+    max_m: int | None = None,
+    oracle: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+    aggregate: bool = False,
+    table: bool = False,
+    sampling: SamplingBudget | None = None,
+    workers: int = 1,
+    time_budget: float | None = None,
+) -> None:
+    if aggregate and table:
+        raise ValueError("aggregate=True and table=True cannot be combined.")
+    if time_budget is not None:
+        given = {
+            "include_no_change": include_no_change, "max_m": max_m is not None, "oracle": oracle,
+            "incremental": incremental, "prune": prune, "aggregate": aggregate, "table": table,
+            "sampling": sampling is not None, "workers": workers != 1,
+        }
+        conflicting = [name for name, used in given.items() if used]
+        if conflicting:
+            raise ValueError(f"time_budget cannot be combined with {', '.join(conflicting)}.")
+
 #Compute O, H_i, H plus strategic option sets S_i 
 def run_btva_with_strategies(
     scheme: VotingScheme,
     situation: VotingSituation,
     *,
     include_no_change: bool = False,
-    max_m: int = 8,
+    max_m: int | None = None,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    collapse_equivalent: bool = False,
+    oracle: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+    aggregate: bool = False,
+    table: bool = False,
+    sampling: SamplingBudget | None = None,
+    workers: int = 1,
+    time_budget: float | None = None,
 ) -> BtvaResult:
+    check_strategy_modes(
+        include_no_change=include_no_change, max_m=max_m, oracle=oracle, incremental=incremental, prune=prune,
+        aggregate=aggregate, table=table, sampling=sampling, workers=workers, time_budget=time_budget,
+    )
     base = run_btva(scheme, situation, happiness_metric=happiness_metric)
+    if time_budget is not None:
+        return _run_anytime(
+            scheme, situation, base,
+            time_budget=time_budget, collapse_equivalent=collapse_equivalent, happiness_metric=happiness_metric,
+        )
 
     m = situation.m_alternatives
+    max_m = DEFAULT_MAX_M if max_m is None else max_m
+    skipped = permutation_enumeration_skipped(scheme, m, max_m, collapse_equivalent=collapse_equivalent)
+    # sampling estimates what the skipped enumeration would have found; the options themselves stay bullet (+ oracle)
+    sampled = None
+    if skipped and sampling is not None:
+        sample = sample_compromise_burying(scheme, situation, budget=sampling, baseline_outcome=base.outcome)
+        sampled = estimate_risk(situation, sample, happiness_metric=happiness_metric, confidence=sampling.confidence)
+
+    # workers != 1 enumerates the distinct sincere ballots in a process pool (0: one worker per core)
+    winners = None
+    if workers != 1 and not skipped and not aggregate:
+        winners = parallel_permutation_winners(
+            scheme, situation, base.outcome, workers=workers,
+            include_no_change=include_no_change,
+            collapse_equivalent=collapse_equivalent, incremental=incremental, prune=prune,
+        )
+    if aggregate:
+        # aggregate=True only counts ballots per winner; no StrategicOption is built
+        histograms = {"bullet": bullet_outcome_histograms(scheme, situation)}
+        if workers != 1 and not skipped:
+            # the workers reduce their ballots to per-winner counts
+            histograms["compromising_burying"] = parallel_outcome_histograms(
+                scheme, situation, base.outcome, workers=workers,
+                include_no_change=include_no_change,
+                collapse_equivalent=collapse_equivalent, incremental=incremental, prune=prune,
+            )
+        elif not skipped:
+            histograms["compromising_burying"] = permutation_outcome_histograms(
+                scheme, situation,
+                include_no_change=include_no_change,
+                collapse_equivalent=collapse_equivalent, incremental=incremental, prune=prune,
+            )
+        elif oracle:
+            histograms["compromising_burying"] = oracle_outcome_histograms(scheme, situation)
+        aggregates = _aggregate_histograms(situation, base, histograms, happiness_metric)
+        return BtvaResult(outcome=base.outcome, happiness=base.happiness, aggregates=aggregates, sampled=sampled)
+
+    if table:
+        # table=True stores the options column-wise in a StrategicOptionTable (needs numpy)
+        outcome = base.outcome
+        sources = {"bullet": lambda i: ((b, 1, w) for b, w in bullet_winners(scheme, situation, i, outcome))}
+        if winners is not None:
+            sources["compromising_burying"] = winners.__getitem__
+        elif not skipped:
+            sources["compromising_burying"] = lambda i: permutation_winners(
+                scheme, situation, i, outcome,
+                include_no_change=include_no_change,
+                collapse_equivalent=collapse_equivalent, incremental=incremental, prune=prune,
+            )
+        elif oracle:
+            sources["compromising_burying"] = lambda i: (
+                (ballot, 1, target)
+                for target, ballot in manipulation_oracle_for_voter(scheme, situation, i, baseline_scores=outcome.scores).items()
+                if ballot is not None and target != outcome.winner
+            )
+        option_table = StrategicOptionTable.from_sources(situation, outcome.winner, sources, happiness_metric=happiness_metric)
+        return BtvaResult(outcome=base.outcome, happiness=base.happiness, option_table=option_table, sampled=sampled)
+
     strategic_options: dict[int, list[StrategicOption]] = {i: [] for i in range(situation.n_voters)}
 
     bullet = enumerate_bullet_options(scheme, situation, happiness_metric=happiness_metric)
     for i, opts in bullet.items():
         strategic_options[i].extend(opts)
 
-    if m > max_m:
+    if skipped:
+        # oracle=True replaces the skipped enumeration by one witness ballot per reachable winner
+        if oracle:
+            for i, opts in enumerate_oracle_options(scheme, situation, happiness_metric=happiness_metric).items():
+                strategic_options[i].extend(opts)
+        return BtvaResult(outcome=base.outcome, happiness=base.happiness, strategic_options=strategic_options, sampled=sampled)
+
+    if winners is not None:
+        for i, rows in winners.items():
+            strategic_options[i].extend(_options_for_winners(situation, i, base.outcome, iter(rows), happiness_metric))
         return BtvaResult(outcome=base.outcome, happiness=base.happiness, strategic_options=strategic_options)
 
-    perms = enumerate_all_permutations_options(scheme, situation, include_no_change=include_no_change, happiness_metric=happiness_metric)
+    perms = enumerate_all_permutations_options(
+        scheme, situation,
+        include_no_change=include_no_change, happiness_metric=happiness_metric,
+        collapse_equivalent=collapse_equivalent, incremental=incremental, prune=prune,
+    )
     for i, opts in perms.items():
         strategic_options[i].extend(opts)
     return BtvaResult(outcome=base.outcome, happiness=base.happiness, strategic_options=strategic_options)
+
+
+# run_btva_with_strategies(..., aggregate=True, collapse_equivalent=True) for several rules in one pass:
+# every voter's ballots are generated once and scored under all scoring vectors (see btva.enumeration_fused).
+# built-in schemes are keyed by VotingScheme, custom_vectors (length m, non-increasing) by their name;
+# like borda, custom rules walk all m! orders and are skipped (bullet only) for m > max_m
+def run_btva_multi_scheme(
+    situation: VotingSituation,
+    schemes: Iterable[VotingScheme],
+    *,
+    custom_vectors: dict[str, Sequence[int]] | None = None,
+    include_no_change: bool = False,
+    max_m: int = 8,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    prune: bool = False,
+) -> dict[VotingScheme | str, BtvaResult]:
+
+    m = situation.m_alternatives
+    rules = scoring_rules(list(schemes), m, custom_vectors)
+    outcomes = tally_votes_rules(rules, situation)
+    enumerated = {
+        rule for rule in rules
+        if not (
+            permutation_enumeration_skipped(rule, m, max_m, collapse_equivalent=True)
+            if isinstance(rule, VotingScheme) else m > max_m
+        )
+    }
+    histograms = fused_outcome_histograms(
+        rules, situation, outcomes, enumerated=enumerated, include_no_change=include_no_change, prune=prune,
+    )
+
+    results: dict[VotingScheme | str, BtvaResult] = {}
+    for rule, outcome in outcomes.items():
+        base = BtvaResult(outcome=outcome, happiness=happiness_for_outcome(situation, outcome.winner, metric=happiness_metric))
+        aggregates = _aggregate_histograms(situation, base, histograms[rule], happiness_metric)
+        results[rule] = BtvaResult(outcome=outcome, happiness=base.happiness, aggregates=aggregates)
+    return results
+
+
+# a strategic option scored under another happiness metric (same ballot, same winner)
+def rescore_option(
+    situation: VotingSituation,
+    opt: StrategicOption,
+    metric: HappinessMetric,
+) -> StrategicOption:
+
+    return replace(
+        opt,
+        strategic_happiness=happiness_for_outcome(situation, opt.strategic_outcome, metric=metric),
+        baseline_happiness=happiness_for_outcome(situation, opt.baseline_outcome, metric=metric),
+    )
+
+# `result` under another happiness metric without enumerating again. Every metric is a function of each voter's
+# rank of the winner and the tactical ballots (winner ranked above the baseline one) are the same for all of them,
+# so options, aggregates and tables only need their happiness looked up again from the recorded winners.
+def with_happiness_metric(
+    situation: VotingSituation,
+    result: BtvaResult,
+    metric: HappinessMetric,
+) -> BtvaResult:
+
+    happiness = happiness_for_outcome(situation, result.outcome.winner, metric=metric)
+    base = BtvaResult(outcome=result.outcome, happiness=happiness)
+
+    strategic_options = None
+    if result.strategic_options is not None:
+        strategic_options = {
+            i: [rescore_option(situation, opt, metric) for opt in opts] for i, opts in result.strategic_options.items()
+        }
+
+    aggregates = None
+    if result.aggregates is not None:
+        kinds = {kind for agg in result.aggregates.values() for kind in agg.outcome_counts}
+        order = sorted(kinds, key=lambda k: (STRATEGY_KINDS.index(k) if k in STRATEGY_KINDS else len(STRATEGY_KINDS), k))
+        histograms = {
+            kind: {i: Counter(agg.outcome_counts.get(kind, {})) for i, agg in result.aggregates.items()}
+            for kind in order
+        }
+        aggregates = _aggregate_histograms(situation, base, histograms, metric)
+
+    option_table = None if result.option_table is None else result.option_table.with_metric(metric)
+    coverage = None
+    if result.coverage is not None:
+        coverage = _coverage(
+            situation, base, aggregates, result.coverage.pending, metric, result.coverage.elapsed_seconds,
+        )
+    sampled = None
+    if result.sampled is not None:
+        sampled = estimate_risk(situation, result.sampled.sample, happiness_metric=metric, confidence=result.sampled.confidence)
+    return BtvaResult(
+        outcome=result.outcome,
+        happiness=happiness,
+        strategic_options=strategic_options,
+        aggregates=aggregates,
+        option_table=option_table,
+        sampled=sampled,
+        coverage=coverage,
+    )
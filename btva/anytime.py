@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Sequence
+
+from .enumeration import permutation_winners
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .oracle import manipulation_oracle_for_voter
+from .strategic_options import voter_groups
+from .voting import VotingOutcome
+
+# Time-budgeted ("anytime") compromising/burying enumeration.
+# The manipulation oracle first tells, per distinct sincere ballot, which preferred winners the voter can force at all;
+# ballots with none are settled without enumeration. The others are enumerated (pruned, tactical ballots only)
+# largest voter type first until the deadline. Voter types left over are reported with their reachable winners,
+# from which the risk numbers get bounds instead of exact values.
+
+
+@dataclass(frozen=True)
+class Bounds:
+    low: float
+    high: float
+
+    @property
+    def exact(self) -> bool:
+        return self.low == self.high
+
+
+# how much of the strategy space an anytime run covered. pending maps every voter whose compromising/burying
+# ballots were not enumerated to the preferred winners the oracle says it can force; ballots count bullet plus
+# compromising/burying ballots, the latter m! - 1 per voter
+@dataclass(frozen=True)
+class Coverage:
+    complete: bool
+    elapsed_seconds: float
+    n_voters: int
+    voters_evaluated: int
+    ballots_total: int
+    ballots_evaluated: int
+    pending: dict[int, frozenset[str]]
+    tactical_options_total: Bounds
+    avg_gain_all_options: Bounds
+    fraction_change_winner: Bounds
+
+    @property
+    def voter_fraction(self) -> float:
+        return self.voters_evaluated / max(1, self.n_voters)
+
+    @property
+    def ballot_fraction(self) -> float:
+        return self.ballots_evaluated / max(1, self.ballots_total)
+
+
+@dataclass(frozen=True)
+class AnytimeWinners:
+    rows: dict[int, list[tuple[tuple[str, ...], int, str]]]
+    pending: dict[int, frozenset[str]]
+
+# tactical permutation_winners rows for as many voters as the deadline (a time.perf_counter() value) allows.
+# a voter type whose walk is cut by the deadline is dropped entirely, so every voter in `rows` is exact
+def budgeted_permutation_winners(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    baseline_outcome: VotingOutcome,
+    *,
+    deadline: float,
+    collapse_equivalent: bool = False,
+) -> AnytimeWinners:
+
+    situation.validate()
+    groups = voter_groups(situation)
+    reachable: list[frozenset[str]] = []
+    for voters in groups:
+        sincere = situation.sincere_ballot(voters[0])
+        better = sincere[:sincere.index(baseline_outcome.winner)]
+        witnesses = (
+            manipulation_oracle_for_voter(scheme, situation, voters[0], baseline_scores=baseline_outcome.scores)
+            if better else {}
+        )
+        reachable.append(frozenset(t for t in better if witnesses[t] is not None))
+
+    rows: dict[int, list[tuple[tuple[str, ...], int, str]]] = {}
+    pending: dict[int, frozenset[str]] = {}
+    for voters, targets in zip(groups, reachable):
+        for voter_idx in voters:
+            if targets:
+                pending[voter_idx] = targets
+            else:
+                rows[voter_idx] = []
+
+    # larger voter types first: one enumeration settles the most voters
+    order = sorted((g for g in range(len(groups)) if reachable[g]), key=lambda g: (-len(groups[g]), g))
+    for g in order:
+        if time.perf_counter() >= deadline:
+            break
+        found = list(permutation_winners(
+            scheme, situation, groups[g][0], baseline_outcome,
+            collapse_equivalent=collapse_equivalent, prune=True, deadline=deadline,
+        ))
+        if time.perf_counter() >= deadline:
+            break
+        for voter_idx in groups[g]:
+            rows[voter_idx] = found
+            del pending[voter_idx]
+
+    return AnytimeWinners(rows={i: rows[i] for i in sorted(rows)}, pending=pending)
+
+# bounds on a tactical ballot count and on the mean gain over tactical ballots. `known_count` / `known_gain` are the
+# exact part; each unknown voter adds between low and high ballots with gains in [gain_low, gain_high].
+# The extreme means put as many ballots as possible on the gains below (above) the mean, found by fixed-point iteration
+def risk_bounds(
+    known_count: float,
+    known_gain: float,
+    unknown: Sequence[tuple[int, int, float, float]],
+) -> tuple[Bounds, Bounds]:
+
+    count = Bounds(
+        low=known_count + sum(low for low, _, _, _ in unknown),
+        high=known_count + sum(high for _, high, _, _ in unknown),
+    )
+
+    def extreme(side: int) -> float:
+        picks = [(low, gain_low if side < 0 else gain_high) for low, _, gain_low, gain_high in unknown]
+        total = known_count + sum(c for c, _ in picks)
+        if not total:
+            return 0.0
+        mean = (known_gain + sum(c * g for c, g in picks)) / total
+        while True:
+            picks = [
+                (high if (g - mean) * side > 0 else low, g)
+                for (low, high, _, _), (_, g) in zip(unknown, picks)
+            ]
+            total = known_count + sum(c for c, _ in picks)
+            new = (known_gain + sum(c * g for c, g in picks)) / total
+            if (new - mean) * side <= 0:
+                return mean
+            mean = new
+
+    return count, Bounds(low=extreme(-1), high=extreme(1))
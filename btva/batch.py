@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .rank_matrix import RankMatrix, _require_numpy, np
+from .voting import scoring_vector, tally_votes
+
+# Result of tallying a stack of alternative ballots for one voter in a single NumPy pass.
+# columns of `scores` follow `alternatives` (lexicographic order); winners[b] is the column of ballot b's winner
+@dataclass(frozen=True, eq=False)
+class BatchOutcome:
+    scheme: VotingScheme
+    alternatives: tuple[str, ...]
+    scores: np.ndarray
+    winners: np.ndarray
+
+    @property
+    def winner_names(self) -> list[str]:
+        alts = self.alternatives
+        return [alts[w] for w in self.winners.tolist()]
+
+
+def encode_ballots(alternatives: Sequence[str], ballots: Sequence[Sequence[str]]) -> np.ndarray:
+    _require_numpy()
+    index = {a: i for i, a in enumerate(alternatives)}
+    return np.array([[index[a] for a in b] for b in ballots], dtype=np.int64).reshape(len(ballots), len(alternatives))
+
+# score matrix and winner vector for voter `voter_index` casting each ballot of the stack in turn.
+# `ballots` is a (B x m) array of alternative ids (positions into the lexicographically sorted alternatives)
+# or a sequence of ballots given as alternative names.
+# argmax returns the first maximum, i.e. the lexicographically smallest tied alternative, like tally_votes.
+def tally_votes_batch(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    voter_index: int,
+    ballots: np.ndarray | Sequence[Sequence[str]],
+    *,
+    baseline_scores: dict[str, int] | None = None,
+) -> BatchOutcome:
+
+    _require_numpy()
+    situation.validate()
+    m = situation.m_alternatives
+    vec = np.asarray(scoring_vector(scheme, m), dtype=np.int64)
+    alternatives = situation.position_counts.alternatives
+
+    if baseline_scores is None:
+        baseline_scores = tally_votes(scheme, situation).scores
+    if not isinstance(ballots, np.ndarray):
+        ballots = encode_ballots(alternatives, ballots)
+    ballots = np.asarray(ballots, dtype=np.int64)
+    if ballots.ndim != 2 or ballots.shape[1] != m:
+        raise ValueError(f"ballots must have shape (B, {m}), got {ballots.shape}.")
+
+    # scores of everybody except the deviating voter
+    others = np.array([baseline_scores[a] for a in alternatives], dtype=np.int64)
+    sincere = encode_ballots(alternatives, [situation.sincere_ballot(voter_index)])[0]
+    others[sincere] -= vec
+
+    contributions = np.zeros(ballots.shape, dtype=np.int64)
+    np.put_along_axis(contributions, ballots, np.broadcast_to(vec, ballots.shape), axis=1)
+    scores = others + contributions
+
+    return BatchOutcome(scheme=scheme, alternatives=alternatives, scores=scores, winners=scores.argmax(axis=1))
@@ -1,10 +1,24 @@
 from __future__ import annotations
 import argparse
+import itertools
 from pathlib import Path
 from .models import VotingScheme
-from .analysis import compute_risk, run_btva, run_btva_with_strategies
+from .analysis import (
+    DEFAULT_MAX_M,
+    RiskAccumulator,
+    aggregate_options,
+    permutation_enumeration_skipped,
+    rescore_option,
+    run_btva,
+    run_btva_with_strategies,
+    with_happiness_metric,
+)
+from .enumeration import iter_permutation_options
+from .enumeration_bullet import iter_bullet_options
+from .oracle import enumerate_oracle_options
 from .happiness import HappinessMetric
 from .parsing import load_input_file
+from .strategic_options import StrategicOption, voter_groups
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
@@ -26,10 +40,11 @@ def build_parser() -> argparse.ArgumentParser:
 
     p.add_argument(
         "--happiness-metric",
+        action="append",
         choices=[m.value for m in HappinessMetric],
-        default=HappinessMetric.BORDA.value,
+        default=None,
         help=(
-            "Happiness metric to use. "
+            "Happiness metric to use (repeatable: the ballots are enumerated once and reported per metric). "
             "borda = (m-1)-rank (historical default); "
             "rank_normalized = 1 - rank/(m-1) (float in [0,1])."
         ),
@@ -38,8 +53,29 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--max-m",
         type=int,
-        default=8,
-        help="Safety cap for --enumerate-strategies: refuse enumeration when m > max-m (default: 8).",
+        default=None,
+        help=(
+            f"Safety cap for compromising/burying enumeration: skip it when m > max-m (default: {DEFAULT_MAX_M}). "
+            "With --collapse-equivalent it only applies to borda."
+        ),
+    )
+
+    p.add_argument(
+        "--collapse-equivalent",
+        action="store_true",
+        help=(
+            "List one representative per outcome-equivalent ballot class, marked '(+k equivalent ballots)', "
+            "instead of every permutation (counts and risk are the same either way)."
+        ),
+    )
+
+    p.add_argument(
+        "--oracle",
+        action="store_true",
+        help=(
+            "When enumeration is skipped for m > max-m, add one witness ballot per winner the voter can force "
+            "(polynomial manipulation oracle). fraction_change_winner stays exact; avg_gain_all_options does not."
+        ),
     )
 
     p.add_argument(
@@ -52,6 +88,28 @@ def build_parser() -> argparse.ArgumentParser:
         ),
     )
 
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes for compromising/burying enumeration; voters with distinct sincere "
+            "ballots are spread over them (0 = one per CPU core, default: 1)."
+        ),
+    )
+
+    p.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help=(
+            "Seconds for the strategy analysis: bullet options and oracle checks first, then compromising/burying "
+            "enumeration voter type by voter type until the budget runs out. "
+            "Cannot be combined with --workers, --oracle or --max-m. "
+            "Prints the coverage and bounds on the risk values."
+        ),
+    )
+
     p.add_argument(
         "--risk-method",
         choices=["avg_gain_all_options", "fraction_change_winner"],
@@ -68,65 +126,138 @@ def build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.time_budget is not None:
+        given = {"--workers": args.workers != 1, "--oracle": args.oracle, "--max-m": args.max_m is not None}
+        conflicting = [flag for flag, used in given.items() if used]
+        if conflicting:
+            parser.error(f"--time-budget cannot be combined with {', '.join(conflicting)}")
+    max_m = DEFAULT_MAX_M if args.max_m is None else args.max_m
     parsed = load_input_file(Path(args.input))
     scheme: VotingScheme = VotingScheme(args.scheme)
-    happiness_metric = HappinessMetric(args.happiness_metric)
+    metrics = [HappinessMetric(h) for h in args.happiness_metric or [HappinessMetric.BORDA.value]]
+    happiness_metric = metrics[0]
 
-    result = run_btva_with_strategies(scheme, parsed.situation, max_m=args.max_m, happiness_metric=happiness_metric)
+    collapse = args.collapse_equivalent
+    limit = args.strategy_limit
+    unlimited = limit is None or limit < 0
+    situation = parsed.situation
+    skipped = permutation_enumeration_skipped(scheme, situation.m_alternatives, max_m, collapse_equivalent=collapse)
+    listed = None
+    if args.time_budget is not None:
+        # the anytime run returns the options it evaluated together with their counts
+        first = listed = run_btva_with_strategies(
+            scheme, situation,
+            happiness_metric=happiness_metric, collapse_equivalent=collapse, time_budget=args.time_budget,
+        )
+        skipped = False
+    elif (args.workers != 1 or unlimited) and not skipped:
+        # every option is printed (or enumerated in a worker pool): one listing pass, shared by voters with the
+        # same sincere ballot, gives the options; counts and risk are read from that list
+        listed = run_btva_with_strategies(
+            scheme, situation,
+            max_m=max_m, happiness_metric=happiness_metric, collapse_equivalent=collapse,
+            prune=True, workers=args.workers,
+        )
+        first = aggregate_options(situation, listed, happiness_metric)
+    else:
+        # the aggregate pass gives the per-voter counts and the risk; the first --strategy-limit options are generated
+        # lazily below, once per distinct sincere ballot
+        first = run_btva_with_strategies(
+            scheme, situation,
+            max_m=max_m, happiness_metric=happiness_metric, collapse_equivalent=collapse, oracle=args.oracle,
+            prune=True, aggregate=True,
+        )
 
-    print(f"scheme: {result.outcome.scheme.value}")
-    print(f"winner: {result.outcome.winner}")
-    print(f"happiness_metric: {happiness_metric.value}")
-    print(f"H_i: {[float(x) for x in result.happiness.per_voter]}")
-    print(f"H: {float(result.happiness.total)}")
+    print(f"scheme: {first.outcome.scheme.value}")
+    print(f"winner: {first.outcome.winner}")
 
-    for alt in sorted(result.outcome.scores):
-        print(f"{alt}: {result.outcome.scores[alt]}")
+    oracle_options = (
+        enumerate_oracle_options(scheme, situation, happiness_metric=happiness_metric)
+        if skipped and args.oracle else None
+    )
 
-    assert result.strategic_options is not None
+    # further metrics reuse the winners of the first pass and the options shown for it
+    shown_by_voter: dict[int, list[StrategicOption]] = {}
+    shown_by_type: dict[int, list[StrategicOption]] = {}
+    representative = {i: voters[0] for voters in voter_groups(situation) for i in voters}
+    for h_idx, metric in enumerate(metrics):
+        result = with_happiness_metric(situation, first, metric) if h_idx else first
+        print(f"happiness_metric: {metric.value}")
+        print(f"H_i: {[float(x) for x in result.happiness.per_voter]}")
+        print(f"H: {float(result.happiness.total)}")
 
-    tactical_options_by_voter: dict[int, list] = {
-        voter_idx: [opt for opt in opts if opt.H_tilde_i > opt.H_i]
-        for voter_idx, opts in result.strategic_options.items()
-    }
+        if not h_idx:
+            for alt in sorted(result.outcome.scores):
+                print(f"{alt}: {result.outcome.scores[alt]}")
 
-    shown_options_by_voter: dict[int, list] = {}
-    for voter_idx, options in tactical_options_by_voter.items():
-        filtered_options = options
+        assert result.aggregates is not None
 
-        shown_options_by_voter[voter_idx] = filtered_options
+        for voter_idx, agg in result.aggregates.items():
+            by_kind = agg.tactical_counts
 
-        by_kind: dict[str, int] = {}
-        for opt in filtered_options:
-            by_kind[opt.strategy_kind] = by_kind.get(opt.strategy_kind, 0) + 1
+            breakdown = ", ".join(f"{k}={v}" for k, v in sorted(by_kind.items()))
+            if breakdown:
+                breakdown = f" ({breakdown})"
+            if result.coverage is not None and voter_idx in result.coverage.pending:
+                breakdown += " (compromising_burying not evaluated)"
+            print(f"S_{voter_idx}: {agg.n_tactical} options{breakdown}")
 
-        breakdown = ", ".join(f"{k}={v}" for k, v in sorted(by_kind.items()))
-        if breakdown:
-            breakdown = f" ({breakdown})"
-        print(f"S_{voter_idx}: {len(filtered_options)} options{breakdown}")
+            if h_idx:
+                shown = (rescore_option(situation, opt, metric) for opt in shown_by_voter[voter_idx])
+            elif listed is not None:
+                options = (opt for opt in listed.strategic_options[voter_idx] if opt.H_tilde_i > opt.H_i)
+            else:
+                options = iter_bullet_options(scheme, situation, voter_idx, happiness_metric=metric)
+                if oracle_options is not None:
+                    witnesses = (opt for opt in oracle_options[voter_idx] if opt.H_tilde_i > opt.H_i)
+                    options = itertools.chain(options, witnesses)
+                elif not skipped:
+                    options = itertools.chain(options, iter_permutation_options(
+                        scheme, situation, voter_idx, happiness_metric=metric, collapse_equivalent=collapse,
+                    ))
 
-        limit = args.strategy_limit
-        if limit is None or limit < 0:
-            shown = filtered_options
-        else:
-            shown = filtered_options[:limit]
+            if not h_idx:
+                rep = representative[voter_idx]
+                if listed is None and rep in shown_by_type:
+                    shown = [opt.for_voter(voter_idx) for opt in shown_by_type[rep]]
+                else:
+                    shown = options if unlimited else itertools.islice(options, limit)
+                    if listed is None:
+                        shown = shown_by_type[rep] = list(shown)
+                if len(metrics) > 1:
+                    shown = shown_by_voter[voter_idx] = list(shown)
 
-        for j, opt in enumerate(shown):
-            print(f"  s_{voter_idx},{j}: kind={opt.strategy_kind} v~={list(opt.tactical_ballot.preferences)} "
-                f"O~={opt.strategic_outcome} H~_i={opt.H_tilde_i} H_i={opt.H_i} H~={opt.H_tilde} H={opt.H}")
+            for j, opt in enumerate(shown):
+                same = f" (+{opt.multiplicity - 1} equivalent ballots)" if opt.multiplicity > 1 else ""
+                print(f"  s_{voter_idx},{j}: kind={opt.strategy_kind} v~={list(opt.tactical_ballot.preferences)} "
+                    f"O~={opt.strategic_outcome} H~_i={opt.H_tilde_i} H_i={opt.H_i} H~={opt.H_tilde} H={opt.H}{same}")
 
-    risk = compute_risk(tactical_options_by_voter, method=args.risk_method)
-    by_kind = risk.get("by_strategy_kind", {})
-    if isinstance(by_kind, dict) and by_kind:
-        breakdown = ", ".join(f"{k}={v:.4g}" for k, v in sorted(by_kind.items()))
-        breakdown = f" ({breakdown})"
-    else:
-        breakdown = ""
-    print(f"risk ({risk['method']}): {risk['overall']:.4g}{breakdown}")
+        accumulator = RiskAccumulator(situation.n_voters, (args.risk_method,), tactical_only=True)
+        risk = accumulator.add_aggregates(result.aggregates).risk(args.risk_method)
+        by_kind = risk.get("by_strategy_kind", {})
+        if isinstance(by_kind, dict) and by_kind:
+            breakdown = ", ".join(f"{k}={v:.4g}" for k, v in sorted(by_kind.items()))
+            breakdown = f" ({breakdown})"
+        else:
+            breakdown = ""
+        print(f"risk ({risk['method']}): {risk['overall']:.4g}{breakdown}")
+        if result.coverage is not None:
+            bounds = getattr(result.coverage, risk["method"])
+            print(f"risk bounds ({risk['method']}): [{bounds.low:.4g}, {bounds.high:.4g}]")
 
-    m = parsed.situation.m_alternatives
-    if m > args.max_m:
-        print(f"note: m={m} > max-m={args.max_m}, so compromising_burying enumeration was skipped (bullet options only).")
+    m = situation.m_alternatives
+    coverage = first.coverage
+    if coverage is not None:
+        state = "complete" if coverage.complete else "time budget exhausted"
+        print(
+            f"coverage: {coverage.voters_evaluated}/{coverage.n_voters} voters ({coverage.voter_fraction:.1%}), "
+            f"{coverage.ballot_fraction:.1%} of ballots in {coverage.elapsed_seconds:.3g}s ({state})"
+        )
+    if skipped:
+        if args.oracle:
+            print(f"note: m={m} > max-m={max_m}, so compromising_burying options are oracle witnesses (one per reachable winner).")
+        else:
+            print(f"note: m={m} > max-m={max_m}, so compromising_burying enumeration was skipped (bullet options only).")
     return 0
 
 if __name__ == "__main__":
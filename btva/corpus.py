@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import mmap
+import os
+import struct
+from array import array
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .models import VotingSituation
+from .parsing import (
+    PARSER_VERSION,
+    AbifBallots,
+    ParsedInput,
+    _decode_ballots,
+    _encode_ballots,
+    _parsed_input,
+    _rank_matrix,
+    load_input_file,
+    read_abif_ballots,
+)
+from .rank_matrix import RankMatrix
+
+# Single-file scenario corpus: a directory of .abif files packed into one indexed binary file, so a sweep opens
+# one file instead of hundreds. Layout: a header, the scenario names, one index record per scenario
+# (offset, size, m, n, number of distinct rankings and ballot runs) and the per-scenario bodies in the parse cache
+# encoding (counts, ballot runs and the distinct rankings as raw arrays, 8-byte aligned). Scenarios that fail to
+# parse or validate keep their error message instead of a body. The file is memory-mapped and each scenario is
+# decoded from views into the map; only the distinct rankings and the per-voter structure are built. Those views never
+# leave the corpus (ballots() copies its run arrays out), so close() can unmap while loaded scenarios are still in use.
+
+_MAGIC = b"BTVACORP"
+_HEADER = struct.Struct("<8sIIQ")
+_RECORD = struct.Struct("<QQIIQQQ")
+_OK = 0
+_ERROR = 1
+
+
+@dataclass(frozen=True)
+class CorpusEntry:
+    name: str
+    m_alternatives: int
+    n_voters: int
+    n_distinct: int
+    n_runs: int
+    error: str | None
+    offset: int
+    size: int
+
+
+def _pad(n: int) -> int:
+    return n + (-n % 8)
+
+# pack the given .abif files into one corpus file at `out`; scenario names are the file names
+def build_corpus(scenario_files: Iterable[Path], out: str | Path) -> Path:
+    files = list(scenario_files)
+    names = [Path(p).name for p in files]
+    if len(set(names)) != len(names):
+        raise ValueError("Corpus scenario names must be unique.")
+
+    name_block = "\n".join(names).encode("utf-8")
+    offset = _pad(_HEADER.size + len(name_block)) + _RECORD.size * len(files)
+
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    records: list[bytes] = []
+    with tmp.open("wb") as f:
+        f.seek(offset)
+        for p in files:
+            try:
+                read = read_abif_ballots(p)
+                _parsed_input(read)
+            except ValueError as e:
+                body = str(e).encode("utf-8")
+                record = _RECORD.pack(offset, len(body), 0, _ERROR, 0, 0, 0)
+            else:
+                body = _encode_ballots(read)
+                record = _RECORD.pack(
+                    offset, len(body), read.m_alternatives, _OK, len(read.ballots), len(read.run_types), read.n_voters,
+                )
+            body += bytes(-len(body) % 8)
+            f.write(body)
+            records.append(record)
+            offset += len(body)
+
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, PARSER_VERSION, len(files), len(name_block)))
+        f.write(name_block)
+        f.write(bytes(-f.tell() % 8))
+        f.writelines(records)
+    os.replace(tmp, out)
+    return out
+
+
+def is_corpus_file(path: str | Path) -> bool:
+    p = Path(path)
+    if not p.is_file():
+        return False
+    with p.open("rb") as f:
+        return f.read(len(_MAGIC)) == _MAGIC
+
+
+class Corpus:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a scenario corpus")
+        magic, version, n_scenarios, names_len = _HEADER.unpack_from(self._view)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a scenario corpus")
+        if version != PARSER_VERSION:
+            raise ValueError(f"{self.path} was built with parser version {version}, rebuild it for {PARSER_VERSION}")
+
+        names_start = _HEADER.size
+        names = bytes(self._view[names_start:names_start + names_len]).decode("utf-8").split("\n") if n_scenarios else []
+        index = _pad(names_start + names_len)
+        self._entries: dict[str, CorpusEntry] = {}
+        for k, name in enumerate(names):
+            offset, size, m, kind, n_distinct, n_runs, n_voters = _RECORD.unpack_from(self._view, index + k * _RECORD.size)
+            error = bytes(self._view[offset:offset + size]).decode("utf-8") if kind == _ERROR else None
+            self._entries[name] = CorpusEntry(
+                name=name, m_alternatives=m, n_voters=n_voters, n_distinct=n_distinct, n_runs=n_runs,
+                error=error, offset=offset, size=size,
+            )
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def entry(self, name: str) -> CorpusEntry:
+        return self._entries[name]
+
+    # ballots whose run arrays are views into the map; callers drop them before returning
+    def _decoded(self, name: str) -> AbifBallots:
+        e = self._entries[name]
+        if e.error is not None:
+            raise ValueError(e.error)
+        return _decode_ballots(self._view[e.offset:e.offset + e.size], e.m_alternatives, e.n_distinct, e.n_runs)
+
+    # parsed ballots of one scenario; raises the ValueError the scenario failed with when it was packed
+    def ballots(self, name: str) -> AbifBallots:
+        read = self._decoded(name)
+        return replace(read, run_types=array("q", read.run_types), run_counts=array("q", read.run_counts))
+
+    # same result as load_input_file on the packed file; the scenario was validated when it was packed
+    def load(self, name: str) -> ParsedInput:
+        return _parsed_input(self._decoded(name), validated=True)
+
+    def situation(self, name: str) -> VotingSituation:
+        return self.load(name).situation
+
+    def rank_matrix(self, name: str) -> RankMatrix:
+        return _rank_matrix(self._decoded(name))
+
+    # scenarios whose names match include_globs (default: all), minus exclude_prefixes, sorted by name
+    def scenarios(
+        self,
+        *,
+        include_globs: list[str] | None = None,
+        exclude_prefixes: tuple[str, ...] = (),
+    ) -> list[CorpusScenario]:
+        globs = include_globs or ["*.abif"]
+        names = sorted(n for n in self._entries if any(fnmatch.fnmatchcase(n, g) for g in globs))
+        return [
+            CorpusScenario(corpus=self, name=n)
+            for n in names
+            if not any(n.startswith(prefix) for prefix in exclude_prefixes)
+        ]
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> Corpus:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def load_corpus(path: str | Path) -> Corpus:
+    return Corpus(path)
+
+# one scenario of a corpus, usable wherever the experiment runners take a scenario file
+@dataclass(frozen=True)
+class CorpusScenario:
+    corpus: Corpus
+    name: str
+
+    def load(self) -> ParsedInput:
+        return self.corpus.load(self.name)
+
+# load a scenario file or a corpus scenario
+def load_scenario(scenario: Path | CorpusScenario, *, cache_dir: Path | None = None) -> ParsedInput:
+    if isinstance(scenario, CorpusScenario):
+        return scenario.load()
+    return load_input_file(scenario, cache_dir=cache_dir)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="btva.corpus",
+        description="Pack a directory of .abif scenarios into one indexed corpus file.",
+    )
+    p.add_argument(
+        "--scenarios-dir",
+        type=str,
+        default="voting_scenarios",
+        help="Directory containing .abif scenario files (default: voting_scenarios).",
+    )
+    p.add_argument(
+        "--include",
+        type=str,
+        action="append",
+        default=None,
+        help="Glob for scenario files to include (repeatable, default: *.abif).",
+    )
+    p.add_argument(
+        "--exclude-prefix",
+        type=str,
+        action="append",
+        default=[],
+        help="Exclude files whose name starts with this prefix (repeatable).",
+    )
+    p.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Output corpus path. Default: <scenarios-dir>.corpus",
+    )
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .experiments import _iter_scenario_files
+
+    args = build_parser().parse_args(argv)
+    scenarios_dir = Path(args.scenarios_dir)
+    files = _iter_scenario_files(
+        scenarios_dir,
+        include_globs=args.include,
+        exclude_prefixes=tuple(args.exclude_prefix),
+    )
+    out = build_corpus(files, args.out or f"{scenarios_dir}.corpus")
+    with load_corpus(out) as corpus:
+        failed = sum(corpus.entry(n).error is not None for n in corpus)
+        print(f"packed {len(corpus)} scenarios ({failed} failing) into {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,302 @@
 from __future__ import annotations
 import itertools
+import math
+import time
+from collections import Counter
+from typing import Iterator
+from .batch import tally_votes_batch
 from .happiness import HappinessMetric, happiness_for_outcome
-from .models import VotingScheme, VotingSituation
-from .strategic_options import StrategicOption
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .oracle import manipulation_oracle_for_voter
+from .rank_matrix import np
+from .strategic_options import StrategicOption, expand_by_ballot_type, voter_groups
 from .strategies import StrategicBallot
-from .voting import tally_votes, tally_votes_strategic
+from .voting import VotingOutcome, scoring_vector, tally_votes, tally_votes_delta
+
+# one representative ballot per outcome-equivalent class of permutations, with the number of permutations it stands for.
+# plurality only reads the top choice, vote_for_two the unordered top pair and anti_plurality the bottom choice,
+# so those schemes have m, C(m,2) and m classes; borda needs the full order (m! classes of size 1).
+# representatives keep the rest of the voter's sincere order; without include_no_change the sincere ballot
+# is removed from its class and that class is represented by a neighbouring ballot instead.
+def ballot_equivalence_classes(
+    scheme: VotingScheme,
+    alternatives: tuple[str, ...],
+    sincere: tuple[str, ...],
+    *,
+    include_no_change: bool = False,
+) -> list[tuple[tuple[str, ...], int]]:
+
+    m = len(alternatives)
+    if scheme == VotingScheme.BORDA:
+        return [
+            (perm, 1) for perm in itertools.permutations(alternatives)
+            if include_no_change or perm != sincere
+        ]
+
+    def rest(*fixed: str) -> tuple[str, ...]:
+        return tuple(a for a in sincere if a not in fixed)
+
+    if scheme == VotingScheme.PLURALITY:
+        size = math.factorial(m - 1)
+        classes = [((c,) + rest(c), size) for c in alternatives]
+        free = (m - 2, m - 1)
+    elif scheme == VotingScheme.ANTI_PLURALITY:
+        size = math.factorial(m - 1)
+        classes = [(rest(c) + (c,), size) for c in alternatives]
+        free = (0, 1)
+    elif scheme == VotingScheme.VOTE_FOR_TWO:
+        size = 2 * math.factorial(m - 2)
+        order = {a: k for k, a in enumerate(sincere)}
+        classes = []
+        for pair in itertools.combinations(alternatives, 2):
+            a, b = sorted(pair, key=order.__getitem__)
+            classes.append(((a, b) + rest(a, b), size))
+        free = (0, 1)
+    else:
+        raise ValueError(f"Unsupported voting scheme: {scheme}")
+
+    if include_no_change:
+        return classes
+
+    out: list[tuple[tuple[str, ...], int]] = []
+    for ballot, size in classes:
+        if ballot == sincere:
+            if size == 1:
+                continue
+            swapped = list(ballot)
+            swapped[free[0]], swapped[free[1]] = swapped[free[1]], swapped[free[0]]
+            ballot, size = tuple(swapped), size - 1
+        out.append((ballot, size))
+    return out
+
+# walk all m! ballots of voter `voter_index` in Heap's-algorithm order and yield (ballot, winner).
+# consecutive ballots differ by one swap, so only the two swapped alternatives' scores change;
+# the running argmax is only rescanned when the current leader loses points.
+# alternatives are handled as ids in lexicographic order, so the lowest id wins ties like tally_votes.
+def heap_permutation_winners(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baseline_scores: dict[str, int],
+    *,
+    include_no_change: bool = False,
+) -> Iterator[tuple[tuple[str, ...], str]]:
+
+    m = situation.m_alternatives
+    vec = scoring_vector(scheme, m)
+    names = tuple(sorted(baseline_scores))
+    index = {a: k for k, a in enumerate(names)}
+
+    sincere = [index[a] for a in situation.sincere_ballot(voter_index)]
+    ballot = [index[a] for a in situation.alternatives]
+    scores = [baseline_scores[a] for a in names]
+    for pos, a in enumerate(sincere):
+        scores[a] -= vec[pos]
+    for pos, a in enumerate(ballot):
+        scores[a] += vec[pos]
+
+    best = max(range(m), key=lambda a: (scores[a], -a))
+    # positions where the ballot differs from the sincere one; zero means "no change"
+    mismatches = sum(1 for x, y in zip(ballot, sincere) if x != y)
+
+    if include_no_change or mismatches:
+        yield tuple(names[a] for a in ballot), names[best]
+
+    counters = [0] * m
+    k = 1
+    while k < m:
+        if counters[k] < k:
+            i = 0 if k % 2 == 0 else counters[k]
+            j = k
+            a, b = ballot[i], ballot[j]
+            mismatches -= (a != sincere[i]) + (b != sincere[j])
+            ballot[i], ballot[j] = b, a
+            mismatches += (b != sincere[i]) + (a != sincere[j])
+
+            delta = vec[j] - vec[i]
+            scores[a] += delta
+            scores[b] -= delta
+            if (best == a and delta < 0) or (best == b and delta > 0):
+                best = max(range(m), key=lambda c: (scores[c], -c))
+            else:
+                for c in (a, b):
+                    if scores[c] > scores[best] or (scores[c] == scores[best] and c < best):
+                        best = c
+
+            if include_no_change or mismatches:
+                yield tuple(names[c] for c in ballot), names[best]
+            counters[k] += 1
+            k = 1
+        else:
+            counters[k] = 0
+            k += 1
+
+# depth-first walk over ballot prefixes of voter `voter_index` that only yields the (ballot, winner) pairs
+# electing one of `targets`. A prefix is cut as soon as every target is beaten for sure: placed alternatives
+# have exact scores, unplaced ones still get between vec[-1] and vec[depth] points.
+# ballots come out in itertools.permutations order; the caller may shrink `targets` while the walk runs.
+# the walk also stops once time.perf_counter() passes `deadline`; the caller has to check the clock to tell it apart
+def pruned_permutation_winners(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baseline_scores: dict[str, int],
+    targets: set[str],
+    *,
+    deadline: float | None = None,
+) -> Iterator[tuple[tuple[str, ...], str]]:
+
+    m = situation.m_alternatives
+    vec = scoring_vector(scheme, m)
+    names = tuple(sorted(baseline_scores))
+    index = {a: k for k, a in enumerate(names)}
+    order = [index[a] for a in situation.alternatives]
+
+    scores = [baseline_scores[a] for a in names]
+    for pos, a in enumerate(situation.sincere_ballot(voter_index)):
+        scores[index[a]] -= vec[pos]
+    others = list(scores)
+    used = [False] * m
+    prefix: list[int] = []
+
+    def hopeless(depth: int) -> bool:
+        low = [scores[a] if used[a] else others[a] + vec[-1] for a in range(m)]
+        ranked = sorted(range(m), key=lambda a: (-low[a], a))[:2]
+        for t in targets:
+            c = index[t]
+            high = scores[c] if used[c] else others[c] + vec[depth]
+            x = ranked[0] if ranked[0] != c else ranked[1]
+            if low[x] < high or (low[x] == high and x > c):
+                return False
+        return True
+
+    def walk(depth: int) -> Iterator[tuple[tuple[str, ...], str]]:
+        if depth == m:
+            winner = names[max(range(m), key=lambda a: (scores[a], -a))]
+            if winner in targets:
+                yield tuple(names[a] for a in prefix), winner
+            return
+        if hopeless(depth) or (deadline is not None and time.perf_counter() >= deadline):
+            return
+        for a in order:
+            if used[a]:
+                continue
+            used[a] = True
+            scores[a] += vec[depth]
+            prefix.append(a)
+            yield from walk(depth + 1)
+            prefix.pop()
+            scores[a] -= vec[depth]
+            used[a] = False
+            if not targets:
+                return
+
+    if targets:
+        yield from walk(0)
+
+# (ballot, multiplicity, winner) for the compromising/burying ballots of voter `voter_index`;
+# the keyword arguments mean the same as for enumerate_all_permutations_options_for_voter below;
+# deadline is passed on to pruned_permutation_winners
+def permutation_winners(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baseline_outcome: VotingOutcome,
+    *,
+    include_no_change: bool = False,
+    vectorized: bool | None = None,
+    collapse_equivalent: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+    witness_per_outcome: bool = False,
+    deadline: float | None = None,
+) -> Iterator[tuple[tuple[str, ...], int, str]]:
+
+    sincere = situation.sincere_ballot(voter_index)
+    collapsed = collapse_equivalent and scheme != VotingScheme.BORDA
+
+    targets: set[str] | None = None
+    if prune:
+        targets = set(sincere[:sincere.index(baseline_outcome.winner)])
+        if witness_per_outcome and targets:
+            reachable = manipulation_oracle_for_voter(scheme, situation, voter_index, baseline_scores=baseline_outcome.scores)
+            targets = {t for t in targets if reachable[t] is not None}
+        if not targets:
+            return
+
+    classes: list[tuple[tuple[str, ...], int]] | None = None
+    winners: list[str] | None = None
+    if prune and not collapsed:
+        pruned = pruned_permutation_winners(
+            scheme, situation, voter_index, baseline_outcome.scores, targets, deadline=deadline,
+        )
+        candidates = ((perm, 1, winner) for perm, winner in pruned)
+    elif collapsed:
+        classes = ballot_equivalence_classes(scheme, situation.alternatives, sincere, include_no_change=include_no_change)
+    elif incremental:
+        walked = list(heap_permutation_winners(
+            scheme, situation, voter_index, baseline_outcome.scores, include_no_change=include_no_change,
+        ))
+        classes = [(perm, 1) for perm, _ in walked]
+        winners = [winner for _, winner in walked]
+    else:
+        classes = [
+            (perm, 1) for perm in itertools.permutations(situation.alternatives)
+            if include_no_change or perm != sincere
+        ]
+
+    if classes is not None:
+        perms = [ballot for ballot, _ in classes]
+        if vectorized is None:
+            vectorized = np is not None
+        if winners is None and vectorized:
+            winners = tally_votes_batch(
+                scheme, situation, voter_index, perms, baseline_scores=baseline_outcome.scores
+            ).winner_names
+        elif winners is None:
+            winners = [
+                tally_votes_delta(
+                    scheme,
+                    situation,
+                    baseline_outcome.scores,
+                    overrides={voter_index: StrategicBallot(voter_index=voter_index, kind="compromising_burying", preferences=perm)},
+                ).winner
+                for perm in perms
+            ]
+        candidates = ((perm, multiplicity, winner) for (perm, multiplicity), winner in zip(classes, winners))
+
+    for perm, multiplicity, winner in candidates:
+        if targets is not None:
+            if winner not in targets:
+                continue
+            if witness_per_outcome:
+                targets.discard(winner)
+        yield perm, multiplicity, winner
+        if targets is not None and not targets:
+            return
 
 #enumerate strategic options for voter i by trying all permutations
+# vectorized=None tallies all permutations in one NumPy batch when numpy is installed
+# collapse_equivalent=True tries one ballot per outcome-equivalent class (see ballot_equivalence_classes);
+# each option then carries the class size in `multiplicity`
+# incremental=True walks the permutations with heap_permutation_winners instead (same options, different order)
+# prune=True only returns tactical options (winner ranked above the baseline winner by voter i) and skips ballot
+# prefixes that cannot elect such a winner; a voter whose top choice already wins costs no tallies at all.
+# With prune, tactical_limit stops after that many options and witness_per_outcome keeps one option per improving
+# winner and stops once every winner the manipulation oracle says is reachable has been witnessed.
 def enumerate_all_permutations_options_for_voter(
     scheme: VotingScheme,
-    situation: VotingSituation,
+    situation: VotingSituation | WeightedProfile,
     voter_index: int,
     *,
     include_no_change: bool = False,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    vectorized: bool | None = None,
+    collapse_equivalent: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+    tactical_limit: int | None = None,
+    witness_per_outcome: bool = False,
 ) -> list[StrategicOption]:
 
     situation.validate()
@@ -21,48 +304,135 @@ def enumerate_all_permutations_options_for_voter(
         raise IndexError("voter_index out of range")
 
     baseline_outcome = tally_votes(scheme, situation)
-    baseline_happy = happiness_for_outcome(situation, baseline_outcome.winner, metric=happiness_metric)
 
-    sincere = situation.voters_preferences[voter_index]
+    candidates = permutation_winners(
+        scheme, situation, voter_index, baseline_outcome,
+        include_no_change=include_no_change, vectorized=vectorized, collapse_equivalent=collapse_equivalent,
+        incremental=incremental, prune=prune, witness_per_outcome=witness_per_outcome,
+    )
+    options = _options_for_winners(situation, voter_index, baseline_outcome, candidates, happiness_metric)
+    if prune and tactical_limit is not None:
+        options = itertools.islice(options, tactical_limit)
+    return list(options)
 
-    options: list[StrategicOption] = []
-    for perm in itertools.permutations(situation.alternatives):
-        if not include_no_change and perm == sincere:
-            continue
 
+def _options_for_winners(
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baseline_outcome: VotingOutcome,
+    candidates: Iterator[tuple[tuple[str, ...], int, str]],
+    happiness_metric: HappinessMetric,
+) -> Iterator[StrategicOption]:
+
+    baseline_happy = happiness_for_outcome(situation, baseline_outcome.winner, metric=happiness_metric)
+    for perm, multiplicity, winner in candidates:
         tactical = StrategicBallot(voter_index=voter_index, kind="compromising_burying", preferences=tuple(perm),)
 
-        out = tally_votes_strategic(scheme, situation, overrides={voter_index: tactical})
-        happy = happiness_for_outcome(situation, out.winner, metric=happiness_metric)
+        happy = happiness_for_outcome(situation, winner, metric=happiness_metric)
+
+        yield StrategicOption(
+            voter_index=voter_index,
+            strategy_kind="compromising_burying",
+            tactical_ballot=tactical,
+            strategic_outcome=winner,
+            baseline_outcome=baseline_outcome.winner,
+            strategic_happiness=happy,
+            baseline_happiness=baseline_happy,
+            multiplicity=multiplicity,
+        )
 
-        options.append(
-            StrategicOption(
-                voter_index=voter_index,
-                strategy_kind="compromising_burying",
-                tactical_ballot=tactical,
-                strategic_outcome=out.winner,
-                baseline_outcome=baseline_outcome.winner,
-                strategic_happiness=happy,
-                baseline_happiness=baseline_happy,
-            ))
-    return options
+# lazy version of enumerate_all_permutations_options_for_voter(prune=True): yields the tactical options one by one,
+# so a caller that stops after k options only pays for the ballots walked so far
+def iter_permutation_options(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    *,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    collapse_equivalent: bool = False,
+) -> Iterator[StrategicOption]:
+
+    situation.validate()
+    if not (0 <= voter_index < situation.n_voters):
+        raise IndexError("voter_index out of range")
 
+    baseline_outcome = tally_votes(scheme, situation)
+    candidates = permutation_winners(
+        scheme, situation, voter_index, baseline_outcome, collapse_equivalent=collapse_equivalent, prune=True,
+    )
+    yield from _options_for_winners(situation, voter_index, baseline_outcome, candidates, happiness_metric)
 
 def enumerate_all_permutations_options(
     scheme: VotingScheme,
-    situation: VotingSituation,
+    situation: VotingSituation | WeightedProfile,
     *,
     include_no_change: bool = False,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    vectorized: bool | None = None,
+    collapse_equivalent: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+    tactical_limit: int | None = None,
+    witness_per_outcome: bool = False,
 ) -> dict[int, list[StrategicOption]]:
     situation.validate()
-    return {
-        i: enumerate_all_permutations_options_for_voter(
-            scheme,
-            situation,
-            i,
-            include_no_change=include_no_change,
-            happiness_metric=happiness_metric,
+    # voters with the same sincere ballot get the same options, so each distinct ballot is enumerated once
+    return expand_by_ballot_type(
+        situation,
+        lambda i: enumerate_all_permutations_options_for_voter(
+            scheme, situation, i,
+            include_no_change=include_no_change, happiness_metric=happiness_metric, vectorized=vectorized,
+            collapse_equivalent=collapse_equivalent, incremental=incremental,
+            prune=prune, tactical_limit=tactical_limit, witness_per_outcome=witness_per_outcome,
+        ),
+    )
+
+# number of compromising/burying ballots per strategic winner for voter `voter_index`, without building options
+def permutation_outcome_histogram_for_voter(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    *,
+    include_no_change: bool = False,
+    vectorized: bool | None = None,
+    collapse_equivalent: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+) -> Counter[str]:
+
+    situation.validate()
+    if not (0 <= voter_index < situation.n_voters):
+        raise IndexError("voter_index out of range")
+
+    histogram: Counter[str] = Counter()
+    for _, multiplicity, winner in permutation_winners(
+        scheme, situation, voter_index, tally_votes(scheme, situation),
+        include_no_change=include_no_change, vectorized=vectorized, collapse_equivalent=collapse_equivalent,
+        incremental=incremental, prune=prune,
+    ):
+        histogram[winner] += multiplicity
+    return histogram
+
+
+def permutation_outcome_histograms(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    *,
+    include_no_change: bool = False,
+    vectorized: bool | None = None,
+    collapse_equivalent: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+) -> dict[int, Counter[str]]:
+
+    situation.validate()
+    histograms: dict[int, Counter[str]] = {}
+    for voters in voter_groups(situation):
+        histogram = permutation_outcome_histogram_for_voter(
+            scheme, situation, voters[0],
+            include_no_change=include_no_change, vectorized=vectorized, collapse_equivalent=collapse_equivalent,
+            incremental=incremental, prune=prune,
         )
-        for i in range(situation.n_voters)
-    }
+        for voter_idx in voters:
+            histograms[voter_idx] = Counter(histogram)
+    return {i: histograms[i] for i in range(situation.n_voters)}
@@ -1,61 +1,178 @@
 from __future__ import annotations
+from collections import Counter
+from typing import Iterator
 from .happiness import HappinessMetric, happiness_for_outcome
-from .models import VotingScheme, VotingSituation
-from .strategic_options import StrategicOption
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .strategic_options import StrategicOption, expand_by_ballot_type, voter_groups
 from .strategies import StrategicBallot
-from .voting import tally_votes, tally_votes_strategic
+from .rank_matrix import RankMatrix, _require_numpy, np
+from .voting import VotingOutcome, bullet_points, scoring_vector, tally_votes
 
 #Enumerate bullet-voting options for a single voter.
 def enumerate_bullet_options_for_voter(
     scheme: VotingScheme,
-    situation: VotingSituation,
+    situation: VotingSituation | WeightedProfile,
     voter_index: int,
     *,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
 ) -> list[StrategicOption]:
 
     situation.validate()
-    if scheme == VotingScheme.PLURALITY:
-        return []
+    return list(_bullet_options(scheme, situation, voter_index, happiness_metric))
+
+# lazy, tactical-only version of enumerate_bullet_options_for_voter (options with H~_i > H_i, one tally each)
+def iter_bullet_options(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    *,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+) -> Iterator[StrategicOption]:
+
+    situation.validate()
+    for opt in _bullet_options(scheme, situation, voter_index, happiness_metric):
+        if opt.H_tilde_i > opt.H_i:
+            yield opt
+
+
+def _bullet_options(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    happiness_metric: HappinessMetric,
+) -> Iterator[StrategicOption]:
 
     baseline_outcome = tally_votes(scheme, situation)
     baseline_happy = happiness_for_outcome(situation, baseline_outcome.winner, metric=happiness_metric)
 
-    options: list[StrategicOption] = []
-    for chosen in situation.alternatives:
+    for ballot, winner in bullet_winners(scheme, situation, voter_index, baseline_outcome):
+        tactical = StrategicBallot(voter_index=voter_index, kind="bullet", preferences=ballot)
+        happy = happiness_for_outcome(situation, winner, metric=happiness_metric)
 
-        sincere = list(situation.voters_preferences[voter_index])
-        others = [a for a in sincere if a != chosen]
-        tactical = StrategicBallot(voter_index=voter_index, kind="bullet", preferences=tuple([chosen] + others))
-
-        out = tally_votes_strategic(scheme, situation, bullet_choice_by_voter={voter_index: chosen})
-        happy = happiness_for_outcome(situation, out.winner, metric=happiness_metric)
-
-        options.append(
-            StrategicOption(
-                voter_index=voter_index,
-                strategy_kind="bullet",
-                tactical_ballot=tactical,
-                strategic_outcome=out.winner,
-                baseline_outcome=baseline_outcome.winner,
-                strategic_happiness=happy,
-                baseline_happiness=baseline_happy,
-            )
+        yield StrategicOption(
+            voter_index=voter_index,
+            strategy_kind="bullet",
+            tactical_ballot=tactical,
+            strategic_outcome=winner,
+            baseline_outcome=baseline_outcome.winner,
+            strategic_happiness=happy,
+            baseline_happiness=baseline_happy,
         )
-    return options
+
+# (bullet ballot, winner) for every choice of voter `voter_index`, in the order of situation.alternatives.
+# A bullet vote for c only removes the voter's sincere points and gives c the top score, so with the two strongest
+# alternatives among the other voters' scores each choice is decided in O(1): c wins iff it beats the strongest rival.
+def bullet_winners(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baseline_outcome: VotingOutcome,
+) -> Iterator[tuple[tuple[str, ...], str]]:
+
+    if scheme == VotingScheme.PLURALITY:
+        return
+    m = situation.m_alternatives
+    yield from bullet_winners_for_vector(
+        scoring_vector(scheme, m), bullet_points(scheme, m), situation, voter_index, baseline_outcome.scores
+    )
+
+# bullet_winners for any scoring vector; `points` is what the bullet vote gives its choice
+def bullet_winners_for_vector(
+    vec: list[int],
+    points: int,
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baseline_scores: dict[str, int],
+) -> Iterator[tuple[tuple[str, ...], str]]:
+
+    sincere = situation.sincere_ballot(voter_index)
+    others = dict(baseline_scores)
+    for pos, alt in enumerate(sincere):
+        others[alt] -= vec[pos]
+
+    # strongest and second strongest alternative, lexicographically first on ties
+    first = second = None
+    for alt in sorted(others):
+        if first is None or others[alt] > others[first]:
+            first, second = alt, first
+        elif second is None or others[alt] > others[second]:
+            second = alt
+
+    for chosen in situation.alternatives:
+        ballot = (chosen,) + tuple(a for a in sincere if a != chosen)
+        rival = second if chosen == first else first
+        score = others[chosen] + points
+        if score > others[rival] or (score == others[rival] and chosen < rival):
+            yield ballot, chosen
+        else:
+            yield ballot, rival
+
+# winner id for every (distinct sincere ballot, bullet choice) pair as one array operation.
+# rows follow voter_groups(situation), columns and winner ids the lexicographically sorted alternatives
+def bullet_winner_matrix(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+) -> np.ndarray:
+
+    _require_numpy()
+    m = situation.m_alternatives
+    names = tuple(sorted(situation.alternatives))
+    baseline = tally_votes(scheme, situation).scores
+    reps = RankMatrix.from_rankings(
+        names,
+        [[names.index(a) for a in situation.sincere_ballot(voters[0])] for voters in voter_groups(situation)],
+    )
+
+    vec = np.asarray(scoring_vector(scheme, m), dtype=np.int64)
+    others = np.array([baseline[a] for a in names], dtype=np.int64) - vec[reps.positions]
+    rows = np.arange(others.shape[0])
+    first = others.argmax(axis=1)
+    masked = others.copy()
+    masked[rows, first] = np.iinfo(np.int64).min
+    second = masked.argmax(axis=1)
+
+    choices = np.arange(m)[None, :]
+    rival = np.where(choices == first[:, None], second[:, None], first[:, None])
+    score = others + bullet_points(scheme, m)
+    rival_score = np.take_along_axis(others, rival, axis=1)
+    wins = (score > rival_score) | ((score == rival_score) & (choices < rival))
+    return np.where(wins, choices, rival)
 
 
 def enumerate_bullet_options(
     scheme: VotingScheme,
-    situation: VotingSituation,
+    situation: VotingSituation | WeightedProfile,
     *,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
 ) -> dict[int, list[StrategicOption]]:
 
     situation.validate()
-    return {
-        i: enumerate_bullet_options_for_voter(
-            scheme, situation, i, happiness_metric=happiness_metric
-        )
-        for i in range(situation.n_voters)
-    }
+    # voters with the same sincere ballot get the same options, so each distinct ballot is evaluated once
+    return expand_by_ballot_type(
+        situation,
+        lambda i: enumerate_bullet_options_for_voter(scheme, situation, i, happiness_metric=happiness_metric),
+    )
+
+
+# number of bullet ballots per strategic winner for every voter, without building options
+def bullet_outcome_histograms(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+) -> dict[int, Counter[str]]:
+
+    situation.validate()
+    if scheme == VotingScheme.PLURALITY:
+        return {i: Counter() for i in range(situation.n_voters)}
+
+    baseline_outcome = tally_votes(scheme, situation)
+    matrix = bullet_winner_matrix(scheme, situation).tolist() if np is not None else None
+    names = sorted(situation.alternatives)
+    histograms: dict[int, Counter[str]] = {}
+    for g, voters in enumerate(voter_groups(situation)):
+        if matrix is not None:
+            histogram = Counter(names[w] for w in matrix[g])
+        else:
+            histogram = Counter(winner for _, winner in bullet_winners(scheme, situation, voters[0], baseline_outcome))
+        for voter_idx in voters:
+            histograms[voter_idx] = Counter(histogram)
+    return {i: histograms[i] for i in range(situation.n_voters)}
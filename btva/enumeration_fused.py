@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import itertools
+from collections import Counter
+from typing import Iterator, Sequence
+
+from .enumeration import ballot_equivalence_classes
+from .enumeration_bullet import bullet_winners_for_vector
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .rank_matrix import np
+from .strategic_options import voter_groups
+from .voting import VotingOutcome, _lexicographic_winner, scoring_vector
+
+# Enumeration for several scoring rules at once. Every ballot a voter could cast is generated once and scored
+# under the whole stack of scoring vectors: the full-order rules (borda and custom vectors) share one walk over
+# ballot prefixes, the schemes with outcome-equivalent classes share one stacked tally of their representatives,
+# and the bullet ballots are the same for every rule.
+
+# schemes whose ballots collapse into m, C(m,2) and m classes (see ballot_equivalence_classes)
+COLLAPSIBLE_SCHEMES = (VotingScheme.PLURALITY, VotingScheme.VOTE_FOR_TWO, VotingScheme.ANTI_PLURALITY)
+
+
+# scoring vector per rule: built-in schemes keyed by VotingScheme, custom vectors by their name.
+# custom vectors need length m and must be non-increasing, the pruning bounds rely on it
+def scoring_rules(
+    schemes: Sequence[VotingScheme],
+    m: int,
+    custom_vectors: dict[str, Sequence[int]] | None = None,
+) -> dict[VotingScheme | str, list[int]]:
+
+    rules: dict[VotingScheme | str, list[int]] = {scheme: scoring_vector(scheme, m) for scheme in schemes}
+    for name, vec in (custom_vectors or {}).items():
+        vec = [int(v) for v in vec]
+        if name in rules:
+            raise ValueError(f"Duplicate scoring rule: {name!r}")
+        if len(vec) != m:
+            raise ValueError(f"Scoring vector {name!r} must have length {m}, got {len(vec)}.")
+        if any(a < b for a, b in zip(vec, vec[1:])):
+            raise ValueError(f"Scoring vector {name!r} must be non-increasing: {vec}.")
+        rules[name] = vec
+    return rules
+
+
+def tally_votes_rules(
+    rules: dict[VotingScheme | str, list[int]],
+    situation: VotingSituation | WeightedProfile,
+) -> dict[VotingScheme | str, VotingOutcome]:
+
+    situation.validate()
+    counts = situation.position_counts
+    outcomes: dict[VotingScheme | str, VotingOutcome] = {}
+    for rule, vec in rules.items():
+        scores = counts.scores(vec)
+        outcomes[rule] = VotingOutcome(scheme=rule, scores=scores, winner=_lexicographic_winner(scores))
+    return outcomes
+
+# pruned_permutation_winners for a stack of scoring vectors: one depth-first walk over the ballot prefixes of
+# voter `voter_index`, where vector k stays active in a subtree until its targets are beaten for sure.
+# targets[k] is None to keep every ballot of vector k (the sincere ballot only with include_no_change).
+# yields (ballot, winners) with winners[k] the winner under vector k, or None if vector k does not want that ballot
+def fused_permutation_winners(
+    vectors: Sequence[Sequence[int]],
+    situation: VotingSituation | WeightedProfile,
+    voter_index: int,
+    baselines: Sequence[dict[str, int]],
+    targets: Sequence[set[str] | None],
+    *,
+    include_no_change: bool = False,
+) -> Iterator[tuple[tuple[str, ...], tuple[str | None, ...]]]:
+
+    m = situation.m_alternatives
+    names = tuple(sorted(situation.alternatives))
+    index = {a: k for k, a in enumerate(names)}
+    order = [index[a] for a in situation.alternatives]
+    sincere = [index[a] for a in situation.sincere_ballot(voter_index)]
+
+    scores: list[list[int]] = []
+    for vec, baseline in zip(vectors, baselines):
+        row = [baseline[a] for a in names]
+        for pos, a in enumerate(sincere):
+            row[a] -= vec[pos]
+        scores.append(row)
+    others = [list(row) for row in scores]
+    wanted = [None if t is None else {index[a] for a in t} for t in targets]
+    used = [False] * m
+    prefix: list[int] = []
+
+    # same test as pruned_permutation_winners, with the two strongest lower bounds found in one scan
+    def hopeless(k: int, depth: int) -> bool:
+        vec, sc, ot = vectors[k], scores[k], others[k]
+        low_points = vec[-1]
+        first = second = -1
+        first_low = second_low = 0
+        for a in range(m):
+            low = sc[a] if used[a] else ot[a] + low_points
+            if first < 0 or low > first_low:
+                second, second_low, first, first_low = first, first_low, a, low
+            elif second < 0 or low > second_low:
+                second, second_low = a, low
+        for c in wanted[k]:
+            high = sc[c] if used[c] else ot[c] + vec[depth]
+            x, x_low = (first, first_low) if first != c else (second, second_low)
+            if x_low < high or (x_low == high and x > c):
+                return False
+        return True
+
+    # leaves are collected instead of yielded through every level of the recursion
+    found: list[tuple[tuple[str, ...], tuple[str | None, ...]]] = []
+
+    def walk(depth: int, active: list[int]) -> None:
+        if depth == m:
+            if not include_no_change and prefix == sincere:
+                return
+            winners: list[str | None] = [None] * len(vectors)
+            hit = False
+            for k in active:
+                # max keeps the first maximum, i.e. the lowest id on ties
+                w = max(range(m), key=scores[k].__getitem__)
+                if wanted[k] is None or w in wanted[k]:
+                    winners[k] = names[w]
+                    hit = True
+            if hit:
+                found.append((tuple(names[a] for a in prefix), tuple(winners)))
+            return
+        active = [k for k in active if wanted[k] is None or (wanted[k] and not hopeless(k, depth))]
+        if not active:
+            return
+        steps = [(scores[k], vectors[k][depth]) for k in active]
+        for a in order:
+            if used[a]:
+                continue
+            used[a] = True
+            prefix.append(a)
+            for sc, points in steps:
+                sc[a] += points
+            walk(depth + 1, active)
+            for sc, points in steps:
+                sc[a] -= points
+            prefix.pop()
+            used[a] = False
+
+    walk(0, list(range(len(vectors))))
+    yield from found
+
+
+# scores without voter `sincere` under vector `vec`, indexed by alternative id
+def _scores_without(
+    vec: Sequence[int],
+    baseline_scores: dict[str, int],
+    names: tuple[str, ...],
+    index: dict[str, int],
+    sincere: tuple[str, ...],
+) -> list[int]:
+
+    row = [baseline_scores[a] for a in names]
+    for pos, a in enumerate(sincere):
+        row[index[a]] -= vec[pos]
+    return row
+
+
+# winner id of every ballot (rows of alternative ids) under every vector, one NumPy pass when available.
+# others[k] are the scores without the deviating voter under vector k; argmax keeps the lowest id on ties
+def _stacked_winners(
+    vectors: Sequence[Sequence[int]],
+    others: Sequence[Sequence[int]],
+    ballots: Sequence[Sequence[int]],
+) -> list[list[int]]:
+
+    m = len(others[0])
+    if np is not None:
+        ids = np.asarray(ballots, dtype=np.int64).reshape(len(ballots), m)
+        positions = np.empty_like(ids)
+        positions[np.arange(ids.shape[0])[:, None], ids] = np.arange(m)
+        stack = np.asarray(others, dtype=np.int64)[:, None, :] + np.asarray(vectors, dtype=np.int64)[:, positions]
+        return stack.argmax(axis=2).tolist()
+
+    winners: list[list[int]] = []
+    for vec, row in zip(vectors, others):
+        out = []
+        for ballot in ballots:
+            sc = list(row)
+            for pos, a in enumerate(ballot):
+                sc[a] += vec[pos]
+            out.append(max(range(m), key=lambda a: (sc[a], -a)))
+        winners.append(out)
+    return winners
+
+# per rule and strategy kind, the number of ballots per strategic winner for every voter
+# (the histograms run_btva_with_strategies(..., aggregate=True) builds one scheme at a time).
+# compromising/burying ballots are only enumerated for the rules in `enumerated`; built-in collapsible schemes
+# count outcome-equivalent classes, every other rule walks the full orders. prune keeps only the ballots electing
+# an alternative the voter ranks above that rule's baseline winner.
+def fused_outcome_histograms(
+    rules: dict[VotingScheme | str, list[int]],
+    situation: VotingSituation | WeightedProfile,
+    outcomes: dict[VotingScheme | str, VotingOutcome],
+    *,
+    enumerated: set[VotingScheme | str],
+    include_no_change: bool = False,
+    prune: bool = False,
+) -> dict[VotingScheme | str, dict[str, dict[int, Counter[str]]]]:
+
+    situation.validate()
+    names = tuple(sorted(situation.alternatives))
+    index = {a: k for k, a in enumerate(names)}
+    # plurality-shaped vectors have no separate bullet ballot: it is the ranking with the choice on top
+    bullet_rules = [rule for rule, vec in rules.items() if any(vec[1:])]
+    classed = [rule for rule in rules if rule in enumerated and rule in COLLAPSIBLE_SCHEMES]
+    walked = [rule for rule in rules if rule in enumerated and rule not in COLLAPSIBLE_SCHEMES]
+
+    histograms: dict[VotingScheme | str, dict[str, dict[int, Counter[str]]]] = {
+        rule: {"bullet": {}, **({"compromising_burying": {}} if rule in enumerated else {})} for rule in rules
+    }
+    for voters in voter_groups(situation):
+        i = voters[0]
+        sincere = situation.sincere_ballot(i)
+        per_rule: dict[VotingScheme | str, dict[str, Counter[str]]] = {rule: {"bullet": Counter()} for rule in rules}
+        targets: dict[VotingScheme | str, set[str] | None] = {
+            rule: set(sincere[:sincere.index(outcomes[rule].winner)]) if prune else None for rule in rules
+        }
+
+        for rule in bullet_rules:
+            vec = rules[rule]
+            per_rule[rule]["bullet"].update(
+                w for _, w in bullet_winners_for_vector(vec, vec[0], situation, i, outcomes[rule].scores)
+            )
+
+        # class representatives of all collapsible schemes, tallied under all their vectors at once
+        active = [rule for rule in classed if targets[rule] is None or targets[rule]]
+        for rule in classed:
+            per_rule[rule]["compromising_burying"] = Counter()
+        if active:
+            classes = {
+                rule: ballot_equivalence_classes(rule, situation.alternatives, sincere, include_no_change=include_no_change)
+                for rule in active
+            }
+            ballots = [[index[a] for a in ballot] for rule in active for ballot, _ in classes[rule]]
+            others = [_scores_without(rules[rule], outcomes[rule].scores, names, index, sincere) for rule in active]
+            stacked = _stacked_winners([rules[rule] for rule in active], others, ballots)
+            offset = 0
+            for k, rule in enumerate(active):
+                histogram = per_rule[rule]["compromising_burying"]
+                for b, (_, multiplicity) in enumerate(classes[rule]):
+                    winner = names[stacked[k][offset + b]]
+                    if targets[rule] is None or winner in targets[rule]:
+                        histogram[winner] += multiplicity
+                offset += len(classes[rule])
+
+        if walked and not prune and np is not None:
+            # without pruning every order is needed anyway: one (m! x m) stack tallied under all full-order vectors
+            perms = [
+                [index[a] for a in perm] for perm in itertools.permutations(situation.alternatives)
+                if include_no_change or perm != sincere
+            ]
+            others = [_scores_without(rules[rule], outcomes[rule].scores, names, index, sincere) for rule in walked]
+            stacked = _stacked_winners([rules[rule] for rule in walked], others, perms)
+            for rule, row in zip(walked, stacked):
+                per_rule[rule]["compromising_burying"] = Counter(names[w] for w in row)
+        elif walked:
+            counters = [Counter() for _ in walked]
+            for _, winners in fused_permutation_winners(
+                [rules[rule] for rule in walked], situation, i,
+                [outcomes[rule].scores for rule in walked], [targets[rule] for rule in walked],
+                include_no_change=include_no_change,
+            ):
+                for counter, winner in zip(counters, winners):
+                    if winner is not None:
+                        counter[winner] += 1
+            for rule, counter in zip(walked, counters):
+                per_rule[rule]["compromising_burying"] = counter
+
+        for rule, by_kind in per_rule.items():
+            for kind, histogram in by_kind.items():
+                for voter_idx in voters:
+                    histograms[rule][kind][voter_idx] = Counter(histogram)
+
+    return {
+        rule: {kind: {i: by_voter[i] for i in range(situation.n_voters)} for kind, by_voter in by_kind.items()}
+        for rule, by_kind in histograms.items()
+    }
@@ -6,10 +6,17 @@ from datetime import date
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Iterable
-from .analysis import compute_risk, run_btva_with_strategies
+from .analysis import (
+    RiskAccumulator,
+    permutation_enumeration_skipped,
+    run_btva_multi_scheme,
+    run_btva_with_strategies,
+    with_happiness_metric,
+)
 from .happiness import HappinessMetric
 from .models import VotingScheme
-from .parsing import load_input_file
+from .corpus import CorpusScenario, is_corpus_file, load_corpus, load_scenario
+from .sampling import SamplingBudget, estimate_risk, sample_compromise_burying
 
 @dataclass(frozen=True)
 class ExperimentRow:
@@ -17,6 +24,7 @@ class ExperimentRow:
     m: int
     n: int
     scheme: str
+    happiness_metric: str
     winner: str
     H_total: float
     H_mean: float
@@ -27,6 +35,10 @@ class ExperimentRow:
     tactical_options_total: int
     risk_avg_gain_all_options: float
     risk_fraction_change_winner: float
+    # sampled compromising/burying (m > max_m with a sampling budget): draws and confidence interval width of
+    # risk_avg_gain_all_options; 0 for exactly enumerated rows
+    n_samples: int
+    risk_avg_gain_ci_width: float
     time_seconds: float
     note: str
 
@@ -36,7 +48,11 @@ def _iter_scenario_files(
     *,
     include_globs: list[str] | None = None,
     exclude_prefixes: tuple[str, ...] = (),
-) -> list[Path]:
+) -> list[Path] | list[CorpusScenario]:
+    # a packed corpus file (python -m btva.corpus) stands in for the directory
+    if is_corpus_file(scenarios_dir):
+        return load_corpus(scenarios_dir).scenarios(include_globs=include_globs, exclude_prefixes=exclude_prefixes)
+
     if not include_globs:
         include_globs = ["*.abif"]
 
@@ -67,13 +83,21 @@ def _iter_scenario_files(
 
 def run_experiments(
     *,
-    scenario_files: Iterable[Path],
+    scenario_files: Iterable[Path | CorpusScenario],
     schemes: Iterable[VotingScheme],
     max_m: int = 8,
     happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    happiness_metrics: Iterable[HappinessMetric] | None = None,
+    aggregate: bool = True,
+    sampling: SamplingBudget | None = None,
+    cache_dir: Path | None = None,
 ) -> list[ExperimentRow]:
     rows: list[ExperimentRow] = []
 
+    # one row per (scenario, scheme, metric); the ballots are enumerated once under the first metric
+    metrics = [HappinessMetric(h) for h in happiness_metrics] if happiness_metrics else [happiness_metric]
+    happiness_metric = metrics[0]
+
     scenario_files = list(scenario_files)
     schemes = list(schemes)
     total_jobs = len(scenario_files) * len(schemes)
@@ -82,20 +106,33 @@ def run_experiments(
 
     for s_idx, scenario_file in enumerate(scenario_files, start=1):
         try:
-            parsed = load_input_file(scenario_file)
+            parsed = load_scenario(scenario_file, cache_dir=cache_dir)
         except Exception as e:
             print(f"warning: skipping {scenario_file.name}: {type(e).__name__}: {e}")
             continue
 
         situation = parsed.situation
 
-        if situation.m_alternatives > max_m:
+        if permutation_enumeration_skipped(VotingScheme.BORDA, situation.m_alternatives, max_m) and VotingScheme.BORDA in schemes:
             print(
                 f"note: {scenario_file.name}: m={situation.m_alternatives}>max_m={max_m} => "
-                "skipping compromising/burying permutation enumeration (bullet only)",
+                + (
+                    "sampling borda compromising/burying ballots instead of enumerating them"
+                    if sampling is not None else
+                    "skipping borda compromising/burying permutation enumeration (bullet only)"
+                ),
                 flush=True,
             )
 
+        # aggregate=True enumerates every voter's ballots once for all schemes; the shared time is split evenly
+        fused = None
+        if aggregate and schemes:
+            t0 = time.perf_counter()
+            fused = run_btva_multi_scheme(
+                situation, schemes, max_m=max_m, happiness_metric=happiness_metric, prune=True,
+            )
+            shared_seconds = (time.perf_counter() - t0) / len(schemes)
+
         for k_idx, scheme in enumerate(schemes, start=1):
             t0 = time.perf_counter()
 
@@ -106,70 +143,92 @@ def run_experiments(
                     flush=True,
                 )
 
-            result = run_btva_with_strategies(scheme, situation, max_m=max_m, happiness_metric=happiness_metric)
-
-            assert result.strategic_options is not None
-            tactical_options_by_voter = {
-                i: [opt for opt in opts if opt.H_tilde_i > opt.H_i]
-                for i, opts in result.strategic_options.items()
-            }
-
-            risk_gain = compute_risk(tactical_options_by_voter, method="avg_gain_all_options")
-            risk_change = compute_risk(tactical_options_by_voter, method="fraction_change_winner")
-
-            tactical_total = sum(len(opts) for opts in tactical_options_by_voter.values())
-
-            tactical_gains = [
-                (opt.H_tilde_i - opt.H_i)
-                for opts in tactical_options_by_voter.values()
-                for opt in opts
-            ]
-
-            tactical_delta_total = [
-                (opt.H_tilde - opt.H)
-                for opts in tactical_options_by_voter.values()
-                for opt in opts
-            ]
-
-            avg_tactical_gain = (sum(tactical_gains) / len(tactical_gains) if tactical_gains else 0.0)
-
-            avg_delta_H_total = (
-                sum(tactical_delta_total) / len(tactical_delta_total)
-                if tactical_delta_total
-                else 0.0
-            )
-
-            H_mean_tactical = (float(result.happiness.total) / max(1, situation.n_voters)) + float(avg_tactical_gain)
-            H_total_tactical = H_mean_tactical * max(1, situation.n_voters)
-
-            t1 = time.perf_counter()
-
-            note_parts: list[str] = []
-            if situation.m_alternatives > max_m:
-                note_parts.append(
-                    f"m={situation.m_alternatives}>max_m={max_m}: compromising_burying permutation enumeration skipped (bullet only)"
+            # aggregate=True only keeps per-voter winner histograms; False builds a StrategicOptionTable (needs numpy)
+            if fused is not None:
+                result = fused[scheme]
+                t0 -= shared_seconds
+            else:
+                result = run_btva_with_strategies(
+                    scheme, situation,
+                    max_m=max_m, happiness_metric=happiness_metric, collapse_equivalent=True, prune=True,
+                    table=True,
                 )
 
-            rows.append(
-                ExperimentRow(
-                    scenario=scenario_file.name,
-                    m=situation.m_alternatives,
-                    n=situation.n_voters,
-                    scheme=scheme.value,
-                    winner=result.outcome.winner,
-                    H_total=float(result.happiness.total),
-                    H_mean=float(result.happiness.total) / max(1, situation.n_voters),
-                    H_total_tactical=float(H_total_tactical),
-                    H_mean_tactical=float(H_mean_tactical),
-                    avg_individual_gain_over_tactics=float(avg_tactical_gain),
-                    avg_delta_H_total_over_tactics=float(avg_delta_H_total),
-                    tactical_options_total=int(tactical_total),
-                    risk_avg_gain_all_options=float(risk_gain["overall"]),
-                    risk_fraction_change_winner=float(risk_change["overall"]),
-                    time_seconds=float(t1 - t0),
-                    note="; ".join(note_parts),
+            # sampling replaces the skipped compromising/burying enumeration by an estimate; the drawn winners
+            # are shared by all metrics like the enumerated ones
+            skipped = permutation_enumeration_skipped(scheme, situation.m_alternatives, max_m, collapse_equivalent=True)
+            sample = None
+            if skipped and sampling is not None:
+                sample = sample_compromise_burying(scheme, situation, budget=sampling, baseline_outcome=result.outcome)
+
+            # the enumeration records winners only; every further metric re-reads happiness from them
+            for h_idx, metric in enumerate(metrics):
+                if h_idx:
+                    t0 = time.perf_counter()
+                    result = with_happiness_metric(situation, base_result, metric)
+                else:
+                    base_result = result
+
+                # one pass over the tactical ballots gives both risk methods, the count and the gain / delta-H averages
+                accumulator = RiskAccumulator(situation.n_voters, tactical_only=True)
+                if result.aggregates is not None:
+                    accumulator.add_aggregates(result.aggregates)
+                else:
+                    assert result.option_table is not None
+                    accumulator.add_table(result.option_table)
+                risk_gain = accumulator.risk("avg_gain_all_options")
+                risk_change = accumulator.risk("fraction_change_winner")
+                tactical_total = accumulator.n_options
+                avg_tactical_gain = accumulator.avg_gain
+                avg_delta_H_total = accumulator.avg_delta_H
+                n_samples, ci_width = 0, 0.0
+                if sample is not None:
+                    sampled = estimate_risk(situation, sample, happiness_metric=metric, confidence=sampling.confidence)
+                    risk_gain = {"overall": sampled.avg_gain.value}
+                    risk_change = {"overall": sampled.fraction_change_winner}
+                    tactical_total = round(sampled.tactical_options_total.value)
+                    avg_tactical_gain = sampled.avg_gain.value
+                    avg_delta_H_total = sampled.avg_delta_H.value
+                    n_samples, ci_width = sampled.n_samples, 2 * sampled.avg_gain.half_width
+
+                H_mean_tactical = (float(result.happiness.total) / max(1, situation.n_voters)) + float(avg_tactical_gain)
+                H_total_tactical = H_mean_tactical * max(1, situation.n_voters)
+
+                t1 = time.perf_counter()
+
+                note_parts: list[str] = []
+                if sample is not None:
+                    note_parts.append(
+                        f"m={situation.m_alternatives}>max_m={max_m}: compromising_burying estimated from {n_samples} sampled ballots"
+                    )
+                elif skipped:
+                    note_parts.append(
+                        f"m={situation.m_alternatives}>max_m={max_m}: compromising_burying permutation enumeration skipped (bullet only)"
+                    )
+
+                rows.append(
+                    ExperimentRow(
+                        scenario=scenario_file.name,
+                        m=situation.m_alternatives,
+                        n=situation.n_voters,
+                        scheme=scheme.value,
+                        happiness_metric=metric.value,
+                        winner=result.outcome.winner,
+                        H_total=float(result.happiness.total),
+                        H_mean=float(result.happiness.total) / max(1, situation.n_voters),
+                        H_total_tactical=float(H_total_tactical),
+                        H_mean_tactical=float(H_mean_tactical),
+                        avg_individual_gain_over_tactics=float(avg_tactical_gain),
+                        avg_delta_H_total_over_tactics=float(avg_delta_H_total),
+                        tactical_options_total=int(tactical_total),
+                        risk_avg_gain_all_options=float(risk_gain["overall"]),
+                        risk_fraction_change_winner=float(risk_change["overall"]),
+                        n_samples=int(n_samples),
+                        risk_avg_gain_ci_width=float(ci_width),
+                        time_seconds=float(t1 - t0),
+                        note="; ".join(note_parts),
+                    )
                 )
-            )
             jobs_done += 1
     return rows
 
@@ -194,7 +253,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--scenarios-dir",
         type=str,
         default="voting_scenarios",
-        help="Directory containing .abif scenario files (default: voting_scenarios).",
+        help="Directory of .abif scenario files, or a corpus file built by btva.corpus (default: voting_scenarios).",
     )
     p.add_argument(
         "--include",
@@ -225,13 +284,46 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--happiness-metric",
         type=str,
+        action="append",
         choices=[m.value for m in HappinessMetric],
-        default=HappinessMetric.BORDA.value,
+        default=None,
         help=(
-            "How to compute voter happiness when evaluating outcomes. "
-            "Choices: borda, rank_normalized (default: borda)."
+            "How to compute voter happiness when evaluating outcomes (repeatable: one row set per metric "
+            "from a single enumeration). Choices: borda, rank_normalized (default: borda)."
         ),
     )
+    p.add_argument(
+        "--samples",
+        type=int,
+        default=0,
+        help=(
+            "For m > max-m, estimate compromising_burying risk from this many random ballots per distinct "
+            "sincere ballot instead of skipping it (default: 0, off)."
+        ),
+    )
+    p.add_argument(
+        "--sample-time",
+        type=float,
+        default=None,
+        help="Wall-clock budget in seconds for the sampling of one scenario and scheme (enables sampling).",
+    )
+    p.add_argument(
+        "--stratified",
+        action="store_true",
+        help="Stratify the sampled ballots by the position of the voter's favourite alternative.",
+    )
+    p.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the sampled ballots (default: 0).",
+    )
+    p.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for cached parsed scenarios, keyed by file content (default: no cache).",
+    )
     p.add_argument(
         "--out",
         type=str,
@@ -259,11 +351,19 @@ def main(argv: list[str] | None = None) -> int:
 
     schemes = list(VotingScheme)
 
+    sampling = None
+    if args.samples or args.sample_time is not None:
+        sampling = SamplingBudget(
+            samples=args.samples or None, time_budget=args.sample_time, stratified=args.stratified, seed=args.seed,
+        )
+
     rows = run_experiments(
         scenario_files=scenario_files,
         schemes=schemes,
         max_m=args.max_m,
-        happiness_metric=HappinessMetric(args.happiness_metric),
+        happiness_metrics=[HappinessMetric(h) for h in args.happiness_metric or [HappinessMetric.BORDA.value]],
+        sampling=sampling,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
     )
 
     out_path = Path(
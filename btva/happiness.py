@@ -1,7 +1,8 @@
 from __future__ import annotations
 from enum import Enum
 from dataclasses import dataclass
-from .models import VotingSituation
+from .models import VotingSituation, WeightedProfile
+from .rank_matrix import RankMatrix
 
 class HappinessMetric(str, Enum):
     BORDA = "borda"
@@ -19,7 +20,7 @@ class HappinessResult:
 
 # compute per-voter happiness using Borda utility of the outcome
 def borda_happiness_for_outcome(
-    situation: VotingSituation, outcome: str
+    situation: VotingSituation | WeightedProfile | RankMatrix, outcome: str
 ) -> HappinessResult:
 
     situation.validate()
@@ -28,6 +29,13 @@ def borda_happiness_for_outcome(
         raise ValueError(f"Outcome '{outcome}' is not a valid alternative.")
 
     m = situation.m_alternatives
+    if isinstance(situation, RankMatrix):
+        ranks = situation.ranks_of(outcome).astype(float)
+        return HappinessResult(outcome=outcome, per_voter=tuple(((m - 1) - ranks).tolist()))
+    if isinstance(situation, WeightedProfile):
+        per_type = [float((m - 1) - pref.index(outcome)) for pref in situation.ballots]
+        return HappinessResult(outcome=outcome, per_voter=tuple(per_type[t] for t in situation.type_of_voter))
+
     per_voter: list[float] = []
     for pref in situation.voters_preferences:
         rank = pref.index(outcome)
@@ -37,7 +45,7 @@ def borda_happiness_for_outcome(
 
 # compute per-voter happiness using rank-based normalized utility
 def rank_normalized_happiness_for_outcome(
-    situation: VotingSituation, outcome: str
+    situation: VotingSituation | WeightedProfile | RankMatrix, outcome: str
 ) -> HappinessResult:
 
     situation.validate()
@@ -47,6 +55,13 @@ def rank_normalized_happiness_for_outcome(
 
     m = situation.m_alternatives
     denom = max(1, m - 1)
+    if isinstance(situation, RankMatrix):
+        ranks = situation.ranks_of(outcome).astype(float)
+        return HappinessResult(outcome=outcome, per_voter=tuple((1.0 - ranks / denom).tolist()))
+    if isinstance(situation, WeightedProfile):
+        per_type = [1.0 - (pref.index(outcome) / denom) for pref in situation.ballots]
+        return HappinessResult(outcome=outcome, per_voter=tuple(per_type[t] for t in situation.type_of_voter))
+
     per_voter: list[float] = []
     for pref in situation.voters_preferences:
         rank = pref.index(outcome)
@@ -54,14 +69,61 @@ def rank_normalized_happiness_for_outcome(
 
     return HappinessResult(outcome=outcome, per_voter=tuple(per_voter))
 
-def happiness_for_outcome(
-    situation: VotingSituation,
+# factor from borda happiness to `metric` happiness for m alternatives; rank_normalized is borda / (m-1)
+def happiness_scale(metric: HappinessMetric, m: int) -> float:
+    if metric == HappinessMetric.BORDA:
+        return 1.0
+    if metric == HappinessMetric.RANK_NORMALIZED:
+        return 1.0 / max(1, m - 1)
+    raise ValueError(f"Unknown happiness metric: {metric}")
+
+def _compute_happiness(
+    situation: VotingSituation | WeightedProfile | RankMatrix,
     outcome: str,
-    *,
-    metric: HappinessMetric = HappinessMetric.BORDA,
+    metric: HappinessMetric,
 ) -> HappinessResult:
     if metric == HappinessMetric.BORDA:
         return borda_happiness_for_outcome(situation, outcome)
     if metric == HappinessMetric.RANK_NORMALIZED:
         return rank_normalized_happiness_for_outcome(situation, outcome)
     raise ValueError(f"Unknown happiness metric: {metric}")
+
+# n x m happiness table of one situation under one metric, filled lazily one winner (column) at a time.
+# there are only m possible winners, so every analysis shares one HappinessResult object per winner.
+class HappinessTable:
+    def __init__(self, situation: VotingSituation | WeightedProfile | RankMatrix, metric: HappinessMetric) -> None:
+        self.situation = situation
+        self.metric = metric
+        self._by_outcome: dict[str, HappinessResult] = {}
+
+    def __getitem__(self, outcome: str) -> HappinessResult:
+        result = self._by_outcome.get(outcome)
+        if result is None:
+            result = self._by_outcome[outcome] = _compute_happiness(self.situation, outcome, self.metric)
+        return result
+
+    # full table: rows are voters, columns follow sorted(alternatives)
+    def per_voter_matrix(self) -> tuple[tuple[float, ...], ...]:
+        columns = [self[a].per_voter for a in sorted(self.situation.alternatives)]
+        return tuple(zip(*columns))
+
+# the situation's shared table for `metric` (created on first use)
+def happiness_table(
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    metric: HappinessMetric = HappinessMetric.BORDA,
+) -> HappinessTable:
+    metric = HappinessMetric(metric)
+    tables = situation.happiness_tables
+    table = tables.get(metric)
+    if table is None:
+        table = tables[metric] = HappinessTable(situation, metric)
+    return table
+
+def happiness_for_outcome(
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    outcome: str,
+    *,
+    metric: HappinessMetric = HappinessMetric.BORDA,
+) -> HappinessResult:
+    situation.validate()
+    return happiness_table(situation, metric)[outcome]
@@ -1,9 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from typing import Sequence
 
+# profiles are immutable, so a successful validate() is recorded and later calls return immediately.
+# strict mode (debugging) re-runs the full checks on every call; BTVA_STRICT_VALIDATION=1 enables it at startup.
+_STRICT_VALIDATION = os.environ.get("BTVA_STRICT_VALIDATION", "").strip() not in ("", "0")
+
+
+def set_strict_validation(enabled: bool) -> None:
+    global _STRICT_VALIDATION
+    _STRICT_VALIDATION = bool(enabled)
+
+
+def strict_validation_enabled() -> bool:
+    return _STRICT_VALIDATION
+
+
+def _already_validated(profile: object) -> bool:
+    return getattr(profile, "_validated", False) and not _STRICT_VALIDATION
+
+
+def _mark_validated(profile: object) -> None:
+    object.__setattr__(profile, "_validated", True)
+
 #voting schemes
 class VotingScheme(str, Enum):
     PLURALITY = "plurality"  # {1,0,...,0}
@@ -18,9 +41,70 @@ class StrategicVotingType(str, Enum):
     BULLET = "bullet"
 
 
+# shared profile checks; `rankings` are the rows to check (every voter, or every distinct ballot)
+def _validate_rankings(rankings: Sequence[tuple[str, ...]], *, n_voters: int, label: str) -> None:
+    m_alternatives = len(rankings[0]) if rankings else 0
+    if n_voters <= 2:
+        raise ValueError("VotingSituation must have n > 2 voters.")
+    if m_alternatives <= 2:
+        raise ValueError("VotingSituation must have m > 2 alternatives.")
+
+    expected_alts = set(rankings[0])
+    if len(expected_alts) != m_alternatives:
+        raise ValueError("Alternatives must be unique within a preference list.")
+
+    for idx, pref in enumerate(rankings):
+        if len(pref) != m_alternatives:
+            raise ValueError(f"{label} {idx} has {len(pref)} ranked alternatives, expected {m_alternatives}.")
+        if set(pref) != expected_alts:
+            missing = expected_alts - set(pref)
+            extra = set(pref) - expected_alts
+            raise ValueError(f"{label} {idx} must rank exactly the same alternatives. Missing={missing}, extra={extra}.")
+
+
+# sufficient statistic for every positional rule: counts[a][pos] is the number of voters ranking
+# alternatives[a] at position pos (alternatives in lexicographic order). A tally is then the m x m
+# product counts . vec, independent of the number of voters.
+@dataclass(frozen=True)
+class PositionCounts:
+    alternatives: tuple[str, ...]
+    counts: tuple[tuple[int, ...], ...]
+
+    @classmethod
+    def from_rankings(
+        cls,
+        rankings: Sequence[tuple[str, ...]],
+        weights: Sequence[int] | None = None,
+    ) -> PositionCounts:
+        alternatives = tuple(sorted(rankings[0])) if rankings else tuple()
+        index = {a: i for i, a in enumerate(alternatives)}
+        counts = [[0] * len(alternatives) for _ in alternatives]
+        if weights is None:
+            weights = [1] * len(rankings)
+        for pref, weight in zip(rankings, weights):
+            for position, alt in enumerate(pref):
+                counts[index[alt]][position] += weight
+        return cls(alternatives=alternatives, counts=tuple(tuple(row) for row in counts))
+
+    # total score per alternative under a positional scoring vector
+    def scores(self, vec: Sequence[int]) -> dict[str, int]:
+        return {
+            alt: sum(c * v for c, v in zip(row, vec))
+            for alt, row in zip(self.alternatives, self.counts)
+        }
+
+
 @dataclass(frozen=True)
 class VotingSituation:
     voters_preferences: tuple[tuple[str, ...], ...]
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+
+    # construct and validate in one go; the result is recorded so hot paths skip re-validation
+    @classmethod
+    def validated(cls, voters_preferences: tuple[tuple[str, ...], ...]) -> VotingSituation:
+        situation = cls(voters_preferences)
+        situation.validate()
+        return situation
 
     @property
     def n_voters(self) -> int:
@@ -34,20 +118,122 @@ class VotingSituation:
     def alternatives(self) -> tuple[str, ...]:
         return self.voters_preferences[0] if self.voters_preferences else tuple()
 
+    @cached_property
+    def position_counts(self) -> PositionCounts:
+        return PositionCounts.from_rankings(self.voters_preferences)
+
+    def sincere_ballot(self, voter_index: int) -> tuple[str, ...]:
+        return self.voters_preferences[voter_index]
+
+    # voter indices grouped by identical sincere ballot, groups in order of first appearance
+    @cached_property
+    def voters_by_ballot(self) -> tuple[tuple[int, ...], ...]:
+        members: dict[tuple[str, ...], list[int]] = {}
+        for voter_idx, pref in enumerate(self.voters_preferences):
+            members.setdefault(pref, []).append(voter_idx)
+        return tuple(tuple(v) for v in members.values())
+
+    # per-metric happiness tables, filled lazily by btva.happiness.happiness_table
+    @cached_property
+    def happiness_tables(self) -> dict:
+        return {}
+
     def validate(self) -> None:
-        if self.n_voters <= 2:
-            raise ValueError("VotingSituation must have n > 2 voters.")
-        if self.m_alternatives <= 2:
-            raise ValueError("VotingSituation must have m > 2 alternatives.")
-
-        expected_alts = set(self.voters_preferences[0])
-        if len(expected_alts) != self.m_alternatives:
-            raise ValueError("Alternatives must be unique within a preference list.")
-
-        for idx, pref in enumerate(self.voters_preferences):
-            if len(pref) != self.m_alternatives:
-                raise ValueError(f"Voter {idx} has {len(pref)} ranked alternatives, expected {self.m_alternatives}.")
-            if set(pref) != expected_alts:
-                missing = expected_alts - set(pref)
-                extra = set(pref) - expected_alts
-                raise ValueError(f"Voter {idx} must rank exactly the same alternatives. Missing={missing}, extra={extra}.")
+        if _already_validated(self):
+            return
+        _validate_rankings(self.voters_preferences, n_voters=self.n_voters, label="Voter")
+        _mark_validated(self)
+
+# anonymous profile: each distinct sincere ballot is kept once together with its multiplicity.
+# voter_types[i] is the ballot index of voter i; None means the voters are grouped in ballot order.
+@dataclass(frozen=True)
+class WeightedProfile:
+    ballots: tuple[tuple[str, ...], ...]
+    counts: tuple[int, ...]
+    voter_types: tuple[int, ...] | None = None
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_situation(cls, situation: VotingSituation) -> WeightedProfile:
+        index: dict[tuple[str, ...], int] = {}
+        counts: list[int] = []
+        voter_types: list[int] = []
+        for pref in situation.voters_preferences:
+            t = index.get(pref)
+            if t is None:
+                t = index[pref] = len(counts)
+                counts.append(0)
+            counts[t] += 1
+            voter_types.append(t)
+        profile = cls(ballots=tuple(index), counts=tuple(counts), voter_types=tuple(voter_types))
+        if _already_validated(situation):
+            _mark_validated(profile)
+        return profile
+
+    @property
+    def n_voters(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def n_ballot_types(self) -> int:
+        return len(self.ballots)
+
+    @property
+    def m_alternatives(self) -> int:
+        return len(self.ballots[0]) if self.ballots else 0
+
+    @property
+    def alternatives(self) -> tuple[str, ...]:
+        if not self.ballots:
+            return tuple()
+        return self.ballots[self.type_of_voter[0]]
+
+    @cached_property
+    def type_of_voter(self) -> tuple[int, ...]:
+        if self.voter_types is not None:
+            return self.voter_types
+        return tuple(t for t, count in enumerate(self.counts) for _ in range(count))
+
+    @cached_property
+    def voters_by_type(self) -> tuple[tuple[int, ...], ...]:
+        members: list[list[int]] = [[] for _ in self.ballots]
+        for voter_idx, t in enumerate(self.type_of_voter):
+            members[t].append(voter_idx)
+        return tuple(tuple(v) for v in members)
+
+    @cached_property
+    def position_counts(self) -> PositionCounts:
+        return PositionCounts.from_rankings(self.ballots, self.counts)
+
+    def sincere_ballot(self, voter_index: int) -> tuple[str, ...]:
+        return self.ballots[self.type_of_voter[voter_index]]
+
+    # per-metric happiness tables, filled lazily by btva.happiness.happiness_table
+    @cached_property
+    def happiness_tables(self) -> dict:
+        return {}
+
+    # expanded per-voter view; entries share the ballot tuples, so this only costs n references
+    @cached_property
+    def voters_preferences(self) -> tuple[tuple[str, ...], ...]:
+        ballots = self.ballots
+        return tuple(ballots[t] for t in self.type_of_voter)
+
+    def to_situation(self) -> VotingSituation:
+        return VotingSituation(self.voters_preferences)
+
+    def validate(self) -> None:
+        if _already_validated(self):
+            return
+        if len(self.counts) != len(self.ballots):
+            raise ValueError("WeightedProfile needs exactly one count per ballot.")
+        if any(c <= 0 for c in self.counts):
+            raise ValueError("Ballot counts must be positive.")
+        if self.voter_types is not None:
+            if len(self.voter_types) != self.n_voters:
+                raise ValueError(f"voter_types has {len(self.voter_types)} entries, expected {self.n_voters}.")
+            if tuple(len(v) for v in self.voters_by_type) != self.counts:
+                raise ValueError("voter_types does not match the ballot counts.")
+
+        _validate_rankings(self.ballots, n_voters=self.n_voters, label="Ballot")
+        _mark_validated(self)
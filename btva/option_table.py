@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, Sequence
+
+from .happiness import HappinessMetric, happiness_for_outcome
+from .models import VotingSituation, WeightedProfile
+from .rank_matrix import _require_numpy, np
+from .strategic_options import StrategicOption, voter_groups
+from .strategies import StrategicBallot
+
+# strategy kinds are stored as small integer codes
+STRATEGY_KINDS: tuple[str, ...] = ("bullet", "compromising_burying")
+
+
+# rank of every ballot row among the m! permutations of 0..m-1 (Lehmer code, lexicographic order).
+# 20! still fits in int64; beyond that the codes are Python ints in an object array
+def lehmer_encode(ballots: np.ndarray) -> np.ndarray:
+    _require_numpy()
+    ballots = np.asarray(ballots, dtype=np.int64)
+    m = ballots.shape[1]
+    dtype = np.int64 if m <= 20 else object
+    codes = np.zeros(ballots.shape[0], dtype=dtype)
+    for i in range(m - 1):
+        smaller_after = (ballots[:, i + 1:] < ballots[:, i:i + 1]).sum(axis=1).astype(dtype)
+        codes += smaller_after * math.factorial(m - 1 - i)
+    return codes
+
+
+def lehmer_decode(code: int, m: int) -> list[int]:
+    remaining = list(range(m))
+    perm: list[int] = []
+    for i in range(m - 1, -1, -1):
+        digit, code = divmod(code, math.factorial(i))
+        perm.append(remaining.pop(digit))
+    return perm
+
+# happiness of every voter for every possible winner and the totals, columns in `alternatives` order
+def _happiness_columns(
+    situation: VotingSituation | WeightedProfile,
+    alternatives: tuple[str, ...],
+    metric: HappinessMetric,
+) -> tuple[np.ndarray, np.ndarray]:
+
+    happy = [happiness_for_outcome(situation, a, metric=metric) for a in alternatives]
+    per_voter = np.array([h.per_voter for h in happy], dtype=np.float64).T.reshape(situation.n_voters, len(alternatives))
+    totals = np.array([h.total for h in happy], dtype=np.float64)
+    return per_voter, totals
+
+# Columnar set of strategic options: one row per option, one NumPy array per field.
+# ballots are Lehmer codes over the lexicographically sorted alternatives, winners are indices into `alternatives`.
+# Rows can be filtered and grouped without touching Python objects; row(k) rebuilds the StrategicOption on demand.
+@dataclass(frozen=True, eq=False)
+class StrategicOptionTable:
+    situation: VotingSituation | WeightedProfile
+    happiness_metric: HappinessMetric
+    alternatives: tuple[str, ...]
+    baseline_outcome: str
+    voter: np.ndarray
+    kind: np.ndarray
+    ballot: np.ndarray
+    winner: np.ndarray
+    multiplicity: np.ndarray
+    H_i: np.ndarray
+    H_tilde_i: np.ndarray
+    H: np.ndarray
+    H_tilde: np.ndarray
+
+    # rows are (voter, kind, ballot, multiplicity, winner); happiness columns are looked up per winner
+    @classmethod
+    def from_rows(
+        cls,
+        situation: VotingSituation | WeightedProfile,
+        baseline_outcome: str,
+        rows: Iterable[tuple[int, str, Sequence[str], int, str]],
+        *,
+        happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    ) -> StrategicOptionTable:
+
+        _require_numpy()
+        alternatives = tuple(sorted(situation.alternatives))
+        index = {a: k for k, a in enumerate(alternatives)}
+        kind_code = {k: c for c, k in enumerate(STRATEGY_KINDS)}
+        m = len(alternatives)
+
+        voters: list[int] = []
+        kinds: list[int] = []
+        ballots: list[list[int]] = []
+        mults: list[int] = []
+        winners: list[int] = []
+        for voter, kind, ballot, multiplicity, winner in rows:
+            voters.append(voter)
+            kinds.append(kind_code[kind])
+            ballots.append([index[a] for a in ballot])
+            mults.append(multiplicity)
+            winners.append(index[winner])
+
+        per_voter, totals = _happiness_columns(situation, alternatives, happiness_metric)
+        voter = np.array(voters, dtype=np.int64)
+        winner = np.array(winners, dtype=np.int64)
+        base = index[baseline_outcome]
+        return cls(
+            situation=situation,
+            happiness_metric=happiness_metric,
+            alternatives=alternatives,
+            baseline_outcome=baseline_outcome,
+            voter=voter,
+            kind=np.array(kinds, dtype=np.int8),
+            ballot=lehmer_encode(np.array(ballots, dtype=np.int64).reshape(len(ballots), m)),
+            winner=winner,
+            # collapsed classes stand for up to (m-1)! ballots, which overflows int64 for large m
+            multiplicity=np.array(mults, dtype=np.int64 if max(mults, default=0) < 2**63 else object),
+            H_i=per_voter[voter, base],
+            H_tilde_i=per_voter[voter, winner],
+            H=np.full(len(voters), totals[base]),
+            H_tilde=totals[winner],
+        )
+
+    # per-voter (ballot, multiplicity, winner) streams by kind; voters with the same sincere ballot are evaluated once
+    @classmethod
+    def from_sources(
+        cls,
+        situation: VotingSituation | WeightedProfile,
+        baseline_outcome: str,
+        sources: dict[str, Callable[[int], Iterable[tuple[Sequence[str], int, str]]]],
+        *,
+        happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    ) -> StrategicOptionTable:
+
+        by_voter: dict[int, list[tuple[str, Sequence[str], int, str]]] = {}
+        for voters in voter_groups(situation):
+            rep_rows = [
+                (kind, ballot, multiplicity, winner)
+                for kind, source in sources.items()
+                for ballot, multiplicity, winner in source(voters[0])
+            ]
+            for voter_idx in voters:
+                by_voter[voter_idx] = rep_rows
+        rows = (
+            (i, kind, ballot, multiplicity, winner)
+            for i in range(situation.n_voters)
+            for kind, ballot, multiplicity, winner in by_voter[i]
+        )
+        return cls.from_rows(situation, baseline_outcome, rows, happiness_metric=happiness_metric)
+
+    # same rows with the happiness columns of another metric, looked up from the stored winner indices
+    def with_metric(self, metric: HappinessMetric) -> StrategicOptionTable:
+        per_voter, totals = _happiness_columns(self.situation, self.alternatives, metric)
+        base = self.alternatives.index(self.baseline_outcome)
+        return replace(
+            self,
+            happiness_metric=metric,
+            H_i=per_voter[self.voter, base],
+            H_tilde_i=per_voter[self.voter, self.winner],
+            H=np.full(len(self), totals[base]),
+            H_tilde=totals[self.winner],
+        )
+
+    def __len__(self) -> int:
+        return int(self.voter.shape[0])
+
+    @property
+    def n_voters(self) -> int:
+        return self.situation.n_voters
+
+    def filter(self, mask: np.ndarray) -> StrategicOptionTable:
+        return StrategicOptionTable(
+            situation=self.situation,
+            happiness_metric=self.happiness_metric,
+            alternatives=self.alternatives,
+            baseline_outcome=self.baseline_outcome,
+            voter=self.voter[mask],
+            kind=self.kind[mask],
+            ballot=self.ballot[mask],
+            winner=self.winner[mask],
+            multiplicity=self.multiplicity[mask],
+            H_i=self.H_i[mask],
+            H_tilde_i=self.H_tilde_i[mask],
+            H=self.H[mask],
+            H_tilde=self.H_tilde[mask],
+        )
+
+    # options with H~_i > H_i
+    def tactical(self) -> StrategicOptionTable:
+        return self.filter(self.H_tilde_i > self.H_i)
+
+    # sub-tables keyed by the distinct values of one integer column ("voter", "kind" or "winner")
+    def group_by(self, column: str) -> dict[int, StrategicOptionTable]:
+        values = getattr(self, column)
+        return {int(v): self.filter(values == v) for v in np.unique(values)}
+
+    def ballot_of(self, k: int) -> tuple[str, ...]:
+        alts = self.alternatives
+        return tuple(alts[a] for a in lehmer_decode(int(self.ballot[k]), len(alts)))
+
+    def row(self, k: int) -> StrategicOption:
+        voter = int(self.voter[k])
+        kind = STRATEGY_KINDS[int(self.kind[k])]
+        winner = self.alternatives[int(self.winner[k])]
+        return StrategicOption(
+            voter_index=voter,
+            strategy_kind=kind,
+            tactical_ballot=StrategicBallot(voter_index=voter, kind=kind, preferences=self.ballot_of(k)),
+            strategic_outcome=winner,
+            baseline_outcome=self.baseline_outcome,
+            strategic_happiness=happiness_for_outcome(self.situation, winner, metric=self.happiness_metric),
+            baseline_happiness=happiness_for_outcome(self.situation, self.baseline_outcome, metric=self.happiness_metric),
+            multiplicity=int(self.multiplicity[k]),
+        )
+
+    def to_options(self) -> dict[int, list[StrategicOption]]:
+        options: dict[int, list[StrategicOption]] = {i: [] for i in range(self.n_voters)}
+        for k in range(len(self)):
+            options[int(self.voter[k])].append(self.row(k))
+        return options
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from .happiness import HappinessMetric, happiness_for_outcome
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .rank_matrix import RankMatrix
+from .strategic_options import StrategicOption
+from .strategies import StrategicBallot
+from .voting import scoring_vector, tally_votes
+
+# Greedy single-voter manipulation oracle for positional scoring rules.
+# For a non-increasing scoring vector s the voter maximises target c's score by ranking it first,
+# which also leaves the smallest points s[1:] for the rivals. Rival r may receive at most
+#   cap_r = others[c] + s[0] - others[r] - (1 if r beats c on ties else 0)
+# points, and s[1:] fits under the caps iff pairing both in descending order never exceeds a cap.
+# That is O(m log m) per target and O(m^2 log m) per voter, instead of trying m! ballots.
+
+
+# scores of every alternative without the contribution of voter `voter_index`
+def _scores_without_voter(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    voter_index: int,
+    baseline_scores: dict[str, int],
+) -> dict[str, int]:
+
+    vec = scoring_vector(scheme, situation.m_alternatives)
+    others = dict(baseline_scores)
+    for pos, alt in enumerate(situation.sincere_ballot(voter_index)):
+        others[alt] -= vec[pos]
+    return others
+
+# witness ballot that makes `target` win, or None if no ballot of this voter can.
+# rivals with equal caps keep the voter's sincere order, so the witness stays close to the sincere ballot
+def manipulation_witness(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    voter_index: int,
+    target: str,
+    *,
+    baseline_scores: dict[str, int] | None = None,
+) -> tuple[str, ...] | None:
+
+    situation.validate()
+    if not (0 <= voter_index < situation.n_voters):
+        raise IndexError("voter_index out of range")
+    if baseline_scores is None:
+        baseline_scores = tally_votes(scheme, situation).scores
+    if target not in baseline_scores:
+        raise ValueError(f"Unknown target alternative: {target!r}")
+
+    others = _scores_without_voter(scheme, situation, voter_index, baseline_scores)
+    return _witness(scoring_vector(scheme, situation.m_alternatives), others, situation.sincere_ballot(voter_index), target)
+
+
+def _witness(
+    vec: list[int],
+    others: dict[str, int],
+    sincere: tuple[str, ...],
+    target: str,
+) -> tuple[str, ...] | None:
+
+    best = others[target] + vec[0]
+    caps = [
+        (best - others[r] - (1 if r < target else 0), k, r)
+        for k, r in enumerate(sincere) if r != target
+    ]
+    caps.sort(key=lambda item: (-item[0], item[1]))
+    for points, (cap, _, _) in zip(vec[1:], caps):
+        if points > cap:
+            return None
+    return (target,) + tuple(r for _, _, r in caps)
+
+# for every alternative: a witness ballot for voter `voter_index` that makes it win, or None if unreachable
+def manipulation_oracle_for_voter(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    voter_index: int,
+    *,
+    baseline_scores: dict[str, int] | None = None,
+) -> dict[str, tuple[str, ...] | None]:
+
+    situation.validate()
+    if not (0 <= voter_index < situation.n_voters):
+        raise IndexError("voter_index out of range")
+    if baseline_scores is None:
+        baseline_scores = tally_votes(scheme, situation).scores
+
+    vec = scoring_vector(scheme, situation.m_alternatives)
+    sincere = situation.sincere_ballot(voter_index)
+    others = _scores_without_voter(scheme, situation, voter_index, baseline_scores)
+    return {target: _witness(vec, others, sincere, target) for target in sorted(others)}
+
+# oracle answers for every voter; voters with the same sincere ballot share one answer
+def manipulation_oracle(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+) -> dict[int, dict[str, tuple[str, ...] | None]]:
+
+    situation.validate()
+    baseline_scores = tally_votes(scheme, situation).scores
+    by_ballot: dict[tuple[str, ...], dict[str, tuple[str, ...] | None]] = {}
+    out: dict[int, dict[str, tuple[str, ...] | None]] = {}
+    for i in range(situation.n_voters):
+        sincere = situation.sincere_ballot(i)
+        if sincere not in by_ballot:
+            by_ballot[sincere] = manipulation_oracle_for_voter(scheme, situation, i, baseline_scores=baseline_scores)
+        out[i] = by_ballot[sincere]
+    return out
+
+# one compromising/burying option per voter and reachable winner other than the baseline one, using the witness ballot.
+# this answers "which winners can voter i force" exactly, but it is not the full option multiset:
+# fraction_change_winner over these options matches full enumeration, avg_gain_all_options does not.
+def enumerate_oracle_options(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    *,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+) -> dict[int, list[StrategicOption]]:
+
+    situation.validate()
+    baseline_outcome = tally_votes(scheme, situation)
+    baseline_happy = happiness_for_outcome(situation, baseline_outcome.winner, metric=happiness_metric)
+
+    options: dict[int, list[StrategicOption]] = {}
+    for i, witnesses in manipulation_oracle(scheme, situation).items():
+        options[i] = [
+            StrategicOption(
+                voter_index=i,
+                strategy_kind="compromising_burying",
+                tactical_ballot=StrategicBallot(voter_index=i, kind="compromising_burying", preferences=ballot),
+                strategic_outcome=target,
+                baseline_outcome=baseline_outcome.winner,
+                strategic_happiness=happiness_for_outcome(situation, target, metric=happiness_metric),
+                baseline_happiness=baseline_happy,
+            )
+            for target, ballot in witnesses.items()
+            if ballot is not None and target != baseline_outcome.winner
+        ]
+    return options
+
+
+# winners reachable by a witness ballot per voter (count 1 each), the histogram counterpart of enumerate_oracle_options
+def oracle_outcome_histograms(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+) -> dict[int, Counter[str]]:
+
+    winner = tally_votes(scheme, situation).winner
+    return {
+        i: Counter(target for target, ballot in witnesses.items() if ballot is not None and target != winner)
+        for i, witnesses in manipulation_oracle(scheme, situation).items()
+    }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from .enumeration import permutation_winners
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .strategic_options import voter_groups
+from .voting import VotingOutcome
+
+# Process-parallel compromising/burying enumeration for a single profile.
+# Voters are independent and voters with the same sincere ballot share one enumeration, so the distinct
+# ballots are split over a process pool. The profile reaches every worker once through the pool initializer;
+# tasks only carry representative voter indices and return the (ballot, multiplicity, winner) lists, or in
+# aggregate mode only the number of ballots per winner, so at most m counts per distinct ballot cross the pool.
+
+# per-process state set by _init_worker
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    baseline_outcome: VotingOutcome,
+    options: dict[str, Any],
+) -> None:
+    _worker_state.update(scheme=scheme, situation=situation, baseline_outcome=baseline_outcome, options=options)
+
+
+def _winners_for_voters(voters: list[int]) -> list[list[tuple[tuple[str, ...], int, str]]]:
+    state = _worker_state
+    return [
+        list(permutation_winners(state["scheme"], state["situation"], i, state["baseline_outcome"], **state["options"]))
+        for i in voters
+    ]
+
+# ballots per winner, reduced in the worker
+def _histograms_for_voters(voters: list[int]) -> list[Counter[str]]:
+    state = _worker_state
+    histograms = []
+    for i in voters:
+        histogram: Counter[str] = Counter()
+        for _, multiplicity, winner in permutation_winners(
+            state["scheme"], state["situation"], i, state["baseline_outcome"], **state["options"],
+        ):
+            histogram[winner] += multiplicity
+        histograms.append(histogram)
+    return histograms
+
+# workers <= 0 means one per CPU core
+def resolve_workers(workers: int) -> int:
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+# `task` over the representative of every distinct sincere ballot, spread over `workers` processes;
+# one result per voter group, in group order
+def _map_representatives(
+    task: Callable[[list[int]], list[Any]],
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    baseline_outcome: VotingOutcome,
+    workers: int,
+    options: dict[str, Any],
+) -> list[Any]:
+
+    situation.validate()
+    workers = resolve_workers(workers)
+    representatives = [voters[0] for voters in voter_groups(situation)]
+
+    if workers == 1 or len(representatives) < 2:
+        _init_worker(scheme, situation, baseline_outcome, options)
+        try:
+            return task(representatives)
+        finally:
+            _worker_state.clear()
+
+    # a few chunks per worker keep the pool busy when some ballots prune much earlier than others
+    size = math.ceil(len(representatives) / min(len(representatives), workers * 4))
+    chunks = [representatives[k:k + size] for k in range(0, len(representatives), size)]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=(scheme, situation, baseline_outcome, options),
+    ) as pool:
+        return [result for chunk in pool.map(task, chunks) for result in chunk]
+
+# permutation_winners for every voter, with the distinct sincere ballots spread over `workers` processes.
+# keyword arguments are passed on to permutation_winners; the result is keyed by voter in voter order
+def parallel_permutation_winners(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    baseline_outcome: VotingOutcome,
+    *,
+    workers: int,
+    **options: Any,
+) -> dict[int, list[tuple[tuple[str, ...], int, str]]]:
+
+    results = _map_representatives(_winners_for_voters, scheme, situation, baseline_outcome, workers, options)
+    by_voter: dict[int, list[tuple[tuple[str, ...], int, str]]] = {}
+    for voters, winners in zip(voter_groups(situation), results):
+        for voter_idx in voters:
+            by_voter[voter_idx] = winners
+    return {i: by_voter[i] for i in range(situation.n_voters)}
+
+# permutation_outcome_histograms with the distinct sincere ballots spread over `workers` processes;
+# the workers return one Counter per ballot instead of the ballots themselves
+def parallel_outcome_histograms(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    baseline_outcome: VotingOutcome,
+    *,
+    workers: int,
+    **options: Any,
+) -> dict[int, Counter[str]]:
+
+    results = _map_representatives(_histograms_for_voters, scheme, situation, baseline_outcome, workers, options)
+    histograms: dict[int, Counter[str]] = {}
+    for voters, histogram in zip(voter_groups(situation), results):
+        for voter_idx in voters:
+            histograms[voter_idx] = Counter(histogram)
+    return {i: histograms[i] for i in range(situation.n_voters)}
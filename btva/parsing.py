@@ -1,29 +1,84 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+import sys
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-from .models import VotingScheme, VotingSituation
+from .models import VotingScheme, VotingSituation, WeightedProfile, _mark_validated
+from .rank_matrix import RankMatrix, _require_numpy, np
+
+# bytes of text read at a time; the file is never held in memory as a whole
+CHUNK_SIZE = 1 << 20
+
+# bumped whenever parsing or validation changes what a file loads as; part of every cache key
+PARSER_VERSION = 2
 
 
 @dataclass(frozen=True)
 class ParsedInput:
     scheme: VotingScheme
     situation: VotingSituation
+    profile: WeightedProfile | None = None
 
-# load an abif-like preference profile from a file, returning a ParsedInput with the voting situation and a placeholder scheme.
-# parsing = to >, and missing votes are filled on lexicographic order of candidate ids.
-def load_input_file(path: str | Path) -> ParsedInput:
+# lines of a text file read in chunks of `chunk_size` characters
+def _iter_lines(path: Path, chunk_size: int) -> Iterator[str]:
+  with path.open("r", encoding="utf-8") as f:
+    tail = ""
+    while True:
+      chunk = f.read(chunk_size)
+      if not chunk:
+        break
+      lines = (tail + chunk).split("\n")
+      tail = lines.pop()
+      yield from lines
+    if tail:
+      yield tail
+
+
+def _check_path(path: str | Path) -> Path:
   p = Path(path)
   if p.suffix.lower() != ".abif":
     raise ValueError("Only .abif input files are supported")
+  return p
 
-  text = p.read_text(encoding="utf-8")
+# distinct rankings of an abif file and, per ballot line in file order, the ranking index and its count.
+# each distinct ranking text is parsed once (interned), so repeated lines cost a dict lookup; with keep_runs=False
+# only the counts per ranking are kept and memory is bounded by the number of distinct rankings
+@dataclass(frozen=True)
+class AbifBallots:
+  m_alternatives: int
+  ballots: tuple[tuple[str, ...], ...]
+  counts: tuple[int, ...]
+  run_types: array | memoryview | None = None
+  run_counts: array | memoryview | None = None
+
+  @property
+  def n_voters(self) -> int:
+    return sum(self.counts)
+
+  # ranking index of every voter in file order
+  def voter_types(self) -> tuple[int, ...]:
+    assert self.run_types is not None and self.run_counts is not None
+    return tuple(itertools.chain.from_iterable(map(itertools.repeat, self.run_types, self.run_counts)))
+
+# parsing = to >, and missing votes are filled on lexicographic order of candidate ids.
+def read_abif_ballots(path: str | Path, *, keep_runs: bool = True, chunk_size: int = CHUNK_SIZE) -> AbifBallots:
+  p = _check_path(path)
   m_alts: int | None = None
-  voters: list[tuple[str, ...]] = []
+  interned: dict[str, int] = {}
+  ballot_index: dict[tuple[str, ...], int] = {}
+  counts: list[int] = []
+  run_types = array("l") if keep_runs else None
+  run_counts = array("q") if keep_runs else None
 
-  for raw_line in text.splitlines():
+  for raw_line in _iter_lines(p, chunk_size):
     line = raw_line.strip()
     if not line:
       continue
@@ -32,6 +87,8 @@ def load_input_file(path: str | Path) -> ParsedInput:
       parts = line[1:].strip().split()
       if parts and parts[0].isdigit():
         m_alts = int(parts[0])
+        # missing candidates are filled from the header, so rankings read before it are interned differently
+        interned.clear()
       continue
 
     if line.startswith("="):
@@ -41,37 +98,237 @@ def load_input_file(path: str | Path) -> ParsedInput:
       raise ValueError(f"Invalid ballot line (missing ':'): {line}")
     count_str, ranking_str = line.split(":", 1)
     count = int(count_str.strip())
-    ranking_str = ranking_str.strip()
-
-    ranking_str = ranking_str.replace("=", ">")
-
-    alts = [a.strip() for a in ranking_str.split(">") if a.strip()]
+    if count <= 0:
+      continue
 
-    if m_alts is not None:
-      expected = [str(i) for i in range(m_alts)]
-      seen = set(alts)
-      missing = [a for a in expected if a not in seen]
-      alts = alts + missing
+    t = interned.get(ranking_str)
+    if t is None:
+      alts = [a.strip() for a in ranking_str.strip().replace("=", ">").split(">") if a.strip()]
+      if m_alts is not None:
+        seen = set(alts)
+        alts += [a for a in (str(i) for i in range(m_alts)) if a not in seen]
+      ballot = tuple(alts)
+      t = ballot_index.get(ballot)
+      if t is None:
+        t = ballot_index[ballot] = len(counts)
+        counts.append(0)
+      interned[ranking_str] = t
 
-    voters.extend([tuple(alts)] * count)
+    counts[t] += count
+    if run_types is not None:
+      run_types.append(t)
+      run_counts.append(count)
 
   if m_alts is None:
     raise ValueError("Missing '# <m> candidates' header")
 
-  expected = tuple(str(i) for i in range(m_alts))
-  expected_set = set(expected)
-  for ballot in voters:
+  # distinct rankings only; every voter holding one of them is covered by this check
+  expected_set = {str(i) for i in range(m_alts)}
+  for ballot in ballot_index:
     if len(ballot) != m_alts:
       raise ValueError(f"Ballot does not rank exactly {m_alts} candidates: {ballot}")
     if set(ballot) != expected_set:
       raise ValueError(f"Ballot candidates don't match expected 0..{m_alts-1}: {ballot}")
-    if len(set(ballot)) != len(ballot):
-      raise ValueError(f"Ballot contains duplicate candidates after parsing: {ballot}")
 
-  situation = VotingSituation(tuple(voters))
-  situation.validate()
+  return AbifBallots(
+    m_alternatives=m_alts,
+    ballots=tuple(ballot_index),
+    counts=tuple(counts),
+    run_types=run_types,
+    run_counts=run_counts,
+  )
+
+# sidecar cache of parsed files: one entry per (sha256 of the file bytes, PARSER_VERSION), so an edited file or a
+# parser change simply misses. An entry holds the distinct rankings as candidate ids plus the counts and ballot runs
+# as raw little-endian arrays behind a fixed header; files that fail to parse or validate get an entry with the error
+# message, so they are rejected again without being read. Entries are written to a temporary name and renamed.
+_CACHE_MAGIC = b"BTVAABIF"
+_CACHE_HEADER = struct.Struct("<8sIIIQQ")
+_CACHE_OK = 0
+_CACHE_ERROR = 1
+
+
+def _file_digest(path: Path, chunk_size: int) -> str:
+  h = hashlib.sha256()
+  with path.open("rb") as f:
+    while chunk := f.read(chunk_size):
+      h.update(chunk)
+  return h.hexdigest()
+
+
+def cache_entry_path(path: str | Path, cache_dir: str | Path, *, chunk_size: int = CHUNK_SIZE) -> Path:
+  p = _check_path(path)
+  return Path(cache_dir) / f"{_file_digest(p, chunk_size)}-v{PARSER_VERSION}.abifc"
+
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# '<q' / '<H' bytes of `values`, so entries written on any host read back on any other
+def _le_bytes(code: str, values: Any) -> bytes:
+  a = array(code, values)
+  if not _LITTLE_ENDIAN:
+    a.byteswap()
+  return a.tobytes()
+
+# little-endian `code` items of `view`: a zero-copy cast on little-endian hosts, a byteswapped copy elsewhere
+def _le_items(view: memoryview, code: str) -> memoryview | array:
+  if _LITTLE_ENDIAN:
+    return view.cast(code)
+  a = array(code, bytes(view))
+  a.byteswap()
+  return a
+
+# raw little-endian arrays of an AbifBallots: counts, run types and run counts as int64, then the candidate ids of the
+# distinct rankings as uint16, zero-padded to a multiple of 8 bytes so bodies can be packed back to back
+def _encode_ballots(read: AbifBallots) -> bytes:
+  assert read.run_types is not None and read.run_counts is not None
+  body = b"".join((
+    _le_bytes("q", read.counts),
+    _le_bytes("q", read.run_types),
+    _le_bytes("q", read.run_counts),
+    _le_bytes("H", (int(a) for ballot in read.ballots for a in ballot)),
+  ))
+  return body + bytes(-len(body) % 8)
+
+
+def _encoded_size(m: int, n_distinct: int, n_runs: int) -> int:
+  ids = 2 * n_distinct * m
+  return 8 * n_distinct + 16 * n_runs + ids + (-ids % 8)
+
+# inverse of _encode_ballots; on little-endian hosts the run arrays are views into `view` and nothing but the distinct
+# rankings is copied
+def _decode_ballots(view: memoryview, m: int, n_distinct: int, n_runs: int) -> AbifBallots:
+  counts = _le_items(view[:8 * n_distinct], "q")
+  offset = 8 * n_distinct
+  run_types = _le_items(view[offset:offset + 8 * n_runs], "q")
+  offset += 8 * n_runs
+  run_counts = _le_items(view[offset:offset + 8 * n_runs], "q")
+  offset += 8 * n_runs
+  ids = _le_items(view[offset:offset + 2 * n_distinct * m], "H")
+
+  names = tuple(str(i) for i in range(m))
+  ballots = tuple(tuple(map(names.__getitem__, ids[k * m:(k + 1) * m])) for k in range(n_distinct))
+  return AbifBallots(m_alternatives=m, ballots=ballots, counts=tuple(counts), run_types=run_types, run_counts=run_counts)
+
+
+def _write_cache_entry(entry: Path, read: AbifBallots | None, error: str | None = None) -> None:
+  if read is None:
+    header = _CACHE_HEADER.pack(_CACHE_MAGIC, PARSER_VERSION, _CACHE_ERROR, 0, 0, 0)
+    body = (error or "").encode("utf-8")
+  else:
+    assert read.run_types is not None
+    header = _CACHE_HEADER.pack(
+      _CACHE_MAGIC, PARSER_VERSION, _CACHE_OK, read.m_alternatives, len(read.ballots), len(read.run_types),
+    )
+    body = _encode_ballots(read)
+  entry.parent.mkdir(parents=True, exist_ok=True)
+  tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+  with tmp.open("wb") as f:
+    f.write(header)
+    f.write(body)
+  os.replace(tmp, entry)
+
+# the ParsedInput or the cached error message of a mapped entry; None for an unreadable one. Every view into `data`
+# is dropped when this returns, so the map can be closed
+def _cached_input(data: memoryview) -> ParsedInput | str | None:
+  if len(data) < _CACHE_HEADER.size:
+    return None
+  magic, version, kind, m, n_distinct, n_runs = _CACHE_HEADER.unpack_from(data)
+  if magic != _CACHE_MAGIC or version != PARSER_VERSION:
+    return None
+  view = data[_CACHE_HEADER.size:]
+  if kind == _CACHE_ERROR:
+    return bytes(view).decode("utf-8")
+  if len(view) != _encoded_size(m, n_distinct, n_runs):
+    return None
+  return _parsed_input(_decode_ballots(view, m, n_distinct, n_runs), validated=True)
+
+# memory-map an entry instead of reading it whole; None for a missing, empty or unreadable entry
+def _read_cache_entry(entry: Path) -> ParsedInput | str | None:
+  try:
+    with entry.open("rb") as f:
+      mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  except (OSError, ValueError):
+    return None
+  with mapped:
+    return _cached_input(memoryview(mapped))
+
+
+def _parsed_input(read: AbifBallots, *, validated: bool = False) -> ParsedInput:
+  voter_types = read.voter_types()
+
+  profile = WeightedProfile(ballots=read.ballots, counts=read.counts, voter_types=voter_types)
+  if validated:
+    _mark_validated(profile)
+  else:
+    profile.validate()
+  # the situation shares the validated ballot tuples, so it is not checked voter by voter again
+  situation = VotingSituation(tuple(map(read.ballots.__getitem__, voter_types)))
+  _mark_validated(situation)
+
+  return ParsedInput(scheme=VotingScheme.PLURALITY, situation=situation, profile=profile)
+
+# load an abif-like preference profile from a file, returning a ParsedInput with the voting situation and a placeholder scheme.
+# with cache_dir set, the parsed ballots are kept in a sidecar entry there; a hit skips parsing and validation
+def load_input_file(
+  path: str | Path,
+  *,
+  chunk_size: int = CHUNK_SIZE,
+  cache_dir: str | Path | None = None,
+) -> ParsedInput:
+  if cache_dir is None:
+    return _parsed_input(read_abif_ballots(path, chunk_size=chunk_size))
+
+  entry = cache_entry_path(path, cache_dir, chunk_size=chunk_size)
+  cached = _read_cache_entry(entry)
+  if isinstance(cached, str):
+    raise ValueError(cached)
+  if cached is not None:
+    return cached
+
+  try:
+    read = read_abif_ballots(path, chunk_size=chunk_size)
+    parsed = _parsed_input(read)
+  except ValueError as e:
+    _write_cache_entry(entry, None, error=str(e))
+    raise
+  _write_cache_entry(entry, read)
+  return parsed
+
+# count-weighted profile straight from the file; with keep_voter_order=False no per-voter structure is built at all
+def load_weighted_profile(
+  path: str | Path,
+  *,
+  keep_voter_order: bool = False,
+  chunk_size: int = CHUNK_SIZE,
+) -> WeightedProfile:
+  read = read_abif_ballots(path, keep_runs=keep_voter_order, chunk_size=chunk_size)
+  profile = WeightedProfile(
+    ballots=read.ballots,
+    counts=read.counts,
+    voter_types=read.voter_types() if keep_voter_order else None,
+  )
+  profile.validate()
+  return profile
+
+# n x m rank matrix of parsed ballots, voters in file order: the distinct rankings are encoded once
+# and repeated per ballot line
+def _rank_matrix(read: AbifBallots) -> RankMatrix:
+  _require_numpy()
+  candidates = tuple(sorted(read.ballots[0])) if read.ballots else tuple(str(i) for i in range(read.m_alternatives))
+  index = {c: i for i, c in enumerate(candidates)}
+  dtype = np.uint8 if len(candidates) <= 0xFF else np.uint16
+  distinct = np.array([[index[a] for a in b] for b in read.ballots], dtype=dtype).reshape(len(read.ballots), len(candidates))
+  types = np.asarray(read.run_types)
+  repeats = np.asarray(read.run_counts)
+  matrix = RankMatrix.from_rankings(candidates, np.repeat(distinct[types], repeats, axis=0))
+  matrix.validate()
+  return matrix
 
-  return ParsedInput(scheme=VotingScheme.PLURALITY, situation=situation)
+# rank matrix straight from the file (needs numpy)
+def load_rank_matrix(path: str | Path, *, chunk_size: int = CHUNK_SIZE) -> RankMatrix:
+  _require_numpy()
+  return _rank_matrix(read_abif_ballots(path, chunk_size=chunk_size))
 
 def load_strategies_block(path: str | Path) -> dict[str, Any]:
   return {}
@@ -129,9 +129,18 @@ def main(argv: list[str] | None = None) -> int:
         default=Path("experiments/plots"),
         help="Directory to write PNG plots into",
     )
+    parser.add_argument(
+        "--happiness-metric",
+        type=str,
+        default=None,
+        help="Metric to plot when the CSV holds rows for several (default: the first one in the file)",
+    )
     args = parser.parse_args(argv)
 
     df_raw = _read_results(args.csv)
+    if "happiness_metric" in df_raw.columns and len(df_raw):
+        metric = args.happiness_metric or str(df_raw["happiness_metric"].iloc[0])
+        df_raw = df_raw[df_raw["happiness_metric"] == metric]
 
     # Normalize only the metrics we need for the tradeoff plots.
     for col in ["H_mean", "risk_fraction_change_winner", "risk_avg_gain_all_options"]:
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional extra (pip install btva[fast])
+    np = None
+
+from .models import PositionCounts, VotingSituation, _already_validated, _mark_validated
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The rank-matrix backend requires numpy (pip install 'btva[fast]').")
+
+
+# compact integer backend for a voting situation.
+# candidates are mapped once to ids 0..m-1 in lexicographic order, so "lowest id" is also the tie-break winner.
+# rankings[i, pos] = id of the alternative voter i puts at position pos
+# positions[i, a]  = position of alternative a in voter i's ranking (inverse of rankings)
+@dataclass(frozen=True, eq=False)
+class RankMatrix:
+    candidates: tuple[str, ...]
+    rankings: np.ndarray
+    positions: np.ndarray
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_rankings(cls, candidates: Sequence[str], rankings: np.ndarray) -> RankMatrix:
+        _require_numpy()
+        candidates = tuple(candidates)
+        dtype = np.uint8 if len(candidates) <= 0xFF else np.uint16
+        raw = np.asarray(rankings)
+        if raw.ndim != 2 or raw.shape[1] != len(candidates):
+            raise ValueError(f"rankings must have shape (n, {len(candidates)}), got {raw.shape}.")
+        # ids are range-checked before the dtype cast and the scatter into positions
+        bad = np.flatnonzero(((raw < 0) | (raw >= len(candidates))).any(axis=1))
+        if bad.size:
+            idx = int(bad[0])
+            raise ValueError(f"Voter {idx} ranks a candidate id outside 0..{len(candidates) - 1}: {raw[idx].tolist()}.")
+        rankings = raw.astype(dtype, copy=False)
+
+        positions = np.empty_like(rankings)
+        rows = np.arange(rankings.shape[0])[:, None]
+        positions[rows, rankings] = np.arange(rankings.shape[1], dtype=dtype)
+        return cls(candidates=candidates, rankings=rankings, positions=positions)
+
+    @classmethod
+    def from_situation(cls, situation: VotingSituation) -> RankMatrix:
+        _require_numpy()
+        candidates = tuple(sorted(situation.alternatives))
+        index = {c: i for i, c in enumerate(candidates)}
+        rankings = np.array(
+            [[index[a] for a in pref] for pref in situation.voters_preferences],
+            dtype=np.uint8 if len(candidates) <= 0xFF else np.uint16,
+        ).reshape(situation.n_voters, len(candidates))
+        matrix = cls.from_rankings(candidates, rankings)
+        if _already_validated(situation):
+            _mark_validated(matrix)
+        return matrix
+
+    @property
+    def n_voters(self) -> int:
+        return int(self.rankings.shape[0])
+
+    @property
+    def m_alternatives(self) -> int:
+        return len(self.candidates)
+
+    @property
+    def alternatives(self) -> tuple[str, ...]:
+        if not self.n_voters:
+            return tuple()
+        return tuple(self.candidates[a] for a in self.rankings[0].tolist())
+
+    @cached_property
+    def candidate_index(self) -> dict[str, int]:
+        return {c: i for i, c in enumerate(self.candidates)}
+
+    # decoded string profile, for code that still walks voters_preferences
+    @cached_property
+    def voters_preferences(self) -> tuple[tuple[str, ...], ...]:
+        cands = self.candidates
+        return tuple(tuple(cands[a] for a in row) for row in self.rankings.tolist())
+
+    def to_situation(self) -> VotingSituation:
+        return VotingSituation(self.voters_preferences)
+
+    @cached_property
+    def position_counts(self) -> PositionCounts:
+        m = self.m_alternatives
+        # column pos of the count matrix is a histogram of rankings[:, pos]
+        counts = np.stack([np.bincount(self.rankings[:, pos], minlength=m) for pos in range(m)], axis=1)
+        return PositionCounts(alternatives=self.candidates, counts=tuple(tuple(row) for row in counts.tolist()))
+
+    def sincere_ballot(self, voter_index: int) -> tuple[str, ...]:
+        cands = self.candidates
+        return tuple(cands[a] for a in self.rankings[voter_index].tolist())
+
+    # voter indices grouped by identical sincere ballot, groups in order of first appearance (as VotingSituation)
+    @cached_property
+    def voters_by_ballot(self) -> tuple[tuple[int, ...], ...]:
+        if not self.n_voters:
+            return tuple()
+        _, first, inverse = np.unique(self.rankings, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        members = np.split(np.argsort(inverse, kind="stable"), np.cumsum(np.bincount(inverse))[:-1])
+        return tuple(tuple(members[k].tolist()) for k in np.argsort(first).tolist())
+
+    # per-metric happiness tables, filled lazily by btva.happiness.happiness_table
+    @cached_property
+    def happiness_tables(self) -> dict:
+        return {}
+
+    def encode(self, ballot: Sequence[str]) -> list[int]:
+        index = self.candidate_index
+        return [index[a] for a in ballot]
+
+    # total score per candidate id for a positional scoring vector
+    def scores(self, vec: Sequence[int]) -> np.ndarray:
+        weights = np.asarray(vec, dtype=np.int64)
+        return weights[self.positions].sum(axis=0)
+
+    # 0-based position of alternative `outcome` for every voter
+    def ranks_of(self, outcome: str) -> np.ndarray:
+        return self.positions[:, self.candidate_index[outcome]]
+
+    def validate(self) -> None:
+        if _already_validated(self):
+            return
+        if self.n_voters <= 2:
+            raise ValueError("VotingSituation must have n > 2 voters.")
+        if self.m_alternatives <= 2:
+            raise ValueError("VotingSituation must have m > 2 alternatives.")
+        if len(set(self.candidates)) != self.m_alternatives:
+            raise ValueError("Alternatives must be unique within a preference list.")
+
+        expected = np.arange(self.m_alternatives)
+        bad = np.flatnonzero((np.sort(self.rankings, axis=1) != expected).any(axis=1))
+        if bad.size:
+            idx = int(bad[0])
+            raise ValueError(f"Voter {idx} must rank exactly the same alternatives: {self.rankings[idx].tolist()}.")
+        _mark_validated(self)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Callable
+
+from .enumeration_bullet import bullet_outcome_histograms
+from .enumeration_fused import _scores_without, _stacked_winners
+from .happiness import HappinessMetric, happiness_for_outcome
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .oracle import oracle_outcome_histograms
+from .strategic_options import voter_groups
+from .voting import VotingOutcome, scoring_vector, tally_votes
+
+# Monte Carlo estimate of the compromising/burying risk for m > max_m, where the m! orders cannot be enumerated.
+# Every distinct sincere ballot draws non-sincere orders uniformly, or stratified by the position the voter gives
+# its favourite (m strata of (m-1)! orders each). Only the winner of every draw is kept, so the estimate can be
+# re-read under any happiness metric. Bullet ballots are still counted exactly, fraction_change_winner comes
+# exactly from the manipulation oracle.
+
+
+# samples is the number of draws per distinct sincere ballot (None: draw until time_budget runs out),
+# time_budget the wall-clock seconds for the whole profile. Draws are made in rounds over all ballots, so a
+# time budget spreads evenly; every stratum gets at least 2 draws, the minimum for a variance.
+@dataclass(frozen=True)
+class SamplingBudget:
+    samples: int | None = 200
+    time_budget: float | None = None
+    stratified: bool = False
+    seed: int = 0
+    confidence: float = 0.95
+
+    def __post_init__(self) -> None:
+        if self.samples is None and self.time_budget is None:
+            raise ValueError("SamplingBudget needs samples or time_budget.")
+        if self.samples is not None and self.samples < 1:
+            raise ValueError(f"samples must be positive, got {self.samples}.")
+        if not 0 < self.confidence < 1:
+            raise ValueError(f"confidence must be in (0, 1), got {self.confidence}.")
+
+
+# drawn winners of one distinct sincere ballot, one Counter per stratum.
+# weights[h] is the share of the m! - 1 non-sincere orders that fall in stratum h
+@dataclass(frozen=True)
+class BallotSample:
+    voters: tuple[int, ...]
+    weights: tuple[float, ...]
+    winners: tuple[Counter[str], ...]
+
+    @property
+    def n_samples(self) -> int:
+        return sum(sum(counts.values()) for counts in self.winners)
+
+
+@dataclass(frozen=True)
+class CompromiseSample:
+    scheme: VotingScheme
+    population: int
+    groups: tuple[BallotSample, ...]
+
+    @property
+    def n_samples(self) -> int:
+        return sum(group.n_samples for group in self.groups)
+
+
+@dataclass(frozen=True)
+class Estimate:
+    value: float
+    half_width: float
+
+    @property
+    def low(self) -> float:
+        return self.value - self.half_width
+
+    @property
+    def high(self) -> float:
+        return self.value + self.half_width
+
+
+# risk numbers over bullet plus compromising/burying ballots, the sampled counterpart of the RiskAccumulator fields
+@dataclass(frozen=True)
+class SampledRisk:
+    sample: CompromiseSample
+    happiness_metric: HappinessMetric
+    confidence: float
+    tactical_options_total: Estimate
+    avg_gain: Estimate
+    avg_delta_H: Estimate
+    fraction_change_winner: float
+
+    @property
+    def n_samples(self) -> int:
+        return self.sample.n_samples
+
+
+# one uniformly drawn order of ids with `favourite` at `position` (anywhere if position is None), never `sincere`
+def _draw_ballot(rng: random.Random, m: int, favourite: int, position: int | None, sincere: list[int]) -> list[int]:
+    while True:
+        if position is None:
+            ballot = list(range(m))
+            rng.shuffle(ballot)
+        else:
+            ballot = [a for a in range(m) if a != favourite]
+            rng.shuffle(ballot)
+            ballot.insert(position, favourite)
+        if ballot != sincere:
+            return ballot
+
+
+def sample_compromise_burying(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile,
+    *,
+    budget: SamplingBudget = SamplingBudget(),
+    baseline_outcome: VotingOutcome | None = None,
+) -> CompromiseSample:
+
+    situation.validate()
+    if baseline_outcome is None:
+        baseline_outcome = tally_votes(scheme, situation)
+    deadline = None if budget.time_budget is None else time.perf_counter() + budget.time_budget
+
+    m = situation.m_alternatives
+    vec = scoring_vector(scheme, m)
+    names = tuple(sorted(situation.alternatives))
+    index = {a: k for k, a in enumerate(names)}
+    population = math.factorial(m) - 1
+    if budget.stratified:
+        # the sincere ballot is the one order missing from stratum 0
+        positions: list[int | None] = list(range(m))
+        weights = tuple((math.factorial(m - 1) - (h == 0)) / population for h in range(m))
+    else:
+        positions = [None]
+        weights = (1.0,)
+    per_stratum = None if budget.samples is None else max(2, math.ceil(budget.samples / len(positions)))
+
+    rng = random.Random(budget.seed)
+    groups = []
+    for voters in voter_groups(situation):
+        sincere_names = situation.sincere_ballot(voters[0])
+        sincere = [index[a] for a in sincere_names]
+        others = _scores_without(vec, baseline_outcome.scores, names, index, sincere_names)
+        groups.append((voters, sincere, others, [Counter() for _ in positions]))
+
+    drawn = 0
+    while per_stratum is None or drawn < per_stratum:
+        step = max(2, min(16, drawn))
+        if per_stratum is not None:
+            step = min(step, per_stratum - drawn)
+        for _, sincere, others, counters in groups:
+            for position, counter in zip(positions, counters):
+                ballots = [_draw_ballot(rng, m, sincere[0], position, sincere) for _ in range(step)]
+                counter.update(names[w] for w in _stacked_winners([vec], [others], ballots)[0])
+        drawn += step
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+    return CompromiseSample(
+        scheme=scheme,
+        population=population,
+        groups=tuple(
+            BallotSample(voters=tuple(voters), weights=weights, winners=tuple(counters))
+            for voters, _, _, counters in groups
+        ),
+    )
+
+# stratified mean of f over the drawn winners and the variance of that mean
+def _stratified_mean(group: BallotSample, f: Callable[[str], float]) -> tuple[float, float]:
+    mean = variance = 0.0
+    for weight, counts in zip(group.weights, group.winners):
+        k = sum(counts.values())
+        mu = sum(c * f(w) for w, c in counts.items()) / k
+        s2 = sum(c * (f(w) - mu) ** 2 for w, c in counts.items()) / (k - 1) if k > 1 else 0.0
+        mean += weight * mu
+        variance += weight * weight * s2 / k
+    return mean, variance
+
+# totals over the m! - 1 orders of every voter are population x (drawn mean), voters sharing a sincere ballot
+# share one sample. The averages are ratio estimators (tactical gain sum / tactical count) with a delta-method interval
+def estimate_risk(
+    situation: VotingSituation | WeightedProfile,
+    sample: CompromiseSample,
+    *,
+    happiness_metric: HappinessMetric = HappinessMetric.BORDA,
+    confidence: float = 0.95,
+) -> SampledRisk:
+
+    scheme = sample.scheme
+    baseline = tally_votes(scheme, situation)
+    base_happy = happiness_for_outcome(situation, baseline.winner, metric=happiness_metric)
+    happy = {a: happiness_for_outcome(situation, a, metric=happiness_metric) for a in situation.alternatives}
+
+    def gain(i: int, w: str) -> float:
+        return happy[w].per_voter[i] - base_happy.per_voter[i]
+
+    def delta_H(w: str) -> float:
+        return happy[w].total - base_happy.total
+
+    bullets = bullet_outcome_histograms(scheme, situation)
+    tactical = exact_gain = exact_delta = 0.0
+    for i, counts in bullets.items():
+        for w, c in counts.items():
+            if gain(i, w) > 0:
+                tactical += c
+                exact_gain += c * gain(i, w)
+                exact_delta += c * delta_H(w)
+
+    N = float(sample.population)
+    for group in sample.groups:
+        i, scale = group.voters[0], N * len(group.voters)
+        tactical += scale * _stratified_mean(group, lambda w: float(gain(i, w) > 0))[0]
+        exact_gain += scale * _stratified_mean(group, lambda w: max(gain(i, w), 0.0))[0]
+        exact_delta += scale * _stratified_mean(group, lambda w: delta_H(w) if gain(i, w) > 0 else 0.0)[0]
+    avg_gain = exact_gain / tactical if tactical else 0.0
+    avg_delta = exact_delta / tactical if tactical else 0.0
+
+    # the exact bullet part adds no variance; Var(G / T) ~ Var(G - R T) / T^2
+    var_tactical = var_gain = var_delta = 0.0
+    for group in sample.groups:
+        i, scale = group.voters[0], (N * len(group.voters)) ** 2
+        var_tactical += scale * _stratified_mean(group, lambda w: float(gain(i, w) > 0))[1]
+        var_gain += scale * _stratified_mean(group, lambda w: gain(i, w) - avg_gain if gain(i, w) > 0 else 0.0)[1]
+        var_delta += scale * _stratified_mean(group, lambda w: delta_H(w) - avg_delta if gain(i, w) > 0 else 0.0)[1]
+    if tactical:
+        var_gain /= tactical ** 2
+        var_delta /= tactical ** 2
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # a voter can change the winner iff a bullet ballot or an oracle witness elects a preferred alternative
+    witnesses = oracle_outcome_histograms(scheme, situation)
+    changers = sum(1 for i, counts in bullets.items() if any(gain(i, w) > 0 for w in counts + witnesses[i]))
+
+    return SampledRisk(
+        sample=sample,
+        happiness_metric=happiness_metric,
+        confidence=confidence,
+        tactical_options_total=Estimate(tactical, z * math.sqrt(var_tactical)),
+        avg_gain=Estimate(avg_gain, z * math.sqrt(var_gain)),
+        avg_delta_H=Estimate(avg_delta, z * math.sqrt(var_delta)),
+        fraction_change_winner=changers / max(1, situation.n_voters),
+    )
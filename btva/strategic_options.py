@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from typing import Callable
 
 from .happiness import HappinessResult
+from .models import VotingSituation, WeightedProfile
 from .strategies import StrategicBallot
 
 # this function is the main data structure for representing strategic-voting options for voters, and their associated outcomes/happiness.
@@ -19,6 +21,9 @@ class StrategicOption:
     strategic_happiness: HappinessResult
     baseline_happiness: HappinessResult
 
+    # number of concrete ballots this option stands for (>1 for a representative of an equivalence class)
+    multiplicity: int = 1
+
     @property
     def H_tilde_i(self) -> float:
         return self.strategic_happiness.per_voter[self.voter_index]
@@ -34,3 +39,27 @@ class StrategicOption:
     @property
     def H(self) -> float:
         return self.baseline_happiness.total
+
+    # the same option attributed to another voter with an identical sincere ballot
+    def for_voter(self, voter_index: int) -> StrategicOption:
+        ballot = replace(self.tactical_ballot, voter_index=voter_index)
+        return replace(self, voter_index=voter_index, tactical_ballot=ballot)
+
+# voter indices grouped by identical sincere ballot
+def voter_groups(profile: VotingSituation | WeightedProfile) -> tuple[tuple[int, ...], ...]:
+    return profile.voters_by_type if isinstance(profile, WeightedProfile) else profile.voters_by_ballot
+
+# run a per-voter enumeration once per distinct sincere ballot and copy the result to the other voters with that ballot
+def expand_by_ballot_type(
+    profile: VotingSituation | WeightedProfile,
+    options_for_voter: Callable[[int], list[StrategicOption]],
+) -> dict[int, list[StrategicOption]]:
+
+    options: dict[int, list[StrategicOption]] = {}
+    for voters in voter_groups(profile):
+        representative = voters[0]
+        rep_options = options_for_voter(representative)
+        options[representative] = rep_options
+        for voter_idx in voters[1:]:
+            options[voter_idx] = [opt.for_voter(voter_idx) for opt in rep_options]
+    return {i: options[i] for i in range(profile.n_voters)}
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from .models import VotingScheme, VotingSituation
+from .models import VotingScheme, VotingSituation, WeightedProfile
+from .rank_matrix import RankMatrix
 from .strategies import StrategicBallot
 
 # Result of tallying a voting situation uunder a voting scheme."""
 @dataclass(frozen=True)
 class VotingOutcome:
-    scheme: VotingScheme
+    scheme: VotingScheme | str
     scores: dict[str, int]
     winner: str
 
@@ -31,26 +32,39 @@ def scoring_vector(scheme: VotingScheme, m: int) -> list[int]:
     raise ValueError(f"Unsupported voting scheme: {scheme}")
 
 # compute scores and winner for the given scheme and situation
-def tally_votes(scheme: VotingScheme, situation: VotingSituation) -> VotingOutcome:
+def tally_votes(scheme: VotingScheme, situation: VotingSituation | WeightedProfile | RankMatrix) -> VotingOutcome:
     situation.validate()
     m = situation.m_alternatives
     vec = scoring_vector(scheme, m)
-    scores: dict[str, int] = {a: 0 for a in sorted(situation.alternatives)}
 
-    for pref in situation.voters_preferences:
-        for position, alt in enumerate(pref):
-            scores[alt] += vec[position]
-
-    max_score = max(scores.values())
-    winners = [a for a, s in scores.items() if s == max_score]
-    winner = sorted(winners)[0]
-
-    return VotingOutcome(scheme=scheme, scores=scores, winner=winner)
+    # O(m^2) on the cached position counts, independent of the number of voters
+    scores = situation.position_counts.scores(vec)
+    return VotingOutcome(scheme=scheme, scores=scores, winner=_lexicographic_winner(scores))
 
 
 def tally_votes_strategic(
     scheme: VotingScheme,
-    situation: VotingSituation,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    *,
+    overrides: dict[int, StrategicBallot] | None = None,
+    bullet_choice_by_voter: dict[int, str] | None = None,
+) -> VotingOutcome:
+
+    baseline = tally_votes(scheme, situation)
+    return tally_votes_delta(
+        scheme,
+        situation,
+        baseline.scores,
+        overrides=overrides,
+        bullet_choice_by_voter=bullet_choice_by_voter,
+    )
+
+# re-tally from known sincere scores in O(m * |deviations|): every deviating voter subtracts its
+# sincere contribution and adds its tactical one (a bullet vote adds max points to a single alternative)
+def tally_votes_delta(
+    scheme: VotingScheme,
+    situation: VotingSituation | WeightedProfile | RankMatrix,
+    baseline_scores: dict[str, int],
     *,
     overrides: dict[int, StrategicBallot] | None = None,
     bullet_choice_by_voter: dict[int, str] | None = None,
@@ -63,30 +77,33 @@ def tally_votes_strategic(
     overrides = overrides or {}
     bullet_choice_by_voter = bullet_choice_by_voter or {}
 
-    scores: dict[str, int] = {a: 0 for a in sorted(situation.alternatives)}
-
-    for voter_idx, sincere_pref in enumerate(situation.voters_preferences):
-        pref = sincere_pref
-        if voter_idx in overrides:
-            pref = overrides[voter_idx].preferences
+    scores = dict(baseline_scores)
+    for voter_idx in set(overrides) | set(bullet_choice_by_voter):
+        for position, alt in enumerate(situation.sincere_ballot(voter_idx)):
+            scores[alt] -= vec[position]
 
         if voter_idx in bullet_choice_by_voter:
             if scheme == VotingScheme.PLURALITY:
                 raise ValueError("Bullet voting cannot be applied to plurality (assignment).")
 
             chosen = bullet_choice_by_voter[voter_idx]
-            if chosen not in situation.alternatives:
+            if chosen not in scores:
                 raise ValueError(f"Invalid bullet choice: {chosen}")
 
-            max_points = m - 1 if scheme == VotingScheme.BORDA else 1
-            scores[chosen] += max_points
+            scores[chosen] += bullet_points(scheme, m)
             continue
 
-        for position, alt in enumerate(pref):
+        for position, alt in enumerate(overrides[voter_idx].preferences):
             scores[alt] += vec[position]
 
+    return VotingOutcome(scheme=scheme, scores=scores, winner=_lexicographic_winner(scores))
+
+# points a bullet vote gives its single choice: the top score of the scheme, nothing to the others
+def bullet_points(scheme: VotingScheme, m: int) -> int:
+    return m - 1 if scheme == VotingScheme.BORDA else 1
+
+# ties are broken in lexicographic order of the alternatives
+def _lexicographic_winner(scores: dict[str, int]) -> str:
     max_score = max(scores.values())
     winners = [a for a, s in scores.items() if s == max_score]
-    winner = sorted(winners)[0]
-
-    return VotingOutcome(scheme=scheme, scores=scores, winner=winner)
+    return sorted(winners)[0]
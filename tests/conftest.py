@@ -0,0 +1,14 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import random
+
+from btva.models import VotingSituation
+
+
+# random profile over candidates A, B, ...; the first `repeated` ballots are appended again so voter types are shared
+def random_situation(seed: int, n: int = 7, m: int = 5, *, repeated: int = 0) -> VotingSituation:
+    rng = random.Random(seed)
+    alts = [chr(ord("A") + k) for k in range(m)]
+    prefs = [tuple(rng.sample(alts, m)) for _ in range(n)]
+    return VotingSituation(voters_preferences=tuple(prefs + prefs[:repeated]))
@@ -0,0 +1,46 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from btva.analysis import RiskAccumulator, compute_risk, run_btva_with_strategies
+from btva.models import VotingScheme
+from conftest import random_situation
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_aggregates_summarise_the_options(scheme: VotingScheme, seed: int) -> None:
+    situation = random_situation(seed)
+    full = run_btva_with_strategies(scheme, situation)
+    agg = run_btva_with_strategies(scheme, situation, aggregate=True)
+
+    assert agg.strategic_options is None
+    assert agg.outcome == full.outcome
+    for voter, opts in full.strategic_options.items():
+        a = agg.aggregates[voter]
+        expected: dict[str, Counter[str]] = {}
+        for opt in opts:
+            expected.setdefault(opt.strategy_kind, Counter())[opt.strategic_outcome] += 1
+        assert a.outcome_counts == {kind: dict(c) for kind, c in expected.items()}
+        assert a.n_options == len(opts)
+
+        tactical = [opt for opt in opts if opt.H_tilde_i > opt.H_i]
+        assert a.n_tactical == len(tactical)
+        assert sum(a.tactical_gains.values()) == sum(opt.H_tilde_i - opt.H_i for opt in tactical)
+        assert a.tactical_delta_H == sum(opt.H_tilde - opt.H for opt in tactical)
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("method", ["avg_gain_all_options", "fraction_change_winner"])
+def test_risk_from_aggregates_matches_tactical_options(scheme: VotingScheme, method: str) -> None:
+    situation = random_situation(4)
+    full = run_btva_with_strategies(scheme, situation)
+    tactical = {i: [o for o in opts if o.H_tilde_i > o.H_i] for i, opts in full.strategic_options.items()}
+
+    for kwargs in ({}, {"prune": True, "collapse_equivalent": True}):
+        agg = run_btva_with_strategies(scheme, situation, aggregate=True, **kwargs)
+        accumulator = RiskAccumulator(situation.n_voters, (method,), tactical_only=True).add_aggregates(agg.aggregates)
+        assert accumulator.risk(method) == compute_risk(tactical, method=method)
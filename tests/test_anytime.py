@@ -0,0 +1,123 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from btva.analysis import RiskAccumulator, run_btva_with_strategies, with_happiness_metric
+from btva.anytime import risk_bounds
+from btva.sampling import SamplingBudget
+from btva.cli import main
+from btva.enumeration import pruned_permutation_winners
+from btva.happiness import HappinessMetric
+from btva.models import VotingScheme, VotingSituation
+from btva.voting import tally_votes
+from conftest import random_situation
+
+
+def _exact(scheme: VotingScheme, situation: VotingSituation) -> RiskAccumulator:
+    result = run_btva_with_strategies(scheme, situation, aggregate=True, collapse_equivalent=True, prune=True)
+    accumulator = RiskAccumulator(situation.n_voters, tactical_only=True)
+    accumulator.add_aggregates(result.aggregates)
+    return accumulator
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("seed", range(4))
+def test_generous_budget_is_exact(scheme: VotingScheme, seed: int) -> None:
+    situation = random_situation(seed, m=6)
+    result = run_btva_with_strategies(scheme, situation, collapse_equivalent=True, time_budget=60.0)
+    exact = _exact(scheme, situation)
+    coverage = result.coverage
+
+    assert coverage.complete and coverage.voter_fraction == 1.0 and coverage.ballot_fraction == 1.0
+    assert coverage.tactical_options_total.low == coverage.tactical_options_total.high == exact.n_options
+    assert coverage.avg_gain_all_options.low == pytest.approx(exact.avg_gain)
+    assert coverage.avg_gain_all_options.high == pytest.approx(exact.avg_gain)
+
+    got = RiskAccumulator(situation.n_voters, tactical_only=True)
+    got.add_aggregates(result.aggregates)
+    assert got.n_options == exact.n_options
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("seed", range(4))
+def test_zero_budget_bounds_contain_exact_values(scheme: VotingScheme, seed: int) -> None:
+    situation = random_situation(seed, m=6)
+    coverage = run_btva_with_strategies(scheme, situation, collapse_equivalent=True, time_budget=0.0).coverage
+    exact = _exact(scheme, situation)
+
+    assert coverage.tactical_options_total.low <= exact.n_options <= coverage.tactical_options_total.high
+    assert coverage.avg_gain_all_options.low - 1e-9 <= exact.avg_gain <= coverage.avg_gain_all_options.high + 1e-9
+    # bullets and the oracle run regardless of the budget, so winner changes are exact
+    assert coverage.fraction_change_winner.exact
+    assert coverage.fraction_change_winner.low == exact.risk("fraction_change_winner")["overall"]
+    assert coverage.voters_evaluated == situation.n_voters - len(coverage.pending)
+
+
+def test_coverage_follows_happiness_metric() -> None:
+    situation = random_situation(1, m=6)
+    result = run_btva_with_strategies(VotingScheme.BORDA, situation, time_budget=0.0)
+    rescored = with_happiness_metric(situation, result, HappinessMetric.RANK_NORMALIZED)
+    assert rescored.coverage.pending == result.coverage.pending
+    assert rescored.coverage.avg_gain_all_options.high <= 1.0
+
+
+def test_risk_bounds_extremes() -> None:
+    count, mean = risk_bounds(2, 4.0, [(1, 10, 1.0, 5.0)])
+    assert (count.low, count.high) == (3, 12)
+    # lowest mean: 10 ballots of gain 1; highest: 10 ballots of gain 5
+    assert mean.low == pytest.approx((4.0 + 10 * 1.0) / 12)
+    assert mean.high == pytest.approx((4.0 + 10 * 5.0) / 12)
+
+    count, mean = risk_bounds(0, 0.0, [])
+    assert (count.low, count.high, mean.low, mean.high) == (0, 0, 0.0, 0.0)
+
+
+def test_pruned_walk_stops_at_deadline() -> None:
+    situation = random_situation(2, m=7)
+    outcome = tally_votes(VotingScheme.BORDA, situation)
+    targets = set(situation.alternatives)
+    walked = pruned_permutation_winners(
+        VotingScheme.BORDA, situation, 0, outcome.scores, targets, deadline=time.perf_counter() - 1.0,
+    )
+    assert list(walked) == []
+
+
+def test_cli_time_budget_prints_coverage(tmp_path, capsys) -> None:
+    content = "# 3 candidates\n=0 : [0]\n=1 : [1]\n=2 : [2]\n2:0>1>2\n1:1>2>0\n1:2>1>0\n"
+    p = tmp_path / "x.abif"
+    p.write_text(content, encoding="utf-8")
+
+    assert main([str(p), "--scheme", "borda", "--time-budget", "5"]) == 0
+    out = capsys.readouterr().out
+    assert "risk bounds (avg_gain_all_options)" in out
+    assert "(complete)" in out
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"workers": 2}, {"prune": True}, {"oracle": True}, {"incremental": True}, {"include_no_change": True},
+        {"aggregate": True}, {"table": True}, {"sampling": SamplingBudget(samples=10)}, {"max_m": 3},
+    ],
+)
+def test_time_budget_rejects_other_modes(kwargs: dict) -> None:
+    with pytest.raises(ValueError, match=f"time_budget cannot be combined with {next(iter(kwargs))}"):
+        run_btva_with_strategies(VotingScheme.BORDA, random_situation(0), time_budget=1.0, **kwargs)
+
+
+def test_aggregate_and_table_are_exclusive() -> None:
+    with pytest.raises(ValueError, match="aggregate=True and table=True"):
+        run_btva_with_strategies(VotingScheme.BORDA, random_situation(0), aggregate=True, table=True)
+
+
+@pytest.mark.parametrize("flags", [["--workers", "4"], ["--oracle"], ["--max-m", "3"]])
+def test_cli_time_budget_rejects_other_modes(tmp_path, capsys, flags: list[str]) -> None:
+    p = tmp_path / "x.abif"
+    p.write_text("# 3 candidates\n2:0>1>2\n1:1>2>0\n1:2>1>0\n", encoding="utf-8")
+    with pytest.raises(SystemExit) as exited:
+        main([str(p), "--scheme", "borda", "--time-budget", "5", *flags])
+    assert exited.value.code == 2
+    assert f"--time-budget cannot be combined with {flags[0]}" in capsys.readouterr().err
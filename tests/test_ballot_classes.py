@@ -0,0 +1,94 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from collections import Counter
+from math import comb, factorial
+
+import pytest
+
+from btva.analysis import compute_risk, run_btva_with_strategies
+from btva.cli import main
+from btva.enumeration import ballot_equivalence_classes, enumerate_all_permutations_options_for_voter
+from btva.models import VotingScheme, VotingSituation
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("A", "B", "C", "D"),
+        ("B", "C", "D", "A"),
+        ("C", "A", "D", "B"),
+        ("D", "B", "A", "C"),
+        ("A", "C", "B", "D"),
+    )
+)
+
+
+@pytest.mark.parametrize(
+    "scheme, n_classes",
+    [
+        (VotingScheme.PLURALITY, 4),
+        (VotingScheme.VOTE_FOR_TWO, comb(4, 2)),
+        (VotingScheme.ANTI_PLURALITY, 4),
+        (VotingScheme.BORDA, factorial(4)),
+    ],
+)
+def test_class_counts_and_sizes(scheme: VotingScheme, n_classes: int) -> None:
+    sincere = SITUATION.voters_preferences[1]
+    with_sincere = ballot_equivalence_classes(scheme, SITUATION.alternatives, sincere, include_no_change=True)
+    assert len(with_sincere) == n_classes
+    assert sum(size for _, size in with_sincere) == factorial(4)
+
+    without = ballot_equivalence_classes(scheme, SITUATION.alternatives, sincere)
+    assert sum(size for _, size in without) == factorial(4) - 1
+    assert sincere not in [ballot for ballot, _ in without]
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_collapsed_enumeration_matches_full(scheme: VotingScheme) -> None:
+    for voter in range(SITUATION.n_voters):
+        full = enumerate_all_permutations_options_for_voter(scheme, SITUATION, voter)
+        collapsed = enumerate_all_permutations_options_for_voter(scheme, SITUATION, voter, collapse_equivalent=True)
+
+        full_hist = Counter(opt.strategic_outcome for opt in full)
+        collapsed_hist: Counter[str] = Counter()
+        for opt in collapsed:
+            collapsed_hist[opt.strategic_outcome] += opt.multiplicity
+        assert collapsed_hist == full_hist
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("method", ["avg_gain_all_options", "fraction_change_winner"])
+def test_compute_risk_unchanged(scheme: VotingScheme, method: str) -> None:
+    full = run_btva_with_strategies(scheme, SITUATION).strategic_options
+    collapsed = run_btva_with_strategies(scheme, SITUATION, collapse_equivalent=True).strategic_options
+    assert compute_risk(collapsed, method=method) == compute_risk(full, method=method)
+
+
+def test_max_m_only_limits_borda_when_collapsed() -> None:
+    prefs = tuple("ABCDEFGHIJ")
+    situation = VotingSituation(voters_preferences=(prefs, prefs[::-1], prefs[1:] + prefs[:1]))
+
+    plurality = run_btva_with_strategies(VotingScheme.PLURALITY, situation, collapse_equivalent=True)
+    kinds = {opt.strategy_kind for opts in plurality.strategic_options.values() for opt in opts}
+    assert kinds == {"compromising_burying"}
+    assert sum(opt.multiplicity for opt in plurality.strategic_options[0]) == factorial(10) - 1
+
+    borda = run_btva_with_strategies(VotingScheme.BORDA, situation, collapse_equivalent=True)
+    kinds = {opt.strategy_kind for opts in borda.strategic_options.values() for opt in opts}
+    assert kinds == {"bullet"}
+
+
+def test_cli_lists_every_permutation_unless_collapsing(tmp_path, capsys) -> None:
+    p = tmp_path / "x.abif"
+    p.write_text("# 4 candidates\n1:0>1>2>3\n1:1>2>3>0\n1:2>0>3>1\n1:3>1>0>2\n", encoding="utf-8")
+
+    assert main([str(p), "--scheme", "plurality"]) == 0
+    full = capsys.readouterr().out
+    assert main([str(p), "--scheme", "plurality", "--collapse-equivalent"]) == 0
+    collapsed = capsys.readouterr().out
+
+    assert "equivalent ballots" not in full
+    assert "equivalent ballots" in collapsed
+    assert full.count("kind=compromising_burying") > collapsed.count("kind=compromising_burying")
+    # counts and risk do not depend on the listing
+    summary = lambda out: [line for line in out.splitlines() if line.startswith(("S_", "risk"))]
+    assert summary(full) == summary(collapsed)
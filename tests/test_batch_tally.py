@@ -0,0 +1,59 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from btva.batch import tally_votes_batch
+from btva.enumeration import enumerate_all_permutations_options_for_voter
+from btva.models import VotingScheme, VotingSituation
+from btva.strategies import StrategicBallot
+from btva.voting import tally_votes_strategic
+
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("B", "A", "C", "D"),
+        ("C", "D", "A", "B"),
+        ("A", "B", "D", "C"),
+        ("D", "C", "B", "A"),
+        ("B", "D", "C", "A"),
+    )
+)
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_batch_matches_one_by_one_tally(scheme: VotingScheme) -> None:
+    ballots = list(itertools.permutations(("A", "B", "C", "D")))
+    batch = tally_votes_batch(scheme, SITUATION, 2, ballots)
+
+    assert batch.scores.shape == (24, 4)
+    for b, ballot in enumerate(ballots):
+        single = tally_votes_strategic(
+            scheme,
+            SITUATION,
+            overrides={2: StrategicBallot(voter_index=2, kind="compromising_burying", preferences=ballot)},
+        )
+        assert dict(zip(batch.alternatives, batch.scores[b].tolist())) == single.scores
+        assert batch.winner_names[b] == single.winner
+
+
+def test_batch_accepts_id_arrays() -> None:
+    # ids refer to the lexicographically sorted alternatives A, B, C, D
+    ids = np.array([[3, 2, 1, 0], [0, 1, 2, 3]])
+    batch = tally_votes_batch(VotingScheme.PLURALITY, SITUATION, 0, ids)
+
+    # voter 0 moves its first place from B to D (ballot 0) or to A (ballot 1); ties go to the smallest id
+    assert batch.scores.tolist() == [[1, 1, 1, 2], [2, 1, 1, 1]]
+    assert batch.winner_names == ["D", "A"]
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_vectorized_enumeration_is_identical(scheme: VotingScheme) -> None:
+    for voter in range(SITUATION.n_voters):
+        assert enumerate_all_permutations_options_for_voter(
+            scheme, SITUATION, voter, vectorized=True
+        ) == enumerate_all_permutations_options_for_voter(scheme, SITUATION, voter, vectorized=False)
@@ -0,0 +1,62 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+
+import pytest
+
+from btva.enumeration_bullet import bullet_outcome_histograms, bullet_winner_matrix, bullet_winners
+from btva.models import VotingScheme, VotingSituation
+from btva.strategic_options import voter_groups
+from btva.voting import tally_votes, tally_votes_delta
+from conftest import random_situation
+
+BULLET_SCHEMES = [s for s in VotingScheme if s != VotingScheme.PLURALITY]
+
+
+@pytest.mark.parametrize("scheme", BULLET_SCHEMES)
+@pytest.mark.parametrize("seed", range(6))
+def test_closed_form_matches_full_tally(scheme: VotingScheme, seed: int) -> None:
+    situation = random_situation(seed, n=3 + seed, m=3 + seed % 4)
+    baseline = tally_votes(scheme, situation)
+    for voter in range(situation.n_voters):
+        got = list(bullet_winners(scheme, situation, voter, baseline))
+        assert [b[0] for b, _ in got] == list(situation.alternatives)
+        for ballot, winner in got:
+            expected = tally_votes_delta(
+                scheme, situation, baseline.scores, bullet_choice_by_voter={voter: ballot[0]}
+            )
+            assert winner == expected.winner
+
+
+def test_ties_go_to_the_smaller_name() -> None:
+    # a bullet for A from voter 0 leaves A and C tied on 3 points
+    situation = VotingSituation(voters_preferences=(("A", "B", "C"), ("B", "C", "A"), ("C", "A", "B")))
+    baseline = tally_votes(VotingScheme.BORDA, situation)
+    winners = dict((b[0], w) for b, w in bullet_winners(VotingScheme.BORDA, situation, 0, baseline))
+    for chosen, winner in winners.items():
+        expected = tally_votes_delta(VotingScheme.BORDA, situation, baseline.scores, bullet_choice_by_voter={0: chosen})
+        assert winner == expected.winner
+
+
+def test_plurality_has_no_bullet_deviation() -> None:
+    situation = random_situation(0, n=9)
+    baseline = tally_votes(VotingScheme.PLURALITY, situation)
+    assert list(bullet_winners(VotingScheme.PLURALITY, situation, 0, baseline)) == []
+
+
+@pytest.mark.parametrize("scheme", BULLET_SCHEMES)
+def test_winner_matrix_matches_per_voter_path(scheme: VotingScheme) -> None:
+    pytest.importorskip("numpy")
+    situation = random_situation(11, n=12, m=6)
+    baseline = tally_votes(scheme, situation)
+    names = sorted(situation.alternatives)
+    matrix = bullet_winner_matrix(scheme, situation)
+    groups = voter_groups(situation)
+    assert matrix.shape == (len(groups), situation.m_alternatives)
+    for g, voters in enumerate(groups):
+        by_choice = {b[0]: w for b, w in bullet_winners(scheme, situation, voters[0], baseline)}
+        assert [names[w] for w in matrix[g].tolist()] == [by_choice[a] for a in names]
+
+    histograms = bullet_outcome_histograms(scheme, situation)
+    for voter in range(situation.n_voters):
+        assert sum(histograms[voter].values()) == situation.m_alternatives
@@ -0,0 +1,101 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from btva.corpus import build_corpus, is_corpus_file, load_corpus, main
+from btva.experiments import _iter_scenario_files
+from btva.parsing import load_input_file
+
+
+_SCENARIOS = {
+    "a_small.abif": "# 3 candidates\n=0 : [0]\n=1 : [1]\n=2 : [2]\n2:0>1>2\n1:2\n3:1>0>2\n1:0>1>2\n",
+    "b_small.abif": "# 4 candidates\n1:3>2>1>0\n2:0>1>2>3\n1:1>0>3>2\n",
+    "c_broken.abif": "# 3 candidates\n1:0>1>3\n",
+    "d_small.abif": "# 3 candidates\n1:0>1>2\n1:1>2>0\n1:2>0>1\n",
+}
+
+
+@pytest.fixture()
+def scenarios(tmp_path: Path) -> Path:
+    d = tmp_path / "scenarios"
+    d.mkdir()
+    for name, content in _SCENARIOS.items():
+        (d / name).write_text(content, encoding="utf-8")
+    return d
+
+
+def test_corpus_loads_match_files(scenarios: Path, tmp_path: Path) -> None:
+    files = sorted(scenarios.glob("*.abif"))
+    out = build_corpus(files, tmp_path / "x.corpus")
+    assert is_corpus_file(out) and not is_corpus_file(files[0])
+
+    with load_corpus(out) as corpus:
+        assert corpus.names == tuple(p.name for p in files)
+        for p in files:
+            if p.name == "c_broken.abif":
+                with pytest.raises(ValueError) as packed:
+                    corpus.load(p.name)
+                with pytest.raises(ValueError) as direct:
+                    load_input_file(p)
+                assert str(packed.value) == str(direct.value)
+                assert corpus.entry(p.name).error == str(direct.value)
+                continue
+            parsed = corpus.load(p.name)
+            expected = load_input_file(p)
+            assert parsed.situation == expected.situation
+            assert parsed.profile == expected.profile
+            assert corpus.entry(p.name).n_voters == expected.situation.n_voters
+            assert corpus.entry(p.name).m_alternatives == expected.situation.m_alternatives
+
+
+def test_corpus_rank_matrix_matches_file(scenarios: Path, tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    from btva.parsing import load_rank_matrix
+
+    path = scenarios / "b_small.abif"
+    with load_corpus(build_corpus([path], tmp_path / "x.corpus")) as corpus:
+        got = corpus.rank_matrix(path.name)
+    expected = load_rank_matrix(path)
+    assert got.candidates == expected.candidates
+    assert got.to_situation() == expected.to_situation()
+
+
+
+def test_close_with_loaded_scenarios_still_referenced(scenarios: Path, tmp_path: Path) -> None:
+    path = scenarios / "a_small.abif"
+    corpus = load_corpus(build_corpus([path], tmp_path / "x.corpus"))
+    with corpus:
+        parsed = corpus.load(path.name)
+        read = corpus.ballots(path.name)
+        situation = corpus.situation(path.name)
+    # nothing handed out references the map, so closing succeeds and the results stay usable
+    corpus.close()
+    expected = load_input_file(path)
+    assert parsed.situation == situation == expected.situation
+    assert parsed.profile == expected.profile
+    assert read.voter_types() == expected.profile.voter_types
+
+
+def test_iter_scenario_files_accepts_corpus(scenarios: Path, tmp_path: Path) -> None:
+    out = build_corpus(sorted(scenarios.glob("*.abif")), tmp_path / "x.corpus")
+    kwargs = dict(include_globs=["*_small.abif"], exclude_prefixes=("d_",))
+
+    from_dir = _iter_scenario_files(scenarios, **kwargs)
+    from_corpus = _iter_scenario_files(out, **kwargs)
+    assert [s.name for s in from_corpus] == [p.name for p in from_dir] == ["a_small.abif", "b_small.abif"]
+    assert from_corpus[0].load().situation == load_input_file(from_dir[0]).situation
+
+
+def test_empty_corpus(tmp_path: Path) -> None:
+    with load_corpus(build_corpus([], tmp_path / "empty.corpus")) as corpus:
+        assert len(corpus) == 0 and corpus.scenarios() == []
+
+
+def test_cli_builds_corpus(scenarios: Path, tmp_path: Path, capsys) -> None:
+    out = tmp_path / "cli.corpus"
+    assert main(["--scenarios-dir", str(scenarios), "--out", str(out)]) == 0
+    assert "packed 4 scenarios (1 failing)" in capsys.readouterr().out
+    assert "c_broken.abif" in load_corpus(out)
@@ -0,0 +1,72 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import pytest
+
+from btva import enumeration
+from btva.enumeration import enumerate_all_permutations_options, enumerate_all_permutations_options_for_voter
+from btva.enumeration_bullet import enumerate_bullet_options, enumerate_bullet_options_for_voter
+from btva.models import VotingScheme, VotingSituation
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("A", "B", "C", "D"),
+        ("B", "C", "D", "A"),
+        ("A", "B", "C", "D"),
+        ("C", "A", "D", "B"),
+        ("B", "C", "D", "A"),
+        ("A", "B", "C", "D"),
+    )
+)
+
+
+def test_voters_by_ballot_groups_in_first_appearance_order() -> None:
+    assert SITUATION.voters_by_ballot == ((0, 2, 5), (1, 4), (3,))
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_memoized_enumeration_matches_per_voter(scheme: VotingScheme) -> None:
+    perms = enumerate_all_permutations_options(scheme, SITUATION)
+    bullets = enumerate_bullet_options(scheme, SITUATION)
+    assert list(perms) == list(range(SITUATION.n_voters))
+    for voter in range(SITUATION.n_voters):
+        assert perms[voter] == enumerate_all_permutations_options_for_voter(scheme, SITUATION, voter)
+        assert bullets[voter] == enumerate_bullet_options_for_voter(scheme, SITUATION, voter)
+        assert all(opt.tactical_ballot.voter_index == voter for opt in perms[voter])
+
+
+def test_each_distinct_ballot_is_enumerated_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+    original = enumeration.enumerate_all_permutations_options_for_voter
+
+    def counting(scheme, situation, voter_index, **kwargs):
+        calls.append(voter_index)
+        return original(scheme, situation, voter_index, **kwargs)
+
+    monkeypatch.setattr(enumeration, "enumerate_all_permutations_options_for_voter", counting)
+    enumerate_all_permutations_options(VotingScheme.BORDA, SITUATION)
+    assert calls == [0, 1, 3]
+
+
+def test_rank_matrix_groups_like_the_situation() -> None:
+    pytest.importorskip("numpy")
+    from btva.rank_matrix import RankMatrix
+
+    assert RankMatrix.from_situation(SITUATION).voters_by_ballot == SITUATION.voters_by_ballot
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"aggregate": True}, {"prune": True}, {"oracle": True, "max_m": 3}, {"collapse_equivalent": True}, {"workers": 2}],
+)
+def test_strategies_run_on_a_rank_matrix(scheme: VotingScheme, kwargs: dict) -> None:
+    pytest.importorskip("numpy")
+    from btva.analysis import run_btva_with_strategies
+    from btva.rank_matrix import RankMatrix
+
+    got = run_btva_with_strategies(scheme, RankMatrix.from_situation(SITUATION), **kwargs)
+    expected = run_btva_with_strategies(scheme, SITUATION, **kwargs)
+    assert got.outcome == expected.outcome
+    assert got.strategic_options == expected.strategic_options
+    assert got.aggregates == expected.aggregates
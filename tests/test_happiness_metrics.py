@@ -0,0 +1,108 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from dataclasses import asdict, replace
+
+import pytest
+
+import atva.experiments as atva_experiments
+from btva.analysis import rescore_option, run_btva_with_strategies, with_happiness_metric
+from btva.cli import main
+from btva.experiments import run_experiments
+from btva.happiness import HappinessMetric
+from btva.models import VotingScheme, VotingSituation
+from conftest import random_situation
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_aggregates_for_another_metric_match_a_fresh_run(scheme: VotingScheme) -> None:
+    situation = random_situation(1)
+    borda = run_btva_with_strategies(scheme, situation, collapse_equivalent=True, prune=True, aggregate=True)
+    fresh = run_btva_with_strategies(
+        scheme, situation,
+        collapse_equivalent=True, prune=True, aggregate=True, happiness_metric=HappinessMetric.RANK_NORMALIZED,
+    )
+    derived = with_happiness_metric(situation, borda, HappinessMetric.RANK_NORMALIZED)
+    assert derived.happiness == fresh.happiness
+    assert derived.aggregates == fresh.aggregates
+
+
+def test_options_for_another_metric_match_a_fresh_run() -> None:
+    situation = random_situation(2)
+    borda = run_btva_with_strategies(VotingScheme.BORDA, situation)
+    fresh = run_btva_with_strategies(VotingScheme.BORDA, situation, happiness_metric=HappinessMetric.RANK_NORMALIZED)
+    derived = with_happiness_metric(situation, borda, HappinessMetric.RANK_NORMALIZED)
+    assert derived.strategic_options == fresh.strategic_options
+    opt = borda.strategic_options[0][0]
+    assert rescore_option(situation, opt, HappinessMetric.BORDA) == opt
+
+
+def test_table_for_another_metric_matches_a_fresh_run() -> None:
+    np = pytest.importorskip("numpy")
+    situation = random_situation(3)
+    borda = run_btva_with_strategies(VotingScheme.BORDA, situation, table=True)
+    fresh = run_btva_with_strategies(
+        VotingScheme.BORDA, situation, table=True, happiness_metric=HappinessMetric.RANK_NORMALIZED,
+    )
+    derived = with_happiness_metric(situation, borda, HappinessMetric.RANK_NORMALIZED).option_table
+    for column in ("voter", "winner", "ballot", "H_i", "H_tilde_i", "H", "H_tilde"):
+        assert np.array_equal(getattr(derived, column), getattr(fresh.option_table, column))
+
+
+def _write_abif(tmp_path, situation: VotingSituation):
+    names = {a: str(k) for k, a in enumerate(sorted(situation.alternatives))}
+    lines = [f"# {situation.m_alternatives} candidates"]
+    lines += [f"1:{'>'.join(names[a] for a in ballot)}" for ballot in situation.voters_preferences]
+    path = tmp_path / "poll.abif"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_experiments_emit_one_row_set_per_metric(tmp_path) -> None:
+    path = _write_abif(tmp_path, random_situation(4))
+    metrics = [HappinessMetric.BORDA, HappinessMetric.RANK_NORMALIZED]
+    both = run_experiments(scenario_files=[path], schemes=list(VotingScheme), happiness_metrics=metrics)
+    assert [(r.scheme, r.happiness_metric) for r in both] == [(s.value, h.value) for s in VotingScheme for h in metrics]
+    for metric in metrics:
+        single = run_experiments(scenario_files=[path], schemes=list(VotingScheme), happiness_metric=metric)
+        picked = [r for r in both if r.happiness_metric == metric.value]
+        assert [replace(r, time_seconds=0.0) for r in picked] == [replace(r, time_seconds=0.0) for r in single]
+
+
+def test_atva_runs_each_variant_once_for_every_metric(tmp_path, monkeypatch) -> None:
+    path = _write_abif(tmp_path, random_situation(6, n=5, m=4))
+    metrics = [HappinessMetric.BORDA, HappinessMetric.RANK_NORMALIZED]
+    schemes = [VotingScheme.BORDA, VotingScheme.PLURALITY]
+    calls: list[HappinessMetric] = []
+    original = atva_experiments.run_atva1
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs["happiness_metric"])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(atva_experiments, "run_atva1", counting)
+    both = atva_experiments.run_atva_experiments(scenario_files=[path], schemes=schemes, happiness_metrics=metrics)
+    assert calls == [HappinessMetric.BORDA] * len(schemes)
+    assert [(r.scheme, r.variant, r.happiness_metric) for r in both] == [
+        (s.value, v, h.value) for s in schemes for v in ("atva1", "atva2", "atva3", "atva4") for h in metrics
+    ]
+
+    single = atva_experiments.run_atva_experiments(
+        scenario_files=[path], schemes=schemes, happiness_metric=HappinessMetric.RANK_NORMALIZED,
+    )
+    derived = [r for r in both if r.happiness_metric == HappinessMetric.RANK_NORMALIZED.value]
+    for got, expected in zip(derived, single):
+        assert asdict(replace(got, time_seconds=0.0)) == pytest.approx(asdict(replace(expected, time_seconds=0.0)))
+
+
+def test_cli_reports_every_metric(tmp_path, capsys) -> None:
+    path = _write_abif(tmp_path, random_situation(5))
+    assert main([str(path), "--scheme", "borda", "--happiness-metric", "rank_normalized"]) == 0
+    alone = capsys.readouterr().out
+    assert main([str(path), "--scheme", "borda", "--happiness-metric", "borda", "--happiness-metric", "rank_normalized"]) == 0
+    both = capsys.readouterr().out
+    assert both.count("happiness_metric:") == 2
+    assert both.count("risk (") == 2
+    block = alone[alone.index("happiness_metric:"):]
+    block = "\n".join(line for line in block.splitlines() if not line[:1].isdigit())
+    assert both.endswith(block + "\n")
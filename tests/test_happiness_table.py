@@ -0,0 +1,60 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import pytest
+
+from btva.enumeration import enumerate_all_permutations_options_for_voter
+from btva.happiness import (
+    HappinessMetric,
+    borda_happiness_for_outcome,
+    happiness_for_outcome,
+    happiness_table,
+)
+from btva.models import VotingScheme, VotingSituation
+
+
+def _situation() -> VotingSituation:
+    return VotingSituation(
+        voters_preferences=(
+            ("A", "B", "C"),
+            ("B", "C", "A"),
+            ("C", "A", "B"),
+        )
+    )
+
+
+def test_happiness_results_are_shared_per_winner() -> None:
+    situation = _situation()
+
+    first = happiness_for_outcome(situation, "B")
+    assert happiness_for_outcome(situation, "B") is first
+    assert first == borda_happiness_for_outcome(situation, "B")
+
+    # metrics get separate tables
+    normalized = happiness_for_outcome(situation, "B", metric=HappinessMetric.RANK_NORMALIZED)
+    assert normalized.per_voter == (0.5, 1.0, 0.0)
+    assert happiness_table(situation, "rank_normalized") is happiness_table(situation, HappinessMetric.RANK_NORMALIZED)
+
+
+def test_happiness_table_matrix() -> None:
+    table = happiness_table(_situation())
+    # rows are voters, columns A, B, C
+    assert table.per_voter_matrix() == (
+        (2.0, 1.0, 0.0),
+        (0.0, 2.0, 1.0),
+        (1.0, 0.0, 2.0),
+    )
+
+
+def test_enumerated_options_share_happiness_objects() -> None:
+    situation = _situation()
+    opts = enumerate_all_permutations_options_for_voter(VotingScheme.BORDA, situation, 0)
+
+    by_winner = {}
+    for opt in opts:
+        assert by_winner.setdefault(opt.strategic_outcome, opt.strategic_happiness) is opt.strategic_happiness
+
+
+def test_invalid_outcome_still_rejected() -> None:
+    with pytest.raises(ValueError):
+        happiness_for_outcome(_situation(), "Z")
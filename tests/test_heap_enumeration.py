@@ -0,0 +1,35 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import itertools
+from math import factorial
+
+import pytest
+
+from btva.enumeration import enumerate_all_permutations_options_for_voter, heap_permutation_winners
+from btva.models import VotingScheme
+from btva.voting import tally_votes
+from conftest import random_situation
+
+
+def test_heap_walk_visits_every_permutation_once() -> None:
+    situation = random_situation(0, n=6)
+    baseline = tally_votes(VotingScheme.BORDA, situation).scores
+    walked = [b for b, _ in heap_permutation_winners(VotingScheme.BORDA, situation, 0, baseline, include_no_change=True)]
+    assert len(walked) == factorial(5)
+    assert set(walked) == set(itertools.permutations(situation.alternatives))
+
+    # consecutive ballots differ by exactly one swap
+    for prev, cur in zip(walked, walked[1:]):
+        assert sum(1 for x, y in zip(prev, cur) if x != y) == 2
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_matches_full_enumeration(scheme: VotingScheme, seed: int) -> None:
+    situation = random_situation(seed, n=6)
+    for voter in range(situation.n_voters):
+        full = enumerate_all_permutations_options_for_voter(scheme, situation, voter, vectorized=False)
+        walked = enumerate_all_permutations_options_for_voter(scheme, situation, voter, incremental=True)
+        assert len(walked) == len(full)
+        assert set(walked) == set(full)
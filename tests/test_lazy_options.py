@@ -0,0 +1,83 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from btva import enumeration
+from btva.cli import main
+from btva.enumeration import enumerate_all_permutations_options_for_voter, iter_permutation_options
+from btva.enumeration_bullet import enumerate_bullet_options_for_voter, iter_bullet_options
+from btva.models import VotingScheme
+from conftest import random_situation
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_generators_yield_the_tactical_options(scheme: VotingScheme) -> None:
+    situation = random_situation(2)
+    for voter in range(situation.n_voters):
+        perms = enumerate_all_permutations_options_for_voter(scheme, situation, voter)
+        bullets = enumerate_bullet_options_for_voter(scheme, situation, voter)
+        assert list(iter_permutation_options(scheme, situation, voter)) == [o for o in perms if o.H_tilde_i > o.H_i]
+        assert list(iter_bullet_options(scheme, situation, voter)) == [o for o in bullets if o.H_tilde_i > o.H_i]
+
+
+def test_generator_builds_only_what_is_consumed(monkeypatch: pytest.MonkeyPatch) -> None:
+    built: list[object] = []
+    original = enumeration.StrategicOption
+
+    def counting(**kwargs):
+        built.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(enumeration, "StrategicOption", counting)
+    situation = random_situation(1, n=3, m=6)
+    voter = 1
+    assert len(enumerate_all_permutations_options_for_voter(VotingScheme.BORDA, situation, voter, prune=True)) == 240
+    built.clear()
+
+    first_two = list(itertools.islice(iter_permutation_options(VotingScheme.BORDA, situation, voter), 2))
+    assert len(first_two) == 2
+    assert len(built) == 2
+
+
+def test_cli_strategy_limit(tmp_path, capsys) -> None:
+    p = tmp_path / "t.abif"
+    p.write_text(
+        "# 4 candidates\n=0 : [0]\n=1 : [1]\n=2 : [2]\n=3 : [3]\n"
+        "1:0>1>2>3\n1:1>2>3>0\n1:2>0>3>1\n1:3>1>0>2\n1:1>0>2>3\n",
+        encoding="utf-8",
+    )
+    assert main([str(p), "--scheme", "borda", "--strategy-limit", "1"]) == 0
+    out = capsys.readouterr().out
+    headers = [line for line in out.splitlines() if line.startswith("S_")]
+    shown = [line for line in out.splitlines() if line.startswith("  s_")]
+    assert len(headers) == 5
+    assert len(shown) <= 5
+    assert all(",0:" in line for line in shown)
+
+
+@pytest.mark.parametrize("limit", ["-1", "2"])
+def test_cli_enumerates_each_sincere_ballot_once(tmp_path, capsys, monkeypatch: pytest.MonkeyPatch, limit: str) -> None:
+    p = tmp_path / "t.abif"
+    p.write_text(
+        "# 4 candidates\n=0 : [0]\n=1 : [1]\n=2 : [2]\n=3 : [3]\n"
+        "1:0>1>2>3\n1:1>2>3>0\n1:0>1>2>3\n1:2>0>3>1\n1:1>2>3>0\n",
+        encoding="utf-8",
+    )
+    assert main([str(p), "--scheme", "borda", "--strategy-limit", limit]) == 0
+    expected = capsys.readouterr().out
+
+    walked: list[int] = []
+    original = enumeration.permutation_winners
+
+    def counting(scheme, situation, voter_index, *args, **kwargs):
+        walked.append(voter_index)
+        return original(scheme, situation, voter_index, *args, **kwargs)
+
+    monkeypatch.setattr(enumeration, "permutation_winners", counting)
+    assert main([str(p), "--scheme", "borda", "--strategy-limit", limit]) == 0
+    assert capsys.readouterr().out == expected
+    # without a limit the listing pass is the only enumeration; with one, the lazy walk adds one per ballot type
+    assert len(walked) == (3 if limit == "-1" else 6)
@@ -0,0 +1,103 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import itertools
+from collections import Counter
+
+import pytest
+
+from btva.analysis import run_btva_multi_scheme, run_btva_with_strategies
+from btva.enumeration import pruned_permutation_winners
+from btva.enumeration_fused import fused_permutation_winners, scoring_rules
+from btva.models import VotingScheme
+from btva.voting import scoring_vector, tally_votes
+from conftest import random_situation
+
+
+def _winner(scores: dict[str, int]) -> str:
+    best = max(scores.values())
+    return min(a for a, s in scores.items() if s == best)
+
+
+@pytest.mark.parametrize("prune", [False, True])
+@pytest.mark.parametrize("include_no_change", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_one_result_per_scheme_matches_separate_runs(prune: bool, include_no_change: bool, seed: int) -> None:
+    situation = random_situation(seed)
+    fused = run_btva_multi_scheme(situation, list(VotingScheme), prune=prune, include_no_change=include_no_change)
+    assert list(fused) == list(VotingScheme)
+    for scheme in VotingScheme:
+        separate = run_btva_with_strategies(
+            scheme, situation,
+            collapse_equivalent=True, prune=prune, include_no_change=include_no_change, aggregate=True,
+        )
+        assert fused[scheme].outcome == separate.outcome
+        assert fused[scheme].happiness == separate.happiness
+        assert fused[scheme].aggregates == separate.aggregates
+
+
+def test_borda_is_bullet_only_above_max_m() -> None:
+    situation = random_situation(4, m=5)
+    fused = run_btva_multi_scheme(situation, list(VotingScheme), max_m=4, prune=True)
+    separate = run_btva_with_strategies(VotingScheme.BORDA, situation, max_m=4, collapse_equivalent=True, aggregate=True)
+    assert fused[VotingScheme.BORDA].aggregates == separate.aggregates
+    assert all(set(agg.outcome_counts) <= {"bullet"} for agg in fused[VotingScheme.BORDA].aggregates.values())
+
+
+def test_custom_vector_counts_every_ballot() -> None:
+    situation = random_situation(5, n=5, m=4)
+    vec = [3, 1, 1, 0]
+    result = run_btva_multi_scheme(situation, [VotingScheme.BORDA], custom_vectors={"custom": vec})["custom"]
+
+    baseline = {a: 0 for a in situation.alternatives}
+    for ballot in situation.voters_preferences:
+        for pos, a in enumerate(ballot):
+            baseline[a] += vec[pos]
+    assert result.outcome.scores == baseline
+    assert result.outcome.winner == _winner(baseline)
+
+    for i, sincere in enumerate(situation.voters_preferences):
+        others = dict(baseline)
+        for pos, a in enumerate(sincere):
+            others[a] -= vec[pos]
+        expected: Counter[str] = Counter()
+        for perm in itertools.permutations(situation.alternatives):
+            if perm == sincere:
+                continue
+            scores = dict(others)
+            for pos, a in enumerate(perm):
+                scores[a] += vec[pos]
+            expected[_winner(scores)] += 1
+        assert result.aggregates[i].outcome_counts["compromising_burying"] == dict(expected)
+
+
+def test_custom_copy_of_borda_matches_borda() -> None:
+    situation = random_situation(6)
+    results = run_btva_multi_scheme(
+        situation, [VotingScheme.BORDA], custom_vectors={"my_borda": scoring_vector(VotingScheme.BORDA, 5)}, prune=True,
+    )
+    assert results["my_borda"].aggregates == results[VotingScheme.BORDA].aggregates
+
+
+def test_fused_walk_matches_single_scheme_walk() -> None:
+    situation = random_situation(7, m=6)
+    borda = tally_votes(VotingScheme.BORDA, situation)
+    v42 = tally_votes(VotingScheme.VOTE_FOR_TWO, situation)
+    for voter in range(situation.n_voters):
+        sincere = situation.sincere_ballot(voter)
+        targets = [set(sincere[:sincere.index(o.winner)]) for o in (borda, v42)]
+        fused = list(fused_permutation_winners(
+            [scoring_vector(VotingScheme.BORDA, 6), scoring_vector(VotingScheme.VOTE_FOR_TWO, 6)],
+            situation, voter, [borda.scores, v42.scores], targets,
+        ))
+        single = list(pruned_permutation_winners(VotingScheme.BORDA, situation, voter, borda.scores, set(targets[0])))
+        assert [(b, w[0]) for b, w in fused if w[0] is not None] == single
+
+
+def test_bad_custom_vectors_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        scoring_rules([VotingScheme.BORDA], 4, {"short": [1, 0, 0]})
+    with pytest.raises(ValueError):
+        scoring_rules([VotingScheme.BORDA], 4, {"rising": [0, 1, 2, 3]})
+    with pytest.raises(ValueError):
+        scoring_rules([VotingScheme.BORDA], 4, {"borda": [3, 2, 1, 0]})
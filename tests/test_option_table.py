@@ -0,0 +1,63 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from btva.analysis import compute_risk, run_btva_with_strategies
+from btva.models import VotingScheme
+from btva.option_table import STRATEGY_KINDS, lehmer_decode, lehmer_encode
+from conftest import random_situation
+
+
+def test_lehmer_codes_rank_permutations_lexicographically() -> None:
+    perms = list(itertools.permutations(range(5)))
+    codes = lehmer_encode(np.array(perms))
+    assert codes.tolist() == list(range(len(perms)))
+    assert all(tuple(lehmer_decode(c, 5)) == p for c, p in zip(codes.tolist(), perms))
+
+    big = np.array([list(range(25))[::-1]])
+    assert lehmer_decode(int(lehmer_encode(big)[0]), 25) == list(range(25))[::-1]
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_table_rows_rebuild_the_options(scheme: VotingScheme) -> None:
+    situation = random_situation(1, n=6, m=4)
+    options = run_btva_with_strategies(scheme, situation).strategic_options
+    table = run_btva_with_strategies(scheme, situation, table=True).option_table
+
+    assert len(table) == sum(len(opts) for opts in options.values())
+    assert table.to_options() == options
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("method", ["avg_gain_all_options", "fraction_change_winner"])
+def test_compute_risk_on_table_matches_options(scheme: VotingScheme, method: str) -> None:
+    situation = random_situation(2, n=6, m=4)
+    options = run_btva_with_strategies(scheme, situation).strategic_options
+    table = run_btva_with_strategies(scheme, situation, table=True).option_table
+
+    tactical = {i: [o for o in opts if o.H_tilde_i > o.H_i] for i, opts in options.items()}
+    assert compute_risk(table.tactical(), method=method) == compute_risk(tactical, method=method)
+    assert compute_risk(table, method=method) == compute_risk(options, method=method)
+
+
+def test_filter_and_group_by() -> None:
+    situation = random_situation(3, n=6, m=4)
+    table = run_btva_with_strategies(VotingScheme.BORDA, situation, table=True).option_table
+
+    by_voter = table.group_by("voter")
+    assert sum(len(t) for t in by_voter.values()) == len(table)
+    assert all((t.voter == v).all() for v, t in by_voter.items())
+
+    by_kind = table.group_by("kind")
+    assert {STRATEGY_KINDS[k] for k in by_kind} == {"bullet", "compromising_burying"}
+
+    tactical = table.tactical()
+    assert (tactical.H_tilde_i > tactical.H_i).all()
+    for k in range(len(tactical)):
+        opt = tactical.row(k)
+        assert opt.H_tilde_i > opt.H_i
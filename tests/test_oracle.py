@@ -0,0 +1,84 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+from btva.analysis import compute_risk, oracle_fraction_change_winner, run_btva_with_strategies
+from btva.models import VotingScheme, VotingSituation
+from btva.oracle import manipulation_oracle, manipulation_witness
+from btva.strategies import StrategicBallot
+from btva.voting import tally_votes_strategic
+
+
+def _random_situation(rng: random.Random, n: int, m: int) -> VotingSituation:
+    alts = [chr(ord("A") + k) for k in range(m)]
+    return VotingSituation(voters_preferences=tuple(tuple(rng.sample(alts, m)) for _ in range(n)))
+
+
+def _winner(scheme: VotingScheme, situation: VotingSituation, voter: int, ballot: tuple[str, ...]) -> str:
+    override = StrategicBallot(voter_index=voter, kind="compromising_burying", preferences=ballot)
+    return tally_votes_strategic(scheme, situation, overrides={voter: override}).winner
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_oracle_matches_brute_force(scheme: VotingScheme) -> None:
+    rng = random.Random(7)
+    for _ in range(20):
+        situation = _random_situation(rng, n=rng.randint(3, 6), m=rng.randint(3, 5))
+        oracle = manipulation_oracle(scheme, situation)
+        for voter in range(situation.n_voters):
+            reachable = {
+                _winner(scheme, situation, voter, perm)
+                for perm in itertools.permutations(situation.alternatives)
+            }
+            assert {c for c, w in oracle[voter].items() if w is not None} == reachable
+            for target, witness in oracle[voter].items():
+                if witness is not None:
+                    assert witness[0] == target
+                    assert _winner(scheme, situation, voter, witness) == target
+
+
+def test_witness_respects_tie_break() -> None:
+    # without voter 0: A=1, B=1, C=1 under plurality; voter 0 decides
+    situation = VotingSituation(
+        voters_preferences=(
+            ("C", "B", "A"),
+            ("A", "B", "C"),
+            ("B", "C", "A"),
+            ("C", "A", "B"),
+        )
+    )
+    assert manipulation_witness(VotingScheme.PLURALITY, situation, 0, "B") == ("B", "C", "A")
+    # under anti-plurality the others give A=2, B=2, C=2; B can only win by burying A
+    assert manipulation_witness(VotingScheme.ANTI_PLURALITY, situation, 0, "B") == ("B", "C", "A")
+    with pytest.raises(ValueError):
+        manipulation_witness(VotingScheme.PLURALITY, situation, 0, "Z")
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_oracle_fraction_change_winner_matches_enumeration(scheme: VotingScheme) -> None:
+    rng = random.Random(11)
+    for _ in range(5):
+        situation = _random_situation(rng, n=6, m=4)
+        result = run_btva_with_strategies(scheme, situation)
+        tactical = {i: [o for o in opts if o.H_tilde_i > o.H_i] for i, opts in result.strategic_options.items()}
+        expected = compute_risk(tactical, method="fraction_change_winner")
+        got = oracle_fraction_change_winner(scheme, situation)
+        assert got["overall"] == expected["overall"]
+        assert got["by_strategy_kind"] == expected["by_strategy_kind"]
+
+
+def test_run_btva_with_strategies_uses_oracle_above_max_m() -> None:
+    situation = _random_situation(random.Random(3), n=7, m=12)
+    without = run_btva_with_strategies(VotingScheme.BORDA, situation)
+    with_oracle = run_btva_with_strategies(VotingScheme.BORDA, situation, oracle=True)
+
+    assert all(o.strategy_kind == "bullet" for opts in without.strategic_options.values() for o in opts)
+    witnesses = [o for opts in with_oracle.strategic_options.values() for o in opts if o.strategy_kind == "compromising_burying"]
+    assert witnesses
+    for opt in witnesses:
+        assert opt.strategic_outcome != opt.baseline_outcome
+        assert _winner(VotingScheme.BORDA, situation, opt.voter_index, opt.tactical_ballot.preferences) == opt.strategic_outcome
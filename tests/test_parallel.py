@@ -0,0 +1,93 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from btva.analysis import aggregate_options, run_btva_with_strategies
+from btva.cli import main
+from btva import parallel
+from btva.enumeration import permutation_outcome_histograms, permutation_winners
+from btva.models import VotingScheme
+from btva.parallel import parallel_outcome_histograms, parallel_permutation_winners
+from btva.voting import tally_votes
+from conftest import random_situation
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_winners_match_serial_in_voter_order(workers: int) -> None:
+    situation = random_situation(0, repeated=2)
+    outcome = tally_votes(VotingScheme.BORDA, situation)
+    got = parallel_permutation_winners(VotingScheme.BORDA, situation, outcome, workers=workers, prune=True)
+
+    assert list(got) == list(range(situation.n_voters))
+    for i in range(situation.n_voters):
+        assert got[i] == list(permutation_winners(VotingScheme.BORDA, situation, i, outcome, prune=True))
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("prune", [False, True])
+def test_run_btva_with_strategies_workers_match_serial(scheme: VotingScheme, prune: bool) -> None:
+    situation = random_situation(1, repeated=2)
+    kwargs = dict(collapse_equivalent=True, prune=prune)
+
+    assert (
+        run_btva_with_strategies(scheme, situation, workers=2, **kwargs)
+        == run_btva_with_strategies(scheme, situation, **kwargs)
+    )
+    assert (
+        run_btva_with_strategies(scheme, situation, aggregate=True, workers=2, **kwargs).aggregates
+        == run_btva_with_strategies(scheme, situation, aggregate=True, **kwargs).aggregates
+    )
+
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_histograms_match_serial(workers: int) -> None:
+    situation = random_situation(5, repeated=2)
+    outcome = tally_votes(VotingScheme.BORDA, situation)
+    got = parallel_outcome_histograms(VotingScheme.BORDA, situation, outcome, workers=workers, collapse_equivalent=True)
+    assert got == permutation_outcome_histograms(VotingScheme.BORDA, situation, collapse_equivalent=True)
+    # every voter owns its counter, as in the serial version
+    assert got[0] is not got[situation.n_voters - 2]
+
+
+def test_aggregate_mode_never_ships_ballots(monkeypatch: pytest.MonkeyPatch) -> None:
+    situation = random_situation(6, repeated=2)
+    monkeypatch.setattr(parallel, "_winners_for_voters", lambda voters: pytest.fail("ballot rows requested"))
+    monkeypatch.setattr(parallel, "resolve_workers", lambda workers: 1)
+    got = run_btva_with_strategies(VotingScheme.BORDA, situation, aggregate=True, prune=True, workers=2)
+    assert got.aggregates == run_btva_with_strategies(VotingScheme.BORDA, situation, aggregate=True, prune=True).aggregates
+
+def test_table_mode_with_workers() -> None:
+    pytest.importorskip("numpy")
+    situation = random_situation(2, repeated=2)
+    serial = run_btva_with_strategies(VotingScheme.BORDA, situation, prune=True, table=True).option_table
+    parallel = run_btva_with_strategies(VotingScheme.BORDA, situation, prune=True, table=True, workers=2).option_table
+    assert (serial.voter == parallel.voter).all()
+    assert (serial.ballot == parallel.ballot).all()
+    assert (serial.winner == parallel.winner).all()
+
+
+def test_aggregate_options_matches_aggregate_mode() -> None:
+    situation = random_situation(3, repeated=2)
+    listed = run_btva_with_strategies(VotingScheme.BORDA, situation, prune=True)
+    counted = run_btva_with_strategies(VotingScheme.BORDA, situation, prune=True, aggregate=True)
+    rebuilt = aggregate_options(situation, listed)
+    for i in range(situation.n_voters):
+        assert rebuilt.aggregates[i].tactical_counts == counted.aggregates[i].tactical_counts
+        assert rebuilt.aggregates[i].tactical_gains == counted.aggregates[i].tactical_gains
+
+
+def test_cli_workers_output_is_unchanged(tmp_path: Path, capsys) -> None:
+    situation = random_situation(4, repeated=2)
+    lines = ["# 5 candidates"] + [f"={k} : [{a}]" for k, a in enumerate("ABCDE")]
+    lines += [f"1:{'>'.join(str(ord(a) - ord('A')) for a in pref)}" for pref in situation.voters_preferences]
+    p = tmp_path / "x.abif"
+    p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert main([str(p), "--scheme", "borda"]) == 0
+    serial = capsys.readouterr().out
+    assert main([str(p), "--scheme", "borda", "--workers", "2"]) == 0
+    assert capsys.readouterr().out == serial
@@ -0,0 +1,128 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import pytest
+
+import btva.parsing as parsing
+from btva.parsing import cache_entry_path, load_input_file
+
+
+_CONTENT = "# 3 candidates\n=0 : [0]\n=1 : [1]\n=2 : [2]\n2:0>1>2\n1:2\n3:1>0>2\n1:0>1>2\n"
+
+
+def _write(tmp_path: Path, content: str, name: str = "x.abif") -> Path:
+    p = tmp_path / name
+    p.write_text(content, encoding="utf-8")
+    return p
+
+
+def test_cache_hit_matches_plain_load(tmp_path: Path) -> None:
+    p = _write(tmp_path, _CONTENT)
+    cache = tmp_path / "cache"
+    plain = load_input_file(p)
+
+    cold = load_input_file(p, cache_dir=cache)
+    assert cache_entry_path(p, cache).exists()
+    warm = load_input_file(p, cache_dir=cache)
+
+    for parsed in (cold, warm):
+        assert parsed.situation == plain.situation
+        assert parsed.profile == plain.profile
+    assert warm.profile.voter_types == plain.profile.voter_types
+
+
+def test_cache_hit_skips_parsing(tmp_path: Path, monkeypatch) -> None:
+    p = _write(tmp_path, _CONTENT)
+    cache = tmp_path / "cache"
+    load_input_file(p, cache_dir=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed on a cache hit")
+
+    monkeypatch.setattr(parsing, "read_abif_ballots", fail)
+    assert load_input_file(p, cache_dir=cache).situation.n_voters == 7
+
+
+def test_cache_is_keyed_by_content_and_parser_version(tmp_path: Path, monkeypatch) -> None:
+    cache = tmp_path / "cache"
+    a = _write(tmp_path, _CONTENT, "a.abif")
+    b = _write(tmp_path, _CONTENT, "b.abif")
+    # identical bytes share one entry
+    assert cache_entry_path(a, cache) == cache_entry_path(b, cache)
+
+    load_input_file(a, cache_dir=cache)
+    a.write_text(_CONTENT + "1:2>1>0\n", encoding="utf-8")
+    assert load_input_file(a, cache_dir=cache).situation.n_voters == 8
+
+    before = cache_entry_path(b, cache)
+    monkeypatch.setattr(parsing, "PARSER_VERSION", parsing.PARSER_VERSION + 1)
+    assert cache_entry_path(b, cache) != before
+
+
+def test_invalid_file_error_is_cached(tmp_path: Path, monkeypatch) -> None:
+    p = _write(tmp_path, "# 3 candidates\n1:0>1>3\n")
+    cache = tmp_path / "cache"
+    with pytest.raises(ValueError) as first:
+        load_input_file(p, cache_dir=cache)
+
+    monkeypatch.setattr(parsing, "read_abif_ballots", lambda *a, **k: pytest.fail("parsed on a cache hit"))
+    with pytest.raises(ValueError) as second:
+        load_input_file(p, cache_dir=cache)
+    assert str(second.value) == str(first.value)
+
+
+def test_corrupt_entry_is_rebuilt(tmp_path: Path) -> None:
+    p = _write(tmp_path, _CONTENT)
+    cache = tmp_path / "cache"
+    entry = cache_entry_path(p, cache)
+    cache.mkdir()
+    entry.write_bytes(b"not a cache entry")
+
+    assert load_input_file(p, cache_dir=cache).situation == load_input_file(p).situation
+    assert entry.read_bytes().startswith(b"BTVAABIF")
+
+
+@pytest.mark.parametrize("content", [b"", b"BTVA"])
+def test_empty_or_truncated_entry_is_rebuilt(tmp_path: Path, content: bytes) -> None:
+    p = _write(tmp_path, _CONTENT)
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    cache_entry_path(p, cache).write_bytes(content)
+
+    assert load_input_file(p, cache_dir=cache).situation == load_input_file(p).situation
+
+
+def test_entry_body_is_little_endian(tmp_path: Path) -> None:
+    p = _write(tmp_path, _CONTENT)
+    cache = tmp_path / "cache"
+    load_input_file(p, cache_dir=cache)
+
+    body = cache_entry_path(p, cache).read_bytes()[parsing._CACHE_HEADER.size:]
+    # counts, run types, run counts as '<q', then the distinct rankings as '<H' candidate ids
+    expected = struct.pack("<3q", 3, 1, 3) + struct.pack("<4q", 0, 1, 2, 0) + struct.pack("<4q", 2, 1, 3, 1)
+    expected += struct.pack("<9H", 0, 1, 2, 2, 0, 1, 1, 0, 2)
+    assert body == expected + bytes(-len(expected) % 8)
+
+
+def test_big_endian_hosts_decode_by_copy(monkeypatch) -> None:
+    read = parsing.AbifBallots(
+        m_alternatives=2,
+        ballots=(("0", "1"), ("1", "0")),
+        counts=(3, 1),
+        run_types=parsing.array("q", [0, 1, 0]),
+        run_counts=parsing.array("q", [2, 1, 1]),
+    )
+    little = parsing._encode_ballots(read)
+    monkeypatch.setattr(parsing, "_LITTLE_ENDIAN", False)
+    # on this host the swapped encoding is what a big-endian host would read as little-endian
+    swapped = parsing._encode_ballots(read)
+    assert swapped != little
+
+    decoded = parsing._decode_ballots(memoryview(swapped), 2, 2, 3)
+    assert decoded.ballots == read.ballots
+    assert decoded.counts == read.counts
+    assert list(decoded.run_types) == [0, 1, 0]
+    assert list(decoded.run_counts) == [2, 1, 1]
@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from btva.parsing import load_input_file
+from btva.parsing import load_input_file, load_rank_matrix, load_weighted_profile, read_abif_ballots
 
 
 def test_load_abif_parses_strict_ballots(tmp_path: Path) -> None:
@@ -61,3 +61,53 @@ def test_load_abif_appends_missing_candidates(tmp_path: Path) -> None:
     parsed = load_input_file(p)
     # First ballot truncated: missing {0,3} appended in ascending order.
     assert parsed.situation.voters_preferences[0] == ("1", "2", "0", "3")
+
+
+_STREAM_CONTENT = """\
+# 4 candidates
+=0 : [0]
+=1 : [1]
+=2 : [2]
+=3 : [3]
+2:3>2>0>1
+1:1>2
+1: 1 > 2
+3:0>1>2>3
+0:2>1>0>3
+1:3>2>0>1
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_streaming_reader_is_independent_of_chunk_size(tmp_path: Path, chunk_size: int) -> None:
+    p = tmp_path / "stream.abif"
+    p.write_text(_STREAM_CONTENT, encoding="utf-8")
+
+    read = read_abif_ballots(p, chunk_size=chunk_size)
+    # differently spaced lines for the same ranking are one ballot; zero counts are dropped
+    assert read.ballots == (("3", "2", "0", "1"), ("1", "2", "0", "3"), ("0", "1", "2", "3"))
+    assert read.counts == (3, 2, 3)
+    assert read.voter_types() == (0, 0, 1, 1, 2, 2, 2, 0)
+    assert load_input_file(p, chunk_size=chunk_size).situation == load_input_file(p).situation
+
+
+def test_weighted_profile_without_voter_order(tmp_path: Path) -> None:
+    p = tmp_path / "stream.abif"
+    p.write_text(_STREAM_CONTENT, encoding="utf-8")
+
+    profile = load_weighted_profile(p)
+    assert profile.voter_types is None
+    assert profile.counts == (3, 2, 3)
+    assert profile.position_counts == load_input_file(p).situation.position_counts
+
+    ordered = load_weighted_profile(p, keep_voter_order=True)
+    assert ordered.voters_preferences == load_input_file(p).situation.voters_preferences
+
+
+def test_rank_matrix_straight_from_file(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    p = tmp_path / "stream.abif"
+    p.write_text(_STREAM_CONTENT, encoding="utf-8")
+
+    matrix = load_rank_matrix(p)
+    assert matrix.voters_preferences == load_input_file(p).situation.voters_preferences
@@ -0,0 +1,49 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import pytest
+
+from btva.models import VotingScheme, VotingSituation, WeightedProfile
+from btva.voting import scoring_vector, tally_votes
+
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("B", "A", "C"),
+        ("C", "A", "B"),
+        ("B", "C", "A"),
+        ("A", "B", "C"),
+    )
+)
+
+
+def test_position_counts_matrix() -> None:
+    pc = SITUATION.position_counts
+
+    assert pc.alternatives == ("A", "B", "C")
+    # rows: alternatives, columns: positions
+    assert pc.counts == (
+        (1, 2, 1),
+        (2, 1, 1),
+        (1, 1, 2),
+    )
+    # computed once per situation
+    assert SITUATION.position_counts is pc
+
+
+def test_position_counts_scores_any_vector() -> None:
+    pc = SITUATION.position_counts
+
+    for scheme in VotingScheme:
+        assert pc.scores(scoring_vector(scheme, 3)) == tally_votes(scheme, SITUATION).scores
+
+    assert pc.scores([5, 2, 0]) == {"A": 9, "B": 12, "C": 7}
+
+
+def test_weighted_and_rank_matrix_counts_agree() -> None:
+    assert WeightedProfile.from_situation(SITUATION).position_counts == SITUATION.position_counts
+
+    pytest.importorskip("numpy")
+    from btva.rank_matrix import RankMatrix
+
+    assert RankMatrix.from_situation(SITUATION).position_counts == SITUATION.position_counts
@@ -0,0 +1,67 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+
+import pytest
+
+from btva import enumeration
+from btva.enumeration import enumerate_all_permutations_options_for_voter
+from btva.models import VotingScheme, VotingSituation
+from conftest import random_situation
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_pruned_mode_returns_exactly_the_tactical_options(scheme: VotingScheme, seed: int) -> None:
+    situation = random_situation(seed)
+    for voter in range(situation.n_voters):
+        full = enumerate_all_permutations_options_for_voter(scheme, situation, voter)
+        tactical = [opt for opt in full if opt.H_tilde_i > opt.H_i]
+        assert enumerate_all_permutations_options_for_voter(scheme, situation, voter, prune=True) == tactical
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_witness_per_outcome_stops_after_one_option_per_winner(scheme: VotingScheme) -> None:
+    situation = random_situation(5)
+    for voter in range(situation.n_voters):
+        full = enumerate_all_permutations_options_for_voter(scheme, situation, voter)
+        improving = {opt.strategic_outcome for opt in full if opt.H_tilde_i > opt.H_i}
+
+        witnesses = enumerate_all_permutations_options_for_voter(
+            scheme, situation, voter, prune=True, witness_per_outcome=True
+        )
+        assert [opt.strategic_outcome for opt in witnesses] == sorted(
+            improving, key=[opt.strategic_outcome for opt in full].index
+        )
+
+        limited = enumerate_all_permutations_options_for_voter(scheme, situation, voter, prune=True, tactical_limit=1)
+        assert len(limited) == min(1, len(improving))
+
+
+def test_voter_whose_top_choice_wins_costs_no_tallies(monkeypatch: pytest.MonkeyPatch) -> None:
+    situation = VotingSituation(
+        voters_preferences=(
+            ("A", "B", "C", "D"),
+            ("A", "C", "B", "D"),
+            ("B", "A", "D", "C"),
+        )
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no ballot should be tallied")
+
+    monkeypatch.setattr(enumeration, "pruned_permutation_winners", fail)
+    monkeypatch.setattr(enumeration, "tally_votes_delta", fail)
+    monkeypatch.setattr(enumeration, "tally_votes_batch", fail)
+    assert enumerate_all_permutations_options_for_voter(VotingScheme.BORDA, situation, 0, prune=True) == []
+
+
+@pytest.mark.parametrize("scheme", [VotingScheme.PLURALITY, VotingScheme.VOTE_FOR_TWO, VotingScheme.ANTI_PLURALITY])
+def test_pruned_collapsed_classes_keep_tactical_counts(scheme: VotingScheme) -> None:
+    situation = random_situation(8)
+    for voter in range(situation.n_voters):
+        full = enumerate_all_permutations_options_for_voter(scheme, situation, voter)
+        collapsed = enumerate_all_permutations_options_for_voter(
+            scheme, situation, voter, prune=True, collapse_equivalent=True
+        )
+        assert sum(opt.multiplicity for opt in collapsed) == sum(1 for opt in full if opt.H_tilde_i > opt.H_i)
@@ -0,0 +1,79 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from btva.happiness import HappinessMetric, happiness_for_outcome
+from btva.models import VotingScheme, VotingSituation
+from btva.rank_matrix import RankMatrix
+from btva.strategies import StrategicBallot
+from btva.voting import tally_votes, tally_votes_strategic
+
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("B", "A", "C", "D"),
+        ("C", "D", "A", "B"),
+        ("A", "B", "D", "C"),
+        ("D", "C", "B", "A"),
+    )
+)
+
+
+def test_rank_matrix_layout() -> None:
+    matrix = RankMatrix.from_situation(SITUATION)
+
+    assert matrix.candidates == ("A", "B", "C", "D")
+    assert matrix.rankings.dtype == np.uint8
+    assert matrix.rankings[0].tolist() == [1, 0, 2, 3]
+    # positions is the inverse permutation of each row
+    assert matrix.positions[0].tolist() == [1, 0, 2, 3]
+    assert matrix.positions[1].tolist() == [2, 3, 0, 1]
+    assert matrix.voters_preferences == SITUATION.voters_preferences
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_rank_matrix_tally_matches_situation(scheme: VotingScheme) -> None:
+    matrix = RankMatrix.from_situation(SITUATION)
+
+    assert tally_votes(scheme, matrix) == tally_votes(scheme, SITUATION)
+
+    override = {1: StrategicBallot(voter_index=1, kind="compromising_burying", preferences=("A", "D", "C", "B"))}
+    assert tally_votes_strategic(scheme, matrix, overrides=override) == tally_votes_strategic(
+        scheme, SITUATION, overrides=override
+    )
+
+    if scheme != VotingScheme.PLURALITY:
+        bullet = {2: "D"}
+        assert tally_votes_strategic(scheme, matrix, bullet_choice_by_voter=bullet) == tally_votes_strategic(
+            scheme, SITUATION, bullet_choice_by_voter=bullet
+        )
+
+
+@pytest.mark.parametrize("metric", list(HappinessMetric))
+def test_rank_matrix_happiness_matches_situation(metric: HappinessMetric) -> None:
+    matrix = RankMatrix.from_situation(SITUATION)
+
+    for outcome in matrix.candidates:
+        assert happiness_for_outcome(matrix, outcome, metric=metric) == happiness_for_outcome(
+            SITUATION, outcome, metric=metric
+        )
+
+
+def test_rank_matrix_validate_rejects_bad_rows() -> None:
+    matrix = RankMatrix.from_rankings(("A", "B", "C"), np.array([[0, 1, 2], [2, 1, 0], [0, 1, 2]]))
+    matrix.validate()
+
+    with pytest.raises(ValueError):
+        RankMatrix.from_rankings(("A", "B", "C"), np.array([[0, 1, 2], [2, 1, 0]])).validate()
+
+    with pytest.raises(ValueError):
+        RankMatrix.from_rankings(("A", "B", "C"), np.array([[0, 1, 2], [2, 2, 0], [0, 1, 2]])).validate()
+
+
+@pytest.mark.parametrize("bad", [[0, 1, 3], [0, -1, 2]])
+def test_rank_matrix_rejects_out_of_range_ids(bad: list[int]) -> None:
+    with pytest.raises(ValueError, match="Voter 1"):
+        RankMatrix.from_rankings(("a", "b", "c"), [[0, 1, 2], bad, [2, 1, 0]])
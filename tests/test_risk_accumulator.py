@@ -0,0 +1,150 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+
+import pytest
+
+from btva.analysis import (
+    RISK_METHODS,
+    RiskAccumulator,
+    compute_risk,
+    register_risk_method,
+    run_btva_with_strategies,
+)
+from btva.enumeration import iter_permutation_options
+from btva.enumeration_bullet import iter_bullet_options
+from btva.models import VotingScheme
+from btva.rank_matrix import np
+from conftest import random_situation
+
+METHODS = ["avg_gain_all_options", "fraction_change_winner"]
+
+
+def _assert_same_risk(got: dict[str, object], expected: dict[str, object]) -> None:
+    assert got["n_options"] == expected["n_options"]
+    assert got["overall"] == pytest.approx(expected["overall"])
+    assert got["by_strategy_kind"] == pytest.approx(expected["by_strategy_kind"])
+
+
+def _tactical_options(options: dict[int, list]) -> dict[int, list]:
+    return {i: [o for o in opts if o.H_tilde_i > o.H_i] for i, opts in options.items()}
+
+
+def _tactical(result) -> dict[int, list]:
+    return _tactical_options(result.strategic_options)
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_one_pass_gives_every_method(scheme: VotingScheme) -> None:
+    situation = random_situation(3)
+    tactical = _tactical(run_btva_with_strategies(scheme, situation, collapse_equivalent=True))
+    accumulator = RiskAccumulator(situation.n_voters)
+    for opts in tactical.values():
+        accumulator.add_options(opts)
+
+    for method in METHODS:
+        assert accumulator.risk(method) == compute_risk(tactical, method=method)
+
+    flat = [o for opts in tactical.values() for o in opts]
+    n = sum(o.multiplicity for o in flat)
+    assert accumulator.n_options == n
+    if not n:
+        assert accumulator.avg_gain == accumulator.avg_delta_H == 0.0
+        return
+    assert accumulator.avg_gain == pytest.approx(sum((o.H_tilde_i - o.H_i) * o.multiplicity for o in flat) / n)
+    assert accumulator.avg_delta_H == pytest.approx(sum((o.H_tilde - o.H) * o.multiplicity for o in flat) / n)
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+@pytest.mark.parametrize("tactical_only", [False, True])
+def test_every_entry_point_feeds_the_same_numbers(scheme: VotingScheme, tactical_only: bool) -> None:
+    situation = random_situation(5)
+    options = run_btva_with_strategies(scheme, situation, collapse_equivalent=True).strategic_options
+    expected = _tactical_options(options) if tactical_only else options
+    agg = run_btva_with_strategies(scheme, situation, collapse_equivalent=True, prune=True, aggregate=True)
+
+    fed = [
+        RiskAccumulator(situation.n_voters, tactical_only=tactical_only).add_options(o for opts in options.values() for o in opts),
+        RiskAccumulator(situation.n_voters, tactical_only=tactical_only).add_sources({"all": options.__getitem__}),
+    ]
+    if not tactical_only:
+        # the pruned aggregates leave out non-tactical compromise/bury ballots
+        agg = run_btva_with_strategies(scheme, situation, collapse_equivalent=True, aggregate=True)
+    fed.append(RiskAccumulator(situation.n_voters, tactical_only=tactical_only).add_aggregates(agg.aggregates))
+    if np is not None:
+        table = run_btva_with_strategies(scheme, situation, collapse_equivalent=True, table=True).option_table
+        fed.append(RiskAccumulator(situation.n_voters, tactical_only=tactical_only).add_table(table))
+
+    for accumulator in fed:
+        for method in METHODS:
+            _assert_same_risk(accumulator.risk(method), compute_risk(expected, method=method))
+
+
+def test_table_feeds_the_same_numbers() -> None:
+    pytest.importorskip("numpy")
+    situation = random_situation(6)
+    table = run_btva_with_strategies(VotingScheme.BORDA, situation, table=True).option_table
+    accumulator = RiskAccumulator(situation.n_voters, tactical_only=True).add_table(table)
+    for method in METHODS:
+        _assert_same_risk(accumulator.risk(method), compute_risk(table.tactical(), method=method))
+    options = _tactical_options(table.to_options())
+    by_row = RiskAccumulator(situation.n_voters).add_options(o for opts in options.values() for o in opts)
+    assert accumulator.n_options == by_row.n_options
+    assert accumulator.avg_gain == pytest.approx(by_row.avg_gain)
+    assert accumulator.avg_delta_H == pytest.approx(by_row.avg_delta_H)
+
+
+def test_fraction_change_winner_stops_at_first_change() -> None:
+    situation = random_situation(1, n=3, m=6)
+    pulled: list[int] = []
+
+    def perms(i: int):
+        for opt in iter_permutation_options(VotingScheme.BORDA, situation, i):
+            pulled.append(i)
+            yield opt
+
+    accumulator = RiskAccumulator(situation.n_voters, ("fraction_change_winner",))
+    accumulator.add_sources({"compromising_burying": perms})
+    full = {i: list(iter_permutation_options(VotingScheme.BORDA, situation, i)) for i in range(situation.n_voters)}
+
+    assert accumulator.risk("fraction_change_winner")["overall"] == compute_risk(full, method="fraction_change_winner")["overall"]
+    for i, opts in full.items():
+        assert pulled.count(i) == min(1, len(opts))
+
+
+def test_registered_method_rides_along(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MaxGain:
+        def __init__(self) -> None:
+            self.best = 0.0
+
+        def done(self, voter_index: int, kind: str) -> bool:
+            return False
+
+        def add(self, voter_index: int, kind: str, multiplicity: int, gain: float, changed: bool) -> None:
+            self.best = max(self.best, gain)
+
+        def result(self, n_options: int, n_voters: int) -> tuple[float, dict[str, float]]:
+            return self.best, {}
+
+    monkeypatch.setitem(RISK_METHODS, "max_gain", MaxGain)
+    register_risk_method("max_gain", MaxGain)
+    situation = random_situation(4)
+    options = list(iter_bullet_options(VotingScheme.BORDA, situation, 0))
+    accumulator = RiskAccumulator(situation.n_voters, ("max_gain", "fraction_change_winner")).add_options(options)
+    assert accumulator.risk("max_gain")["overall"] == max((o.H_tilde_i - o.H_i for o in options), default=0.0)
+
+    if np is not None:
+        # no add_bulk hook: add_table feeds it row by row, the built-in methods in bulk
+        table = run_btva_with_strategies(VotingScheme.BORDA, situation, table=True).option_table
+        accumulator = RiskAccumulator(situation.n_voters, ("max_gain", "fraction_change_winner"), tactical_only=True)
+        accumulator.add_table(table)
+        tactical = table.tactical()
+        assert accumulator.risk("max_gain")["overall"] == pytest.approx(float((tactical.H_tilde_i - tactical.H_i).max(initial=0.0)))
+        _assert_same_risk(accumulator.risk("fraction_change_winner"), compute_risk(tactical, method="fraction_change_winner"))
+
+
+def test_unknown_method_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        RiskAccumulator(3, ("nope",))
+    with pytest.raises(ValueError):
+        RiskAccumulator(3, ("avg_gain_all_options",)).risk("fraction_change_winner")
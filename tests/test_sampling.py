@@ -0,0 +1,101 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import pytest
+
+from btva.analysis import RiskAccumulator, run_btva_with_strategies, with_happiness_metric
+from btva.experiments import run_experiments
+from btva.happiness import HappinessMetric
+from btva.models import VotingScheme
+from btva.parsing import load_input_file
+from btva.sampling import SamplingBudget, estimate_risk, sample_compromise_burying
+
+SCENARIOS = Path(__file__).parent.parent / "voting_scenarios"
+
+
+def _situation(name: str):
+    return load_input_file(SCENARIOS / name).situation
+
+
+def _exact(scheme: VotingScheme, situation) -> RiskAccumulator:
+    result = run_btva_with_strategies(scheme, situation, aggregate=True, collapse_equivalent=True)
+    accumulator = RiskAccumulator(situation.n_voters, tactical_only=True)
+    accumulator.add_aggregates(result.aggregates)
+    return accumulator
+
+
+@pytest.mark.parametrize("stratified", [False, True])
+def test_estimate_brackets_exact_enumeration(stratified: bool) -> None:
+    situation = _situation("sv_poll_155.abif")
+    exact = _exact(VotingScheme.BORDA, situation)
+    sample = sample_compromise_burying(
+        VotingScheme.BORDA, situation, budget=SamplingBudget(samples=400, stratified=stratified, seed=1)
+    )
+    risk = estimate_risk(situation, sample, confidence=0.999)
+
+    assert risk.tactical_options_total.low <= exact.n_options <= risk.tactical_options_total.high
+    assert risk.avg_gain.low <= exact.avg_gain <= risk.avg_gain.high
+    assert risk.fraction_change_winner == exact.risk("fraction_change_winner")["overall"]
+
+
+def test_sample_budget_and_seed() -> None:
+    situation = _situation("sv_poll_144.abif")
+    groups = len(situation.voters_by_ballot)
+
+    uniform = sample_compromise_burying(VotingScheme.BORDA, situation, budget=SamplingBudget(samples=50))
+    assert uniform.n_samples == 50 * groups
+    assert uniform.population == math.factorial(situation.m_alternatives) - 1
+
+    stratified = sample_compromise_burying(VotingScheme.BORDA, situation, budget=SamplingBudget(samples=50, stratified=True))
+    m = situation.m_alternatives
+    assert stratified.n_samples == m * math.ceil(50 / m) * groups
+    assert sum(stratified.groups[0].weights) == pytest.approx(1.0)
+
+    again = sample_compromise_burying(VotingScheme.BORDA, situation, budget=SamplingBudget(samples=50))
+    assert again == uniform
+
+
+def test_time_budget_stops_sampling() -> None:
+    situation = _situation("sv_poll_144.abif")
+    sample = sample_compromise_burying(
+        VotingScheme.BORDA, situation, budget=SamplingBudget(samples=None, time_budget=0.0)
+    )
+    # one first round of 2 draws per distinct ballot is always made
+    assert sample.n_samples == 2 * len(situation.voters_by_ballot)
+
+    with pytest.raises(ValueError):
+        SamplingBudget(samples=None, time_budget=None)
+
+
+def test_run_btva_with_strategies_samples_only_when_skipped() -> None:
+    situation = _situation("sv_poll_144.abif")
+    budget = SamplingBudget(samples=40)
+
+    enumerated = run_btva_with_strategies(VotingScheme.BORDA, situation, aggregate=True, sampling=budget)
+    assert enumerated.sampled is None
+
+    skipped = run_btva_with_strategies(VotingScheme.BORDA, situation, aggregate=True, max_m=3, sampling=budget)
+    assert skipped.sampled is not None
+    assert skipped.sampled.n_samples == 40 * len(situation.voters_by_ballot)
+
+    rescored = with_happiness_metric(situation, skipped, HappinessMetric.RANK_NORMALIZED)
+    assert rescored.sampled.sample is skipped.sampled.sample
+    assert rescored.sampled.happiness_metric == HappinessMetric.RANK_NORMALIZED
+
+
+def test_experiment_rows_record_samples() -> None:
+    files = [SCENARIOS / "sv_poll_144.abif"]
+    rows = run_experiments(
+        scenario_files=files, schemes=[VotingScheme.PLURALITY, VotingScheme.BORDA], max_m=3,
+        sampling=SamplingBudget(samples=40),
+    )
+    by_scheme = {row.scheme: row for row in rows}
+
+    assert by_scheme["plurality"].n_samples == 0
+    assert by_scheme["plurality"].risk_avg_gain_ci_width == 0.0
+    assert by_scheme["borda"].n_samples > 0
+    assert by_scheme["borda"].risk_avg_gain_ci_width > 0.0
+    assert "estimated" in by_scheme["borda"].note
@@ -0,0 +1,63 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+import pytest
+
+from btva.models import VotingScheme, VotingSituation
+from btva.strategies import StrategicBallot
+from btva.voting import tally_votes, tally_votes_delta
+
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("A", "B", "C", "D"),
+        ("B", "C", "D", "A"),
+        ("C", "D", "A", "B"),
+        ("D", "A", "B", "C"),
+        ("A", "C", "B", "D"),
+    )
+)
+
+
+def _recount(scheme: VotingScheme, prefs: tuple[tuple[str, ...], ...]) -> dict[str, int]:
+    return tally_votes(scheme, VotingSituation(prefs)).scores
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_delta_matches_full_recount(scheme: VotingScheme) -> None:
+    baseline = tally_votes(scheme, SITUATION)
+    ballot = ("D", "B", "C", "A")
+
+    out = tally_votes_delta(
+        scheme,
+        SITUATION,
+        baseline.scores,
+        overrides={0: StrategicBallot(voter_index=0, kind="compromising_burying", preferences=ballot)},
+    )
+
+    expected = _recount(scheme, (ballot,) + SITUATION.voters_preferences[1:])
+    assert out.scores == expected
+    # the baseline scores are not modified in place
+    assert baseline.scores == tally_votes(scheme, SITUATION).scores
+
+
+def test_delta_bullet_and_override_together() -> None:
+    baseline = tally_votes(VotingScheme.BORDA, SITUATION)
+
+    out = tally_votes_delta(
+        VotingScheme.BORDA,
+        SITUATION,
+        baseline.scores,
+        overrides={1: StrategicBallot(voter_index=1, kind="compromising_burying", preferences=("A", "B", "C", "D"))},
+        bullet_choice_by_voter={2: "B"},
+    )
+
+    # voter 1 now votes A>B>C>D; voter 2 contributes 3 points to B only
+    assert out.scores == {"A": 3 + 3 + 2 + 3, "B": 2 + 2 + 3 + 1 + 1, "C": 1 + 1 + 0 + 2, "D": 0 + 0 + 3 + 0}
+    assert out.winner == "A"
+
+
+def test_delta_rejects_bullet_under_plurality() -> None:
+    baseline = tally_votes(VotingScheme.PLURALITY, SITUATION)
+    with pytest.raises(ValueError):
+        tally_votes_delta(VotingScheme.PLURALITY, SITUATION, baseline.scores, bullet_choice_by_voter={0: "A"})
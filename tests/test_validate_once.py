@@ -0,0 +1,66 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import btva.models as models
+from btva.models import VotingScheme, VotingSituation, WeightedProfile, set_strict_validation
+from btva.parsing import load_input_file
+from btva.voting import tally_votes
+
+
+def _count_checks(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    original = models._validate_rankings
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(models, "_validate_rankings", counting)
+    return calls
+
+
+def test_validate_runs_once_per_situation(monkeypatch) -> None:
+    calls = _count_checks(monkeypatch)
+    situation = VotingSituation.validated((("A", "B", "C"), ("B", "C", "A"), ("C", "A", "B")))
+    assert len(calls) == 1
+
+    for _ in range(5):
+        tally_votes(VotingScheme.BORDA, situation)
+    assert len(calls) == 1
+
+
+def test_strict_mode_revalidates_every_call(monkeypatch) -> None:
+    calls = _count_checks(monkeypatch)
+    situation = VotingSituation.validated((("A", "B", "C"), ("B", "C", "A"), ("C", "A", "B")))
+
+    set_strict_validation(True)
+    try:
+        tally_votes(VotingScheme.BORDA, situation)
+        tally_votes(VotingScheme.BORDA, situation)
+    finally:
+        set_strict_validation(False)
+    assert len(calls) == 3
+
+
+def test_failed_validation_is_not_recorded() -> None:
+    situation = VotingSituation((("A", "B", "C"), ("A", "B", "C")))
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            situation.validate()
+
+
+def test_parsed_profiles_are_prevalidated(tmp_path: Path, monkeypatch) -> None:
+    p = tmp_path / "x.abif"
+    p.write_text("# 3 candidates\n2:0>1>2\n1:2>1>0\n", encoding="utf-8")
+    parsed = load_input_file(p)
+
+    calls = _count_checks(monkeypatch)
+    parsed.situation.validate()
+    assert parsed.profile is not None
+    parsed.profile.validate()
+    WeightedProfile.from_situation(parsed.situation).validate()
+    assert calls == []
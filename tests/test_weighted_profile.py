@@ -0,0 +1,88 @@
+# !!!for convenience tests were generated with llm support.!!!
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from btva.enumeration import enumerate_all_permutations_options
+from btva.enumeration_bullet import enumerate_bullet_options
+from btva.happiness import HappinessMetric, happiness_for_outcome
+from btva.models import VotingScheme, VotingSituation, WeightedProfile
+from btva.parsing import load_input_file
+from btva.strategies import StrategicBallot
+from btva.voting import tally_votes, tally_votes_strategic
+
+
+SITUATION = VotingSituation(
+    voters_preferences=(
+        ("A", "B", "C"),
+        ("C", "B", "A"),
+        ("A", "B", "C"),
+        ("B", "C", "A"),
+        ("C", "B", "A"),
+    )
+)
+
+
+def test_weighted_profile_from_situation_keeps_voter_order() -> None:
+    profile = WeightedProfile.from_situation(SITUATION)
+
+    assert profile.ballots == (("A", "B", "C"), ("C", "B", "A"), ("B", "C", "A"))
+    assert profile.counts == (2, 2, 1)
+    assert profile.n_voters == 5
+    assert profile.voters_by_type == ((0, 2), (1, 4), (3,))
+    assert profile.to_situation() == SITUATION
+
+
+@pytest.mark.parametrize("scheme", list(VotingScheme))
+def test_weighted_tally_matches_expanded(scheme: VotingScheme) -> None:
+    profile = WeightedProfile.from_situation(SITUATION)
+
+    assert tally_votes(scheme, profile) == tally_votes(scheme, SITUATION)
+
+    override = {4: StrategicBallot(voter_index=4, kind="compromising_burying", preferences=("B", "C", "A"))}
+    assert tally_votes_strategic(scheme, profile, overrides=override) == tally_votes_strategic(
+        scheme, SITUATION, overrides=override
+    )
+
+
+@pytest.mark.parametrize("metric", list(HappinessMetric))
+def test_weighted_happiness_is_expanded_per_voter(metric: HappinessMetric) -> None:
+    profile = WeightedProfile.from_situation(SITUATION)
+
+    for outcome in ("A", "B", "C"):
+        assert happiness_for_outcome(profile, outcome, metric=metric) == happiness_for_outcome(
+            SITUATION, outcome, metric=metric
+        )
+
+
+def test_weighted_enumeration_matches_per_voter_enumeration() -> None:
+    profile = WeightedProfile.from_situation(SITUATION)
+
+    assert enumerate_all_permutations_options(VotingScheme.BORDA, profile) == enumerate_all_permutations_options(
+        VotingScheme.BORDA, SITUATION
+    )
+    assert enumerate_bullet_options(VotingScheme.BORDA, profile) == enumerate_bullet_options(
+        VotingScheme.BORDA, SITUATION
+    )
+
+
+def test_load_abif_returns_weighted_profile(tmp_path: Path) -> None:
+    content = """\
+# 3 candidates
+=0 : [0]
+=1 : [1]
+=2 : [2]
+3:2>1>0
+1:0>1>2
+2:2>1>0
+"""
+    p = tmp_path / "x.abif"
+    p.write_text(content, encoding="utf-8")
+
+    parsed = load_input_file(p)
+    assert parsed.profile is not None
+    assert parsed.profile.ballots == (("2", "1", "0"), ("0", "1", "2"))
+    assert parsed.profile.counts == (5, 1)
+    assert parsed.profile.voters_preferences == parsed.situation.voters_preferences